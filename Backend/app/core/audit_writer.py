@@ -0,0 +1,167 @@
+from __future__ import annotations
+
+import atexit
+import json
+import queue
+import threading
+import time
+import traceback
+from typing import Any
+
+from app.core.config import settings
+from app.db.session import engine
+
+# ==========================================================
+# ESCRITOR ASÍNCRONO DE AUDITORÍA
+# Buffer acotado en memoria (por proceso) que un hilo vacía con COPY en lotes.
+# Lo usan los eventos "best effort" (PRINT), ya confirmados: el request no espera la
+# escritura. Si el buffer está lleno, enqueue() devuelve False y el llamador los escribe
+# con write_now() (ver app/services/audit_service.py).
+# ==========================================================
+
+_COPY_SQL = "COPY ticket_events (id, ticket_id, item_id, event_type, message, meta, user_name, created_at) FROM STDIN"
+_COLUMNS = ("id", "ticket_id", "item_id", "event_type", "message", "meta", "user_name", "created_at")
+
+
+class AuditWriter:
+    def __init__(self, *, max_queue: int, batch_size: int, flush_ms: int):
+        self.batch_size = max(1, batch_size)
+        self.flush_interval = max(1, flush_ms) / 1000
+        self._queue: queue.Queue[dict[str, Any]] = queue.Queue(maxsize=max(1, max_queue))
+        self._lock = threading.Lock()
+        self._flush_lock = threading.Lock()
+        self._thread: threading.Thread | None = None
+
+        self._enqueued = 0
+        self._rejected = 0
+        self._written = 0
+        self._failed = 0
+        self._flushes = 0
+        self._flush_ms_total = 0.0
+        self._flush_ms_max = 0.0
+        self._last_flush_ms = 0.0
+        self._tx_flushes = 0
+        self._tx_rows = 0
+        self._tx_ms_total = 0.0
+
+    def enqueue(self, row: dict[str, Any]) -> bool:
+        self._ensure_started()
+        try:
+            self._queue.put_nowait(row)
+        except queue.Full:
+            with self._lock:
+                self._rejected += 1
+            return False
+        with self._lock:
+            self._enqueued += 1
+        return True
+
+    def flush(self) -> int:
+        """Vacía el buffer en el hilo actual (shutdown / pruebas). Devuelve filas escritas."""
+        written = 0
+        while True:
+            batch = self._drain(block=False)
+            if not batch:
+                return written
+            written += self._write(batch)
+
+    def write_now(self, rows: list[dict[str, Any]]) -> int:
+        """Escribe esas filas en el hilo actual, sin pasar por el buffer. Devuelve filas escritas."""
+        written = 0
+        for i in range(0, len(rows), self.batch_size):
+            written += self._write(rows[i : i + self.batch_size])
+        return written
+
+    def note_tx_flush(self, rows: int, elapsed_ms: float) -> None:
+        """Métrica de los inserts multi-fila hechos dentro de la transacción del request."""
+        with self._lock:
+            self._tx_flushes += 1
+            self._tx_rows += rows
+            self._tx_ms_total += elapsed_ms
+
+    def stats(self) -> dict[str, Any]:
+        with self._lock:
+            return {
+                "queue_depth": self._queue.qsize(),
+                "queue_max": self._queue.maxsize,
+                "enqueued": self._enqueued,
+                "rejected": self._rejected,
+                "written": self._written,
+                "failed": self._failed,
+                "flushes": self._flushes,
+                "flush_ms_avg": round(self._flush_ms_total / self._flushes, 3) if self._flushes else 0.0,
+                "flush_ms_max": round(self._flush_ms_max, 3),
+                "flush_ms_last": round(self._last_flush_ms, 3),
+                "tx_flushes": self._tx_flushes,
+                "tx_rows": self._tx_rows,
+                "tx_flush_ms_avg": round(self._tx_ms_total / self._tx_flushes, 3) if self._tx_flushes else 0.0,
+            }
+
+    def _ensure_started(self) -> None:
+        if self._thread is not None:
+            return
+        with self._lock:
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._loop, name="audit-writer", daemon=True)
+                self._thread.start()
+
+    def _drain(self, *, block: bool) -> list[dict[str, Any]]:
+        batch: list[dict[str, Any]] = []
+        try:
+            batch.append(self._queue.get(timeout=self.flush_interval) if block else self._queue.get_nowait())
+        except queue.Empty:
+            return batch
+        while len(batch) < self.batch_size:
+            try:
+                batch.append(self._queue.get_nowait())
+            except queue.Empty:
+                break
+        return batch
+
+    def _write(self, batch: list[dict[str, Any]]) -> int:
+        t0 = time.perf_counter()
+        try:
+            with self._flush_lock:
+                conn = engine.raw_connection()
+                try:
+                    with conn.driver_connection.cursor() as cur, cur.copy(_COPY_SQL) as copy:
+                        for row in batch:
+                            copy.write_row(
+                                [
+                                    json.dumps(row[c]) if c == "meta" and row[c] is not None else row[c]
+                                    for c in _COLUMNS
+                                ]
+                            )
+                    conn.commit()
+                finally:
+                    conn.close()
+        except Exception:
+            traceback.print_exc()
+            with self._lock:
+                self._failed += len(batch)
+            return 0
+
+        elapsed = (time.perf_counter() - t0) * 1000
+        with self._lock:
+            self._written += len(batch)
+            self._flushes += 1
+            self._flush_ms_total += elapsed
+            self._flush_ms_max = max(self._flush_ms_max, elapsed)
+            self._last_flush_ms = elapsed
+        return len(batch)
+
+    def _loop(self) -> None:
+        while True:
+            batch = self._drain(block=True)
+            if batch:
+                self._write(batch)
+
+
+audit_writer = AuditWriter(
+    max_queue=settings.AUDIT_QUEUE_MAX,
+    batch_size=settings.AUDIT_BATCH_SIZE,
+    flush_ms=settings.AUDIT_FLUSH_MS,
+)
+
+# El hilo es daemon: al salir se escribe lo que quede en el buffer.
+atexit.register(audit_writer.flush)
@@ -0,0 +1,182 @@
+from __future__ import annotations
+
+import hashlib
+import hmac
+import os
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Any, Hashable, Optional
+
+from app.core.config import settings
+from app.models.user import UserRole
+
+# ==========================================================
+# CACHE DE AUTENTICACIÓN (app/deps/auth.py)
+# - tokens: JWT -> username, ya validado; vive hasta AUTH_CACHE_TTL_SECONDS o hasta
+#   el `exp` del token, lo que pase primero.
+# - usuarios: username -> AuthUser (copia inmutable de la fila de app_users).
+# - logins: HMAC(usuario, contraseña, hash) de las verificaciones bcrypt correctas,
+#   por AUTH_VERIFY_CACHE_SECONDS. El hash va en la llave: cambiar la contraseña la
+#   invalida sola. Nunca se guarda la contraseña, y la llave HMAC es del proceso.
+# Cualquier cambio en app_users dispara NOTIFY auth_cache (sql/014_app_users_notify.sql)
+# y el listener de app/core/cache_listener.py saca al usuario en todos los workers.
+# El TTL queda como red de seguridad si se pierde un aviso.
+# ==========================================================
+
+CHANNEL = "auth_cache"
+
+
+@dataclass(frozen=True, slots=True)
+class AuthUser:
+    id: str
+    username: str
+    full_name: Optional[str]
+    role: UserRole
+    is_active: bool
+
+
+class _TTLMap:
+    """LRU acotado por cantidad de entradas, con vencimiento por entrada."""
+
+    def __init__(self, max_entries: int):
+        self.max_entries = max(1, max_entries)
+        self._entries: OrderedDict[Hashable, tuple[float, Any]] = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def get(self, key: Hashable, now: float) -> Any:
+        hit = self._entries.get(key)
+        if hit is None or hit[0] <= now:
+            if hit is not None:
+                del self._entries[key]
+            self.misses += 1
+            return None
+        self._entries.move_to_end(key)
+        self.hits += 1
+        return hit[1]
+
+    def put(self, key: Hashable, value: Any, expires_at: float) -> None:
+        self._entries[key] = (expires_at, value)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+            self.evictions += 1
+
+    def pop(self, key: Hashable) -> bool:
+        return self._entries.pop(key, None) is not None
+
+    def clear(self) -> int:
+        n = len(self._entries)
+        self._entries.clear()
+        return n
+
+    def stats(self) -> dict[str, Any]:
+        lookups = self.hits + self.misses
+        return {
+            "entries": len(self._entries),
+            "max_entries": self.max_entries,
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_ratio": round(self.hits / lookups, 4) if lookups else 0.0,
+            "evictions": self.evictions,
+        }
+
+
+class AuthCache:
+    """
+    Igual que ReadCache, `epoch()` se toma antes de leer app_users y `put_user()`
+    descarta el resultado si hubo una invalidación en medio.
+    """
+
+    def __init__(self, *, max_entries: int, ttl_seconds: float, verify_ttl_seconds: float):
+        self.ttl_seconds = ttl_seconds
+        self.verify_ttl_seconds = verify_ttl_seconds
+        self._lock = threading.Lock()
+        self._tokens = _TTLMap(max_entries)
+        self._users = _TTLMap(max_entries)
+        self._verified = _TTLMap(max_entries)
+        self._hmac_key = os.urandom(32)
+        self._epoch = 0
+        self._invalidations = 0
+
+    def epoch(self) -> int:
+        return self._epoch
+
+    def get_token(self, token: str) -> Optional[str]:
+        now = time.monotonic()
+        with self._lock:
+            return self._tokens.get(token, now)
+
+    def put_token(self, token: str, username: str, exp: Optional[float]) -> None:
+        # `exp` es epoch UNIX; se pasa al reloj monotónico para el vencimiento
+        expires_at = time.monotonic() + self.ttl_seconds
+        if exp is not None:
+            expires_at = min(expires_at, time.monotonic() + (exp - time.time()))
+        with self._lock:
+            self._tokens.put(token, username, expires_at)
+
+    def get_user(self, username: str) -> Optional[AuthUser]:
+        now = time.monotonic()
+        with self._lock:
+            return self._users.get(username, now)
+
+    def put_user(self, user: AuthUser, epoch: int) -> bool:
+        with self._lock:
+            if epoch != self._epoch:
+                return False
+            self._users.put(user.username, user, time.monotonic() + self.ttl_seconds)
+            return True
+
+    def login_key(self, username: str, password: str, password_hash: str) -> bytes:
+        msg = "\0".join((username, password, password_hash)).encode("utf-8")
+        return hmac.new(self._hmac_key, msg, hashlib.sha256).digest()
+
+    def is_verified(self, key: bytes) -> bool:
+        if self.verify_ttl_seconds <= 0:
+            return False
+        now = time.monotonic()
+        with self._lock:
+            return self._verified.get(key, now) is not None
+
+    def mark_verified(self, key: bytes) -> None:
+        if self.verify_ttl_seconds <= 0:
+            return
+        with self._lock:
+            self._verified.put(key, True, time.monotonic() + self.verify_ttl_seconds)
+
+    def invalidate_user(self, username: Optional[str]) -> None:
+        with self._lock:
+            self._epoch += 1
+            if username is not None and self._users.pop(username):
+                self._invalidations += 1
+
+    def clear(self) -> None:
+        # Solo usuarios: un token validado no depende de app_users
+        with self._lock:
+            self._epoch += 1
+            self._invalidations += self._users.clear()
+
+    def stats(self) -> dict[str, Any]:
+        with self._lock:
+            return {
+                "ttl_seconds": self.ttl_seconds,
+                "tokens": self._tokens.stats(),
+                "users": self._users.stats(),
+                "logins": self._verified.stats(),
+                "invalidations": self._invalidations,
+            }
+
+
+def apply_invalidation(payload: dict) -> None:
+    for username in payload.get("u") or ():
+        auth_cache.invalidate_user(username)
+
+
+auth_cache = AuthCache(
+    max_entries=settings.AUTH_CACHE_MAX_ENTRIES,
+    ttl_seconds=settings.AUTH_CACHE_TTL_SECONDS,
+    verify_ttl_seconds=settings.AUTH_VERIFY_CACHE_SECONDS,
+)
@@ -0,0 +1,52 @@
+from __future__ import annotations
+
+import json
+import threading
+import time
+import traceback
+
+import psycopg
+
+from app.core import auth_cache as auth
+from app.core.read_cache import ticket_read_cache
+from app.db.session import engine
+from app.services.cache_invalidation_service import CHANNEL, apply_invalidation
+
+
+def _conninfo() -> str:
+    return engine.url.set(drivername="postgresql").render_as_string(hide_password=False)
+
+
+def _listen_loop():
+    while True:
+        try:
+            with psycopg.connect(_conninfo(), autocommit=True) as conn:
+                conn.execute(f"LISTEN {CHANNEL}")
+                conn.execute(f"LISTEN {auth.CHANNEL}")
+                # Pudimos perder avisos mientras no escuchábamos.
+                _clear_all()
+                for notify in conn.notifies():
+                    if notify.channel == auth.CHANNEL:
+                        try:
+                            auth.apply_invalidation(json.loads(notify.payload))
+                        except Exception:
+                            auth.auth_cache.clear()
+                        continue
+                    try:
+                        apply_invalidation(json.loads(notify.payload))
+                    except Exception:
+                        ticket_read_cache.clear()
+        except Exception:
+            traceback.print_exc()
+            _clear_all()
+            time.sleep(5)
+
+
+def _clear_all():
+    ticket_read_cache.clear()
+    auth.auth_cache.clear()
+
+
+def start_cache_invalidation_listener():
+    t = threading.Thread(target=_listen_loop, daemon=True)
+    t.start()
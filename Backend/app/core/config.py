@@ -13,6 +13,86 @@ class Settings(BaseSettings):
     ENV: str = "dev"
     CORS_ORIGINS: str = "http://localhost:5173"
 
+    # Tokens validados y usuarios de app_users en memoria (app/core/auth_cache.py)
+    AUTH_CACHE_MAX_ENTRIES: int = 5000
+    AUTH_CACHE_TTL_SECONDS: int = 60
+    # Logins correctos recordados (usuario + contraseña + hash): no repiten bcrypt
+    AUTH_VERIFY_CACHE_SECONDS: int = 300
+
+    # bcrypt en procesos aparte (app/core/password_pool.py): procesos, logins en vuelo
+    # antes de responder 503 y espera máxima por un lugar
+    BCRYPT_ROUNDS: int = 12
+    PASSWORD_POOL_WORKERS: int = 2
+    PASSWORD_POOL_MAX_PENDING: int = 8
+    PASSWORD_POOL_ADMISSION_TIMEOUT_MS: int = 2000
+
+    # Pool del engine async (app/db/async_session.py: routers de tickets y auth). El
+    # engine sync de app/db/session.py queda para los hilos de fondo y administración.
+    ASYNC_DB_POOL_SIZE: int = 10
+    ASYNC_DB_MAX_OVERFLOW: int = 20
+    ASYNC_DB_POOL_TIMEOUT_SECONDS: float = 10.0
+
+    READ_CACHE_MAX_MB: int = 32
+    READ_CACHE_TTL_SECONDS: int = 60
+
+    GZIP_MIN_BYTES: int = 1024
+    GZIP_LEVEL: int = 5
+
+    # Espera máxima por el row lock de un ticket y reintentos antes de responder 409
+    LOCK_TIMEOUT_MS: int = 250
+    LOCK_RETRIES: int = 2
+    LOCK_RETRY_BASE_MS: int = 50
+
+    # Auditoría: tipos de evento que van al buffer asíncrono (el resto se escribe en la
+    # transacción del cambio), tamaño del buffer y lote/intervalo de escritura
+    AUDIT_ASYNC_EVENT_TYPES: str = "PRINT"
+    AUDIT_QUEUE_MAX: int = 10000
+    AUDIT_BATCH_SIZE: int = 500
+    AUDIT_FLUSH_MS: int = 200
+
+    # Archivado de tickets LISTO/CANCELADO (app/core/ticket_archiver.py)
+    ARCHIVE_ENABLED: bool = True
+    ARCHIVE_AFTER_HOURS: int = 12
+    ARCHIVE_BATCH_SIZE: int = 200
+    ARCHIVE_INTERVAL_SECONDS: int = 300
+
+    # Particiones mensuales (sql/010_monthly_partitions.sql): meses creados por adelantado
+    # y retención en meses (se borran particiones enteras). sync_runs queda resumido en
+    # sync_run_daily antes de borrarse.
+    PARTITION_MONTHS_AHEAD: int = 3
+    EVENTS_RETENTION_MONTHS: int = 18
+    SYNC_RUNS_RETENTION_MONTHS: int = 3
+    PARTITION_MAINTENANCE_INTERVAL_SECONDS: int = 6 * 3600
+
+    # Rollups de desempeño para /analytics (app/core/kitchen_perf_roller.py). Los días se
+    # cortan en ANALYTICS_TIMEZONE; el primer rollup agrega ANALYTICS_BACKFILL_DAYS hacia atrás.
+    ANALYTICS_ROLLUP_ENABLED: bool = True
+    ANALYTICS_ROLLUP_INTERVAL_SECONDS: int = 120
+    ANALYTICS_ROLLUP_GRACE_MINUTES: int = 10
+    ANALYTICS_BACKFILL_DAYS: int = 400
+    ANALYTICS_ROLLUP_WORK_MEM_MB: int = 64
+    ANALYTICS_TIMEZONE: str = "America/Bogota"
+
+    # /analytics/prep-times (NumPy sobre los items del rango): rango máximo y cache
+    PREP_TIMES_MAX_DAYS: int = 92
+    ANALYTICS_CACHE_MAX_MB: int = 16
+    ANALYTICS_CACHE_TTL_SECONDS: int = 300
+
+    # Impresión de comandas: HTML renderizado por (ticket, versión, ancho)
+    PRINT_CACHE_MAX_MB: int = 8
+    PRINT_CACHE_TTL_SECONDS: int = 3600
+    PRINT_BATCH_MAX: int = 100
+
+    # Impresoras de red ESC/POS (app/core/print_spooler.py): "cocina=192.168.1.50:9100,barra=192.168.1.51"
+    # (puerto 9100 si no se indica)
+    PRINTERS: str = ""
+    PRINT_SPOOLER_QUEUE_MAX: int = 500
+    PRINT_SPOOLER_BATCH_MAX: int = 10
+    PRINT_SPOOLER_RETRIES: int = 3
+    PRINT_SPOOLER_RETRY_BASE_MS: int = 500
+    PRINT_SPOOLER_TIMEOUT_SECONDS: float = 5.0
+    PRINT_SPOOLER_CONFIRM: bool = True  # DLE EOT tras cada envío (apagar si la impresora no lo soporta)
+
     @field_validator("CORS_ORIGINS")
     @classmethod
     def normalize_cors(cls, v: str) -> str:
@@ -21,4 +101,19 @@ class Settings(BaseSettings):
     def cors_list(self) -> List[str]:
         return [x.strip() for x in self.CORS_ORIGINS.split(",") if x.strip()]
 
+    def audit_async_types(self) -> set[str]:
+        return {x.strip().upper() for x in self.AUDIT_ASYNC_EVENT_TYPES.split(",") if x.strip()}
+
+    def printers(self) -> dict[str, tuple[str, int]]:
+        out: dict[str, tuple[str, int]] = {}
+        for entry in self.PRINTERS.split(","):
+            name, _, address = entry.partition("=")
+            if not name.strip() or not address.strip():
+                continue
+            host, sep, port = address.strip().rpartition(":")
+            if not sep:
+                host, port = address.strip(), "9100"
+            out[name.strip()] = (host, int(port))
+        return out
+
 settings = Settings()
@@ -0,0 +1,41 @@
+from __future__ import annotations
+
+import gzip
+from decimal import Decimal
+from typing import Any, Iterable, Optional, Sequence
+
+import orjson
+
+from app.core.config import settings
+
+
+def _default(obj: Any):
+    if isinstance(obj, Decimal):
+        return float(obj)
+    raise TypeError
+
+
+def dumps(obj: Any) -> bytes:
+    return orjson.dumps(obj, default=_default)
+
+
+def row_dict(row: Any, fields: Sequence[str], *, item_fields: Optional[Sequence[str]] = None) -> dict:
+    """
+    Fila de DB -> dict sin pasar por validación Pydantic (las filas ya vienen tipadas
+    desde SQLAlchemy). `fields` sale del response_model para no cambiar el contrato.
+    """
+    d = {f: getattr(row, f) for f in fields if f != "items"}
+    if item_fields is not None:
+        d["items"] = [{f: getattr(i, f) for f in item_fields} for i in row.items]
+    return d
+
+
+def rows_json(rows: Iterable[Any], fields: Sequence[str], *, item_fields: Optional[Sequence[str]] = None) -> bytes:
+    return dumps([row_dict(r, fields, item_fields=item_fields) for r in rows])
+
+
+def maybe_gzip(body: bytes) -> Optional[bytes]:
+    """Versión gzip si vale la pena por tamaño; None si no."""
+    if len(body) < settings.GZIP_MIN_BYTES:
+        return None
+    return gzip.compress(body, compresslevel=settings.GZIP_LEVEL)
@@ -0,0 +1,182 @@
+from __future__ import annotations
+
+import hashlib
+from typing import Awaitable, Callable, Hashable
+
+from fastapi import Request, Response, status
+
+from app.core.fast_json import maybe_gzip
+from app.core.read_cache import CacheEntry, ReadCache
+from app.core.single_flight import async_read_flight, read_flight
+
+
+def make_etag(*parts) -> str:
+    raw = "|".join("" if p is None else str(p) for p in parts)
+    return '"' + hashlib.sha1(raw.encode("utf-8")).hexdigest()[:20] + '"'
+
+
+def etag_matches(request: Request, etag: str) -> bool:
+    header = request.headers.get("if-none-match")
+    if not header:
+        return False
+    if header.strip() == "*":
+        return True
+    # Comparación débil (RFC 9110): W/"x" y "x" son equivalentes para GET.
+    candidates = [c.strip().removeprefix("W/") for c in header.split(",")]
+    return etag in candidates or _gzip_etag(etag) in candidates
+
+
+def _gzip_etag(etag: str) -> str:
+    # La variante comprimida es otra representación: ETag distinto pero revalidable.
+    return etag[:-1] + '-gz"'
+
+
+def accepts_gzip(request: Request) -> bool:
+    # Accept-Encoding con q-values (RFC 9110): "gzip;q=0" es un rechazo explícito, y
+    # sin "gzip" en la lista decide el comodín "*".
+    quality: dict[str, float] = {}
+    for token in request.headers.get("accept-encoding", "").split(","):
+        coding, _, params = token.partition(";")
+        coding = coding.strip().lower()
+        if not coding:
+            continue
+        q = 1.0
+        for param in params.split(";"):
+            name, _, value = param.partition("=")
+            if name.strip().lower() == "q":
+                try:
+                    q = float(value)
+                except ValueError:
+                    q = 0.0
+        quality[coding] = q
+    return quality.get("gzip", quality.get("*", 0.0)) > 0
+
+
+def set_etag(response: Response, etag: str) -> None:
+    response.headers["ETag"] = etag
+    # Obliga al navegador a revalidar siempre (If-None-Match) en vez de usar copia local.
+    response.headers["Cache-Control"] = "no-cache"
+
+
+def not_modified(etag: str) -> Response:
+    response = Response(status_code=status.HTTP_304_NOT_MODIFIED)
+    set_etag(response, etag)
+    return response
+
+
+def cached_json_response(
+    request: Request,
+    *,
+    cache: ReadCache,
+    key: Hashable,
+    version: Callable[[], int],
+    build: Callable[[], bytes | tuple[bytes, dict[str, str]]],
+) -> Response:
+    """
+    Read-through: cache -> (versión barata para 304) -> query + serialización.
+    `version` puede lanzar HTTPException (p.ej. 404) antes de tocar el ORM.
+    En un miss, las peticiones idénticas concurrentes comparten la misma consulta
+    de versión y el mismo build (single-flight). `build` puede devolver
+    (body, headers) para headers que dependen del contenido (p.ej. cursores).
+    """
+    entry = cache.get(key)
+    if entry is None:
+        epoch = cache.epoch()
+        v = read_flight.do(("version", key), version)
+        etag = make_etag(*key, v)
+        if etag_matches(request, etag):
+            return not_modified(etag)
+
+        def _fill() -> CacheEntry:
+            return _fill_entry(cache, key, epoch, etag, v, build())
+
+        entry = read_flight.do(("build", key, v), _fill)
+    elif etag_matches(request, entry.etag):
+        return not_modified(entry.etag)
+
+    return _entry_response(request, entry)
+
+
+async def cached_json_response_async(
+    request: Request,
+    *,
+    cache: ReadCache,
+    key: Hashable,
+    version: Callable[[], Awaitable[int]],
+    build: Callable[[], Awaitable[bytes | tuple[bytes, dict[str, str]]]],
+) -> Response:
+    """cached_json_response para routers async: un hit no toca la DB ni el threadpool."""
+    entry = cache.get(key)
+    if entry is None:
+        epoch = cache.epoch()
+        v = await async_read_flight.do(("version", key), version)
+        etag = make_etag(*key, v)
+        if etag_matches(request, etag):
+            return not_modified(etag)
+
+        async def _fill() -> CacheEntry:
+            return _fill_entry(cache, key, epoch, etag, v, await build())
+
+        entry = await async_read_flight.do(("build", key, v), _fill)
+    elif etag_matches(request, entry.etag):
+        return not_modified(entry.etag)
+
+    return _entry_response(request, entry)
+
+
+def _fill_entry(
+    cache: ReadCache,
+    key: Hashable,
+    epoch: int,
+    etag: str,
+    version: int,
+    built: bytes | tuple[bytes, dict[str, str]],
+) -> CacheEntry:
+    body, headers = built if isinstance(built, tuple) else (built, {})
+    filled = CacheEntry(body=body, etag=etag, version=version, headers=headers, gzip_body=maybe_gzip(body))
+    cache.put(key, filled, epoch)
+    return filled
+
+
+def _entry_response(request: Request, entry: CacheEntry) -> Response:
+    response = json_bytes_response(request, entry.body, gzip_body=entry.gzip_body, etag=entry.etag)
+    response.headers.update(entry.headers)
+    return response
+
+
+def coalesced_json_response(request: Request, key: Hashable, build: Callable[[], bytes]) -> Response:
+    """Para lecturas sin versión/cache: solo comparte el resultado entre peticiones simultáneas."""
+
+    def _build() -> tuple[bytes, bytes | None]:
+        body = build()
+        return body, maybe_gzip(body)
+
+    body, gzip_body = read_flight.do(("build", key), _build)
+    return json_bytes_response(request, body, gzip_body=gzip_body)
+
+
+async def coalesced_json_response_async(request: Request, key: Hashable, build: Callable[[], Awaitable[bytes]]) -> Response:
+    async def _build() -> tuple[bytes, bytes | None]:
+        body = await build()
+        return body, maybe_gzip(body)
+
+    body, gzip_body = await async_read_flight.do(("build", key), _build)
+    return json_bytes_response(request, body, gzip_body=gzip_body)
+
+
+def json_bytes_response(
+    request: Request,
+    body: bytes,
+    *,
+    gzip_body: bytes | None = None,
+    etag: str | None = None,
+) -> Response:
+    use_gzip = gzip_body is not None and accepts_gzip(request)
+    response = Response(content=gzip_body if use_gzip else body, media_type="application/json")
+    if gzip_body is not None:
+        response.headers["Vary"] = "Accept-Encoding"
+    if use_gzip:
+        response.headers["Content-Encoding"] = "gzip"
+    if etag:
+        set_etag(response, _gzip_etag(etag) if use_gzip else etag)
+    return response
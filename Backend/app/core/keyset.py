@@ -0,0 +1,76 @@
+from __future__ import annotations
+
+import base64
+import json
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Any, Literal
+from uuid import UUID
+
+from fastapi import HTTPException
+from sqlalchemy import tuple_
+
+
+@dataclass(frozen=True, slots=True)
+class Cursor:
+    """Posición (ts, id) en un listado ordenado DESC y hacia dónde seguir desde ahí."""
+
+    ts: datetime
+    id: UUID
+    direction: Literal["next", "prev"] = "next"
+
+
+def encode_cursor(ts: datetime, id_: UUID, direction: Literal["next", "prev"]) -> str:
+    raw = json.dumps([direction[0], ts.isoformat(), str(id_)], separators=(",", ":"))
+    return base64.urlsafe_b64encode(raw.encode("utf-8")).decode("ascii").rstrip("=")
+
+
+def decode_cursor(token: str) -> Cursor:
+    try:
+        padded = token + "=" * (-len(token) % 4)
+        d, ts, id_ = json.loads(base64.urlsafe_b64decode(padded.encode("ascii")))
+        return Cursor(ts=datetime.fromisoformat(ts), id=UUID(id_), direction="prev" if d == "p" else "next")
+    except Exception:
+        raise HTTPException(status_code=400, detail="Cursor inválido")
+
+
+def apply_keyset(qry, *, ts_col, id_col, limit: int, cursor: Cursor | None):
+    """
+    Orden (ts DESC, id DESC) con comparación de fila, así la página N cuesta lo
+    mismo que la primera. Pide limit + 1 filas para saber si hay más.
+    Sirve para Query del ORM y para select().
+    """
+    if cursor is None:
+        return qry.order_by(ts_col.desc(), id_col.desc()).limit(limit + 1)
+    if cursor.direction == "next":
+        return (
+            qry.filter(tuple_(ts_col, id_col) < tuple_(cursor.ts, cursor.id))
+            .order_by(ts_col.desc(), id_col.desc())
+            .limit(limit + 1)
+        )
+    return (
+        qry.filter(tuple_(ts_col, id_col) > tuple_(cursor.ts, cursor.id))
+        .order_by(ts_col.asc(), id_col.asc())
+        .limit(limit + 1)
+    )
+
+
+def finish_keyset(rows: list[Any], *, ts_attr: str, limit: int, cursor: Cursor | None) -> tuple[list[Any], dict[str, str]]:
+    """Recorta la fila extra, deja la página en orden DESC y arma X-Next-Cursor / X-Prev-Cursor."""
+    more = len(rows) > limit
+    page = list(rows[:limit])
+
+    if cursor is not None and cursor.direction == "prev":
+        page.reverse()
+        has_older, has_newer = True, more
+    else:
+        has_older, has_newer = more, cursor is not None
+
+    headers: dict[str, str] = {}
+    if page and has_older:
+        last = page[-1]
+        headers["X-Next-Cursor"] = encode_cursor(getattr(last, ts_attr), last.id, "next")
+    if page and has_newer:
+        first = page[0]
+        headers["X-Prev-Cursor"] = encode_cursor(getattr(first, ts_attr), first.id, "prev")
+    return page, headers
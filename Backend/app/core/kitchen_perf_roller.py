@@ -0,0 +1,30 @@
+from __future__ import annotations
+
+import threading
+import time
+import traceback
+
+from app.core.config import settings
+from app.db.session import SessionLocal
+from app.services.kitchen_perf_service import rollup_kitchen_perf
+
+
+def _rollup_loop():
+    while True:
+        db = SessionLocal()
+        try:
+            rollup_kitchen_perf(db)
+        except Exception:
+            traceback.print_exc()
+            db.rollback()
+        finally:
+            db.close()
+
+        time.sleep(max(10, settings.ANALYTICS_ROLLUP_INTERVAL_SECONDS))
+
+
+def start_kitchen_perf_roller():
+    if not settings.ANALYTICS_ROLLUP_ENABLED:
+        return
+    t = threading.Thread(target=_rollup_loop, daemon=True)
+    t.start()
@@ -0,0 +1,32 @@
+from __future__ import annotations
+
+import threading
+import time
+import traceback
+
+from app.core.config import settings
+from app.db.session import SessionLocal
+from app.services.partition_service import run_partition_maintenance
+
+
+def _maintenance_loop():
+    # La primera vuelta corre al arrancar: garantiza la partición del mes en curso.
+    while True:
+        db = SessionLocal()
+        try:
+            res = run_partition_maintenance(db)
+            created = sum(res.created.values())
+            if created or res.dropped:
+                print(f"[PARTITIONS] created={created} dropped={res.dropped} rollup_rows={res.rolled_up_days}")
+        except Exception:
+            traceback.print_exc()
+            db.rollback()
+        finally:
+            db.close()
+
+        time.sleep(max(60, settings.PARTITION_MAINTENANCE_INTERVAL_SECONDS))
+
+
+def start_partition_maintenance():
+    t = threading.Thread(target=_maintenance_loop, daemon=True)
+    t.start()
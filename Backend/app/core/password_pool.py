@@ -0,0 +1,205 @@
+from __future__ import annotations
+
+import asyncio
+import atexit
+import multiprocessing
+import threading
+import time
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from typing import Any, Callable, NoReturn, Optional
+
+from app.core.config import settings
+from app.core.security import hash_password, verify_and_update
+
+# ==========================================================
+# BCRYPT FUERA DEL WORKER (login)
+# Cada verificación son ~250 ms de CPU (BCRYPT_ROUNDS=12). Corre en un pool de
+# PASSWORD_POOL_WORKERS procesos para que un cambio de turno (todas las tablets
+# entrando a la vez) no deje sin CPU/hilos a los endpoints de tickets. Como máximo
+# PASSWORD_POOL_MAX_PENDING logins esperan o corren a la vez; el siguiente espera
+# PASSWORD_POOL_ADMISSION_TIMEOUT_MS y si no hay lugar sale PasswordPoolBusy (503).
+# Con PASSWORD_POOL_WORKERS=0 se verifica en el mismo hilo (desarrollo, --reload).
+# Los procesos salen de un forkserver (spawn en Windows), no de un fork del worker:
+# cuando llega el primer login el worker ya tiene hilos (listener, pools, spooler) y un
+# fork heredaría sus locks tomados. start() arma el pool al arrancar la app.
+# verify_async (router de auth async) espera el resultado del proceso con await; solo si
+# no hay lugar libre espera la admisión en un hilo del executor.
+# ==========================================================
+
+
+class PasswordPoolBusy(Exception):
+    pass
+
+
+def _mp_context() -> multiprocessing.context.BaseContext:
+    if "forkserver" in multiprocessing.get_all_start_methods():
+        ctx = multiprocessing.get_context("forkserver")
+        # Cada proceso nuevo arranca con passlib/bcrypt ya importados
+        ctx.set_forkserver_preload(["app.core.security"])
+        return ctx
+    return multiprocessing.get_context("spawn")
+
+
+def _ready() -> bool:
+    return True
+
+
+class PasswordPool:
+    def __init__(self, *, workers: int, max_pending: int, admission_timeout_ms: int):
+        self.workers = max(0, workers)
+        self.max_pending = max(1, max_pending)
+        self.admission_timeout = max(0, admission_timeout_ms) / 1000
+        self._slots = threading.BoundedSemaphore(self.max_pending)
+        self._lock = threading.Lock()
+        self._executor: ProcessPoolExecutor | None = None
+
+        self._in_flight = 0
+        self._completed = 0
+        self._rejected = 0
+        self._errors = 0
+        self._run_ms_total = 0.0
+        self._run_ms_max = 0.0
+        self._wait_ms_max = 0.0
+
+    def verify(self, plain_password: str, password_hash: str) -> tuple[bool, Optional[str]]:
+        """(válida, hash nuevo si hay que rehashear). PasswordPoolBusy si no hay lugar."""
+        return self._run(verify_and_update, plain_password, password_hash)
+
+    async def verify_async(self, plain_password: str, password_hash: str) -> tuple[bool, Optional[str]]:
+        return await self._run_async(verify_and_update, plain_password, password_hash)
+
+    def hash(self, plain_password: str) -> str:
+        return self._run(hash_password, plain_password)
+
+    def stats(self) -> dict[str, Any]:
+        with self._lock:
+            return {
+                "workers": self.workers,
+                "max_pending": self.max_pending,
+                "in_flight": self._in_flight,
+                "completed": self._completed,
+                "rejected": self._rejected,
+                "errors": self._errors,
+                "run_ms_avg": round(self._run_ms_total / self._completed, 3) if self._completed else 0.0,
+                "run_ms_max": round(self._run_ms_max, 3),
+                "admission_wait_ms_max": round(self._wait_ms_max, 3),
+            }
+
+    def start(self) -> None:
+        """Crea el pool y levanta sus procesos en segundo plano (sin esperar)."""
+        if self.workers == 0:
+            return
+        pool = self._pool()
+        for _ in range(self.workers):
+            pool.submit(_ready)
+
+    def shutdown(self) -> None:
+        with self._lock:
+            executor, self._executor = self._executor, None
+        if executor is not None:
+            executor.shutdown(wait=False, cancel_futures=True)
+
+    def _pool(self) -> ProcessPoolExecutor:
+        with self._lock:
+            if self._executor is None:
+                self._executor = ProcessPoolExecutor(max_workers=self.workers, mp_context=_mp_context())
+            return self._executor
+
+    def _run(self, fn: Callable[..., Any], *args: Any) -> Any:
+        t0 = time.perf_counter()
+        if not self._slots.acquire(timeout=self.admission_timeout):
+            self._reject()
+        t1 = self._admitted(t0)
+        try:
+            if self.workers == 0:
+                result = fn(*args)
+            else:
+                pool = self._pool()
+                try:
+                    result = pool.submit(fn, *args).result()
+                except BrokenProcessPool:
+                    # Un proceso murió (OOM, kill): se arma un pool nuevo y se reintenta una vez
+                    self._discard(pool)
+                    result = self._pool().submit(fn, *args).result()
+        except Exception:
+            self._failed()
+            raise
+        finally:
+            self._release()
+        self._completed_in(t1)
+        return result
+
+    async def _run_async(self, fn: Callable[..., Any], *args: Any) -> Any:
+        t0 = time.perf_counter()
+        if not self._slots.acquire(blocking=False) and not await self._acquire_async():
+            self._reject()
+        t1 = self._admitted(t0)
+        try:
+            if self.workers == 0:
+                result = await asyncio.to_thread(fn, *args)
+            else:
+                pool = self._pool()
+                try:
+                    result = await asyncio.wrap_future(pool.submit(fn, *args))
+                except BrokenProcessPool:
+                    self._discard(pool)
+                    result = await asyncio.wrap_future(self._pool().submit(fn, *args))
+        except Exception:
+            self._failed()
+            raise
+        finally:
+            self._release()
+        self._completed_in(t1)
+        return result
+
+    async def _acquire_async(self) -> bool:
+        # El semáforo es de hilos (lo comparten verify y verify_async): la espera bloqueante
+        # corre en el executor por defecto y el event loop solo espera el resultado.
+        waiter = asyncio.get_running_loop().run_in_executor(None, self._slots.acquire, True, self.admission_timeout)
+        try:
+            return await asyncio.shield(waiter)
+        except asyncio.CancelledError:
+            # El request se canceló: si el lugar llega igual, se devuelve
+            waiter.add_done_callback(lambda f: f.result() and self._slots.release())
+            raise
+
+    def _discard(self, pool: ProcessPoolExecutor) -> None:
+        with self._lock:
+            if self._executor is pool:
+                self._executor = None
+
+    def _reject(self) -> NoReturn:
+        with self._lock:
+            self._rejected += 1
+        raise PasswordPoolBusy()
+
+    def _admitted(self, t0: float) -> float:
+        t1 = time.perf_counter()
+        with self._lock:
+            self._in_flight += 1
+            self._wait_ms_max = max(self._wait_ms_max, (t1 - t0) * 1000)
+        return t1
+
+    def _failed(self) -> None:
+        with self._lock:
+            self._errors += 1
+
+    def _release(self) -> None:
+        self._slots.release()
+        with self._lock:
+            self._in_flight -= 1
+
+    def _completed_in(self, t1: float) -> None:
+        elapsed = (time.perf_counter() - t1) * 1000
+        with self._lock:
+            self._completed += 1
+            self._run_ms_total += elapsed
+            self._run_ms_max = max(self._run_ms_max, elapsed)
+
+password_pool = PasswordPool(
+    workers=settings.PASSWORD_POOL_WORKERS,
+    max_pending=settings.PASSWORD_POOL_MAX_PENDING,
+    admission_timeout_ms=settings.PASSWORD_POOL_ADMISSION_TIMEOUT_MS,
+)
+atexit.register(password_pool.shutdown)
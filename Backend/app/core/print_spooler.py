@@ -0,0 +1,259 @@
+from __future__ import annotations
+
+import queue
+import random
+import socket
+import threading
+import time
+import traceback
+from dataclasses import dataclass, field
+from datetime import datetime, timezone
+from typing import Any, Optional
+from uuid import UUID, uuid4
+
+from app.core.audit_writer import audit_writer
+from app.core.config import settings
+from app.services.escpos_service import STATUS_REQUEST
+
+# ==========================================================
+# SPOOLER DE IMPRESIÓN ESC/POS (impresoras de red, puerto 9100 "raw")
+# Una cola acotada y un hilo por impresora (PRINTERS). El hilo junta los trabajos que
+# esperan en un solo envío y reintenta con backoff si la impresora no responde.
+# Cada envío abre y cierra su conexión: la impresora atiende una conexión a la vez y
+# cada worker de uvicorn/gunicorn tiene su propio spooler, así que ninguno la deja
+# tomada entre envíos. El puerto 9100 no confirma nada: con PRINT_SPOOLER_CONFIRM,
+# después de cada envío se pide el estado (DLE EOT) y sin respuesta válida el envío
+# cuenta como fallido. Un trabajo que agota los reintentos queda como PRINT_FAILED en
+# la auditoría. Probar sin impresora: python fake_printer.py
+# ==========================================================
+
+
+@dataclass
+class PrintJob:
+    printer: str
+    data: bytes
+    ticket_ids: list[UUID] = field(default_factory=list)
+    id: UUID = field(default_factory=uuid4)
+    enqueued_at: float = field(default_factory=time.monotonic)
+
+
+class PrinterWorker:
+    def __init__(
+        self,
+        name: str,
+        host: str,
+        port: int,
+        *,
+        max_queue: int,
+        batch_max: int,
+        retries: int,
+        retry_base_ms: int,
+        timeout_s: float,
+        confirm: bool,
+    ):
+        self.name = name
+        self.host = host
+        self.port = port
+        self.batch_max = max(1, batch_max)
+        self.retries = max(0, retries)
+        self.retry_base_ms = retry_base_ms
+        self.timeout_s = timeout_s
+        self.confirm = confirm
+        self._queue: queue.Queue[PrintJob] = queue.Queue(maxsize=max(1, max_queue))
+        self._lock = threading.Lock()
+        self._thread: threading.Thread | None = None
+
+        self._enqueued = 0
+        self._rejected = 0
+        self._printed = 0
+        self._failed = 0
+        self._sends = 0
+        self._retries = 0
+        self._connects = 0
+        self._bytes = 0
+        self._send_ms_total = 0.0
+        self._wait_ms_max = 0.0
+        self._last_error: str | None = None
+        self._last_ok_at: datetime | None = None
+
+    def enqueue(self, job: PrintJob) -> bool:
+        self._ensure_started()
+        try:
+            self._queue.put_nowait(job)
+        except queue.Full:
+            with self._lock:
+                self._rejected += 1
+            return False
+        with self._lock:
+            self._enqueued += 1
+        return True
+
+    def queue_depth(self) -> int:
+        return self._queue.qsize()
+
+    def stats(self) -> dict[str, Any]:
+        with self._lock:
+            return {
+                "address": f"{self.host}:{self.port}",
+                "queue_depth": self._queue.qsize(),
+                "queue_max": self._queue.maxsize,
+                "enqueued": self._enqueued,
+                "rejected": self._rejected,
+                "printed": self._printed,
+                "failed": self._failed,
+                "sends": self._sends,
+                "retries": self._retries,
+                "connects": self._connects,
+                "bytes": self._bytes,
+                "send_ms_avg": round(self._send_ms_total / self._sends, 3) if self._sends else 0.0,
+                "queue_wait_ms_max": round(self._wait_ms_max, 3),
+                "last_error": self._last_error,
+                "last_ok_at": self._last_ok_at,
+            }
+
+    def _ensure_started(self) -> None:
+        if self._thread is not None:
+            return
+        with self._lock:
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._loop, name=f"printer-{self.name}", daemon=True)
+                self._thread.start()
+
+    def _drain(self) -> list[PrintJob]:
+        jobs = [self._queue.get()]
+        while len(jobs) < self.batch_max:
+            try:
+                jobs.append(self._queue.get_nowait())
+            except queue.Empty:
+                break
+        return jobs
+
+    def _connect(self) -> socket.socket:
+        sock = socket.create_connection((self.host, self.port), timeout=self.timeout_s)
+        sock.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+        with self._lock:
+            self._connects += 1
+        return sock
+
+    @staticmethod
+    def _discard_pending(sock: socket.socket) -> None:
+        # Lo que la impresora haya mandado por su cuenta se descarta antes de pedir el
+        # estado: el byte que se lea después es la respuesta a este DLE EOT.
+        sock.setblocking(False)
+        try:
+            while True:
+                if not sock.recv(4096):
+                    raise ConnectionError("la impresora cerró la conexión")
+        except BlockingIOError:
+            pass
+        finally:
+            sock.setblocking(True)
+
+    def _confirm(self, sock: socket.socket) -> None:
+        self._discard_pending(sock)
+        sock.settimeout(self.timeout_s)
+        sock.sendall(STATUS_REQUEST)
+        status = sock.recv(1)
+        if not status:
+            raise ConnectionError("la impresora cerró la conexión sin responder el estado")
+        # Respuesta a DLE EOT 1: bits 1 y 4 en 1, bits 0 y 7 en 0
+        if status[0] & 0x93 != 0x12:
+            raise ConnectionError(f"respuesta de estado inválida: {status.hex()}")
+
+    def _send(self, jobs: list[PrintJob]) -> bool:
+        data = b"".join(j.data for j in jobs)
+        for attempt in range(self.retries + 1):
+            t0 = time.perf_counter()
+            try:
+                with self._connect() as sock:
+                    sock.sendall(data)
+                    if self.confirm:
+                        self._confirm(sock)
+            except OSError as e:
+                # Sin confirmación no se sabe cuánto alcanzó a imprimir: se reenvía
+                # el lote completo (puede salir una comanda repetida, nunca perdida).
+                with self._lock:
+                    self._last_error = f"{type(e).__name__}: {e}"
+                    if attempt < self.retries:
+                        self._retries += 1
+                if attempt < self.retries:
+                    delay = self.retry_base_ms * (2 ** attempt) / 1000
+                    time.sleep(delay + random.uniform(0, delay))
+                continue
+            elapsed = (time.perf_counter() - t0) * 1000
+            with self._lock:
+                self._sends += 1
+                self._printed += len(jobs)
+                self._bytes += len(data)
+                self._send_ms_total += elapsed
+                self._last_ok_at = datetime.now(timezone.utc)
+            return True
+        with self._lock:
+            self._failed += len(jobs)
+        return False
+
+    def _report_failed(self, jobs: list[PrintJob]) -> None:
+        now = datetime.now(timezone.utc)
+        for job in jobs:
+            for ticket_id in job.ticket_ids:
+                audit_writer.enqueue(
+                    {
+                        "id": uuid4(),
+                        "ticket_id": ticket_id,
+                        "item_id": None,
+                        "event_type": "PRINT_FAILED",
+                        "message": f"No se pudo imprimir en {self.name} ({self.host}:{self.port})",
+                        "meta": {"printer": self.name, "job_id": str(job.id), "error": self._last_error},
+                        "user_name": None,
+                        "created_at": now,
+                    }
+                )
+
+    def _loop(self) -> None:
+        while True:
+            jobs = self._drain()
+            now = time.monotonic()
+            with self._lock:
+                self._wait_ms_max = max(self._wait_ms_max, (now - jobs[0].enqueued_at) * 1000)
+            try:
+                if not self._send(jobs):
+                    print(f"[PRINTER {self.name}] {len(jobs)} trabajo(s) fallidos: {self._last_error}")
+                    self._report_failed(jobs)
+            except Exception:
+                traceback.print_exc()
+
+
+class PrintSpooler:
+    def __init__(self, printers: dict[str, tuple[str, int]]):
+        self._workers = {
+            name: PrinterWorker(
+                name,
+                host,
+                port,
+                max_queue=settings.PRINT_SPOOLER_QUEUE_MAX,
+                batch_max=settings.PRINT_SPOOLER_BATCH_MAX,
+                retries=settings.PRINT_SPOOLER_RETRIES,
+                retry_base_ms=settings.PRINT_SPOOLER_RETRY_BASE_MS,
+                timeout_s=settings.PRINT_SPOOLER_TIMEOUT_SECONDS,
+                confirm=settings.PRINT_SPOOLER_CONFIRM,
+            )
+            for name, (host, port) in printers.items()
+        }
+
+    def printers(self) -> list[str]:
+        return list(self._workers)
+
+    def submit(self, printer: str, data: bytes, ticket_ids: list[UUID]) -> Optional[PrintJob]:
+        """Encola el trabajo. KeyError si la impresora no existe; None si su cola está llena."""
+        worker = self._workers[printer]
+        job = PrintJob(printer=printer, data=data, ticket_ids=ticket_ids)
+        return job if worker.enqueue(job) else None
+
+    def queue_depth(self, printer: str) -> int:
+        return self._workers[printer].queue_depth()
+
+    def stats(self) -> dict[str, Any]:
+        return {name: w.stats() for name, w in self._workers.items()}
+
+
+print_spooler = PrintSpooler(settings.printers())
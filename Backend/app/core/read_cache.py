@@ -0,0 +1,132 @@
+from __future__ import annotations
+
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import dataclass, field
+from typing import Any, Callable, Hashable, Optional
+
+from app.core.config import settings
+
+
+@dataclass(slots=True)
+class CacheEntry:
+    body: bytes
+    etag: str
+    version: int
+    headers: dict[str, str] = field(default_factory=dict)
+    gzip_body: Optional[bytes] = None
+    expires_at: float = 0.0
+
+    @property
+    def size(self) -> int:
+        return len(self.body) + len(self.gzip_body or b"") + 256
+
+
+class ReadCache:
+    """
+    LRU en memoria acotado por bytes y TTL.
+
+    `epoch()` se toma antes de calcular una entrada y `put()` la descarta si hubo
+    una invalidación en medio: así una lectura lenta nunca re-publica datos viejos.
+    """
+
+    def __init__(self, *, max_bytes: int, ttl_seconds: float):
+        self.max_bytes = max_bytes
+        self.ttl_seconds = ttl_seconds
+        self._lock = threading.Lock()
+        self._entries: OrderedDict[Hashable, CacheEntry] = OrderedDict()
+        self._bytes = 0
+        self._epoch = 0
+        self._hits = 0
+        self._misses = 0
+        self._evictions = 0
+        self._invalidations = 0
+
+    def epoch(self) -> int:
+        return self._epoch
+
+    def get(self, key: Hashable) -> Optional[CacheEntry]:
+        now = time.monotonic()
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None or entry.expires_at < now:
+                if entry is not None:
+                    self._drop(key)
+                self._misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self._hits += 1
+            return entry
+
+    def put(self, key: Hashable, entry: CacheEntry, epoch: int) -> bool:
+        if entry.size > self.max_bytes:
+            return False
+        entry.expires_at = time.monotonic() + self.ttl_seconds
+        with self._lock:
+            if epoch != self._epoch:
+                return False
+            if key in self._entries:
+                self._drop(key)
+            self._entries[key] = entry
+            self._bytes += entry.size
+            while self._bytes > self.max_bytes and self._entries:
+                oldest = next(iter(self._entries))
+                self._drop(oldest)
+                self._evictions += 1
+            return True
+
+    def invalidate(self, match: Callable[[Hashable], bool]) -> int:
+        with self._lock:
+            self._epoch += 1
+            keys = [k for k in self._entries if match(k)]
+            for k in keys:
+                self._drop(k)
+            self._invalidations += len(keys)
+            return len(keys)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._epoch += 1
+            self._invalidations += len(self._entries)
+            self._entries.clear()
+            self._bytes = 0
+
+    def stats(self) -> dict[str, Any]:
+        with self._lock:
+            lookups = self._hits + self._misses
+            return {
+                "entries": len(self._entries),
+                "bytes": self._bytes,
+                "max_bytes": self.max_bytes,
+                "hits": self._hits,
+                "misses": self._misses,
+                "hit_ratio": round(self._hits / lookups, 4) if lookups else 0.0,
+                "evictions": self._evictions,
+                "invalidations": self._invalidations,
+            }
+
+    def _drop(self, key: Hashable) -> None:
+        entry = self._entries.pop(key, None)
+        if entry is not None:
+            self._bytes -= entry.size
+
+
+ticket_read_cache = ReadCache(
+    max_bytes=settings.READ_CACHE_MAX_MB * 1024 * 1024,
+    ttl_seconds=settings.READ_CACHE_TTL_SECONDS,
+)
+
+# /analytics/prep-times: resultados por (rango, filtros). Sin invalidación por NOTIFY:
+# los rangos cerrados no cambian y los abiertos viven lo que dure el TTL.
+analytics_cache = ReadCache(
+    max_bytes=settings.ANALYTICS_CACHE_MAX_MB * 1024 * 1024,
+    ttl_seconds=settings.ANALYTICS_CACHE_TTL_SECONDS,
+)
+
+# HTML de comandas por (ticket, versión, ancho): la versión va en la llave, así que
+# nunca sirve algo viejo y no necesita invalidación; lo viejo sale por LRU / TTL.
+print_cache = ReadCache(
+    max_bytes=settings.PRINT_CACHE_MAX_MB * 1024 * 1024,
+    ttl_seconds=settings.PRINT_CACHE_TTL_SECONDS,
+)
@@ -8,7 +8,9 @@ from passlib.context import CryptContext
 
 from app.core.config import settings
 
-pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
+# Subir BCRYPT_ROUNDS hace que needs_update() marque los hashes viejos: se rehashean
+# en el próximo login (app/core/password_pool.py)
+pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto", bcrypt__rounds=settings.BCRYPT_ROUNDS)
 ALGORITHM = "HS256"
 
 def verify_password(plain_password: str, password_hash: str) -> bool:
@@ -33,8 +35,15 @@ def create_access_token(subject: str, expires_minutes: Optional[int] = None, ext
 def decode_token(token: str) -> Dict[str, Any]:
     return jwt.decode(token, settings.JWT_SECRET, algorithms=[ALGORITHM])
 
-def verify_password(plain_password: str, password_hash: str) -> bool:
+def _truncate(plain_password: str) -> str:
     # bcrypt usa max 72 bytes; esto evita errores si alguien pone contraseña enorme.
     if plain_password and len(plain_password.encode("utf-8")) > 72:
         plain_password = plain_password.encode("utf-8")[:72].decode("utf-8", errors="ignore")
-    return pwd_context.verify(plain_password, password_hash)
+    return plain_password
+
+def verify_password(plain_password: str, password_hash: str) -> bool:
+    return pwd_context.verify(_truncate(plain_password), password_hash)
+
+def verify_and_update(plain_password: str, password_hash: str) -> tuple[bool, Optional[str]]:
+    """(válida, hash nuevo si el actual quedó con parámetros viejos, si no None)."""
+    return pwd_context.verify_and_update(_truncate(plain_password), password_hash)
@@ -0,0 +1,121 @@
+from __future__ import annotations
+
+import asyncio
+import threading
+from typing import Any, Awaitable, Callable, Hashable, TypeVar
+
+T = TypeVar("T")
+
+
+class _Call:
+    __slots__ = ("done", "result", "error", "waiters")
+
+    def __init__(self):
+        self.done = threading.Event()
+        self.result: Any = None
+        self.error: BaseException | None = None
+        self.waiters = 0
+
+
+class SingleFlight:
+    """
+    Coalesce llamadas concurrentes idénticas: el primer hilo con una `key` ejecuta `fn`
+    y los que lleguen mientras tanto esperan y reciben el mismo resultado (o excepción).
+    No es una cache: al terminar la llamada la key se libera.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._calls: dict[Hashable, _Call] = {}
+        self._executed = 0
+        self._shared = 0
+
+    def do(self, key: Hashable, fn: Callable[[], T]) -> T:
+        with self._lock:
+            call = self._calls.get(key)
+            if call is not None:
+                call.waiters += 1
+                self._shared += 1
+                leader = False
+            else:
+                call = _Call()
+                self._calls[key] = call
+                self._executed += 1
+                leader = True
+
+        if not leader:
+            call.done.wait()
+            if call.error is not None:
+                raise call.error
+            return call.result
+
+        try:
+            call.result = fn()
+        except BaseException as e:
+            call.error = e
+            raise
+        finally:
+            with self._lock:
+                self._calls.pop(key, None)
+            call.done.set()
+        return call.result
+
+    def stats(self) -> dict[str, Any]:
+        with self._lock:
+            return {
+                "in_flight": len(self._calls),
+                "executed": self._executed,
+                "shared": self._shared,
+            }
+
+
+class AsyncSingleFlight:
+    """
+    Lo mismo para corrutinas (routers async): quien llega mientras `fn` está en
+    vuelo espera el mismo Future sin ocupar un hilo. Solo dentro de un event loop.
+    """
+
+    def __init__(self):
+        self._calls: dict[Hashable, asyncio.Future] = {}
+        self._executed = 0
+        self._shared = 0
+
+    async def do(self, key: Hashable, fn: Callable[[], Awaitable[T]]) -> T:
+        while (fut := self._calls.get(key)) is not None:
+            self._shared += 1
+            try:
+                # shield: si este request se cancela, el líder y los demás siguen
+                return await asyncio.shield(fut)
+            except asyncio.CancelledError:
+                if not fut.cancelled():
+                    raise
+                # Se canceló el líder (su cliente se fue): otro toma la llamada
+
+        fut = asyncio.get_running_loop().create_future()
+        self._calls[key] = fut
+        self._executed += 1
+        try:
+            result = await fn()
+        except asyncio.CancelledError:
+            fut.cancel()
+            raise
+        except BaseException as e:
+            fut.set_exception(e)
+            fut.exception()  # marcada como leída aunque nadie más espere
+            raise
+        else:
+            fut.set_result(result)
+            return result
+        finally:
+            self._calls.pop(key, None)
+
+    def stats(self) -> dict[str, Any]:
+        return {
+            "in_flight": len(self._calls),
+            "executed": self._executed,
+            "shared": self._shared,
+        }
+
+
+read_flight = SingleFlight()
+async_read_flight = AsyncSingleFlight()
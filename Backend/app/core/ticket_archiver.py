@@ -0,0 +1,32 @@
+from __future__ import annotations
+
+import threading
+import time
+import traceback
+
+from app.core.config import settings
+from app.db.session import SessionLocal
+from app.services.ticket_archive_service import archive_finished_tickets
+
+
+def _archive_loop():
+    while True:
+        db = SessionLocal()
+        try:
+            res = archive_finished_tickets(db)
+            if res.tickets:
+                print(f"[ARCHIVER] tickets={res.tickets} batches={res.batches}")
+        except Exception:
+            traceback.print_exc()
+            db.rollback()
+        finally:
+            db.close()
+
+        time.sleep(max(10, settings.ARCHIVE_INTERVAL_SECONDS))
+
+
+def start_ticket_archiver():
+    if not settings.ARCHIVE_ENABLED:
+        return
+    t = threading.Thread(target=_archive_loop, daemon=True)
+    t.start()
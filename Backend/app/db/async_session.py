@@ -0,0 +1,42 @@
+from __future__ import annotations
+
+import asyncio
+import sys
+from collections.abc import AsyncGenerator
+
+from sqlalchemy.engine import make_url
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
+
+from app.core.config import settings
+
+# ==========================================================
+# STACK ASYNC (psycopg 3 async) para los routers de tickets y auth.
+# Vive al lado de app/db/session.py: los hilos de fondo (scheduler, archivador,
+# rollups, listener) y los routers de administración siguen con la Session sync.
+# Los servicios son los mismos: los routers async los llaman con
+# `await db.run_sync(servicio, ...)`, que les pasa una Session sync cuyo I/O corre
+# sobre la conexión async sin bloquear el event loop.
+# ==========================================================
+
+if sys.platform == "win32":
+    # psycopg async no funciona con el ProactorEventLoop (default en Windows)
+    asyncio.set_event_loop_policy(asyncio.WindowsSelectorEventLoopPolicy())
+
+async_engine = create_async_engine(
+    make_url(settings.DATABASE_URL).set(drivername="postgresql+psycopg"),
+    pool_pre_ping=True,
+    pool_size=settings.ASYNC_DB_POOL_SIZE,
+    max_overflow=settings.ASYNC_DB_MAX_OVERFLOW,
+    pool_timeout=settings.ASYNC_DB_POOL_TIMEOUT_SECONDS,
+)
+
+AsyncSessionLocal = async_sessionmaker(
+    bind=async_engine,
+    autoflush=False,
+    expire_on_commit=False,
+)
+
+
+async def get_async_db() -> AsyncGenerator[AsyncSession, None]:
+    async with AsyncSessionLocal() as db:
+        yield db
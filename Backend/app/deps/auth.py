@@ -2,31 +2,66 @@ from __future__ import annotations
 
 from fastapi import Depends, HTTPException, status
 from fastapi.security import OAuth2PasswordBearer
-from sqlalchemy.orm import Session
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
 
-from app.db.session import get_db
+from app.db.async_session import get_async_db
+from app.core.auth_cache import AuthUser, auth_cache
 from app.core.security import decode_token
 from app.models.user import AppUser, UserRole
 
 oauth2_scheme = OAuth2PasswordBearer(tokenUrl="/auth/token")
 
-def get_current_user(token: str = Depends(oauth2_scheme), db: Session = Depends(get_db)) -> AppUser:
+_INVALID_TOKEN = "Token inválido"
+
+
+def _unauthorized(detail: str) -> HTTPException:
+    return HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail=detail, headers={"WWW-Authenticate": "Bearer"})
+
+
+def _username_from_token(token: str) -> str:
+    username = auth_cache.get_token(token)
+    if username is not None:
+        return username
     try:
         payload = decode_token(token)
-        username: str | None = payload.get("sub")
+        username = payload.get("sub")
     except Exception:
-        raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Token inválido", headers={"WWW-Authenticate": "Bearer"})
-
+        raise _unauthorized(_INVALID_TOKEN)
     if not username:
-        raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Token inválido", headers={"WWW-Authenticate": "Bearer"})
+        raise _unauthorized(_INVALID_TOKEN)
+    auth_cache.put_token(token, username, payload.get("exp"))
+    return username
+
+
+async def _load_user(db: AsyncSession, username: str) -> AuthUser | None:
+    user = auth_cache.get_user(username)
+    if user is not None:
+        return user
+    epoch = auth_cache.epoch()
+    result = await db.execute(
+        select(AppUser.id, AppUser.username, AppUser.full_name, AppUser.role, AppUser.is_active)
+        .where(AppUser.username == username)
+    )
+    row = result.first()
+    if row is None:
+        return None
+    user = AuthUser(id=str(row.id), username=row.username, full_name=row.full_name, role=row.role, is_active=row.is_active)
+    auth_cache.put_user(user, epoch)
+    return user
+
 
-    user = db.query(AppUser).filter(AppUser.username == username).first()
+async def get_current_user(token: str = Depends(oauth2_scheme), db: AsyncSession = Depends(get_async_db)) -> AuthUser:
+    # Token y usuario salen de auth_cache; la DB (async) solo se toca en un miss.
+    # Al ser async, los routers sync tampoco gastan un hilo en autenticar.
+    username = _username_from_token(token)
+    user = await _load_user(db, username)
     if not user or not user.is_active:
-        raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Usuario no autorizado", headers={"WWW-Authenticate": "Bearer"})
+        raise _unauthorized("Usuario no autorizado")
     return user
 
 def require_role(*roles: UserRole):
-    def _dep(user: AppUser = Depends(get_current_user)) -> AppUser:
+    async def _dep(user: AuthUser = Depends(get_current_user)) -> AuthUser:
         if user.role not in roles:
             raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="No tienes permisos para esta acción")
         return user
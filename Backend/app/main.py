@@ -9,8 +9,16 @@ from app.routers.auth import router as auth_router
 from app.routers.tickets import router as tickets_router
 from app.routers.dev_seed import router as dev_seed_router
 from app.routers.siesa_sync import router as siesa_sync_router
+from app.routers.metrics import router as metrics_router
+from app.routers.events import router as events_router
+from app.routers.analytics import router as analytics_router
 from app.core.scheduler import start_siesa_sync_loop
 from app.core.siesa_scheduler import start_siesa_scheduler
+from app.core.cache_listener import start_cache_invalidation_listener
+from app.core.ticket_archiver import start_ticket_archiver
+from app.core.partition_maintenance import start_partition_maintenance
+from app.core.kitchen_perf_roller import start_kitchen_perf_roller
+from app.core.password_pool import password_pool
 
 
 app = FastAPI(title="Comandas Zeus - Backend", version="1.0.0")
@@ -21,6 +29,7 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=["ETag", "X-Next-Cursor", "X-Prev-Cursor"],
 )
 
 @app.get("/health")
@@ -31,8 +40,17 @@ app.include_router(auth_router)
 app.include_router(tickets_router)
 app.include_router(dev_seed_router)
 app.include_router(siesa_sync_router)
+app.include_router(metrics_router)
+app.include_router(events_router)
+app.include_router(analytics_router)
 
+# Antes que los hilos de fondo (ver app/core/password_pool.py)
+password_pool.start()
 start_siesa_scheduler()
+start_cache_invalidation_listener()
+start_ticket_archiver()
+start_partition_maintenance()
+start_kitchen_perf_roller()
 
 if settings.ENV == "dev":
     start_siesa_sync_loop()
\ No newline at end of file
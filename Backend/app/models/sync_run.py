@@ -3,7 +3,7 @@ from __future__ import annotations
 import uuid
 from datetime import datetime
 
-from sqlalchemy import Boolean, DateTime, Integer, String, Text, func
+from sqlalchemy import Boolean, DateTime, Index, Integer, String, Text, func, text
 from sqlalchemy.dialects.postgresql import UUID
 from sqlalchemy.orm import Mapped, mapped_column
 
@@ -12,6 +12,12 @@ from app.db.session import Base
 
 class SyncRun(Base):
     __tablename__ = "sync_runs"
+    # Particionada por mes en started_at (sql/010_monthly_partitions.sql); llave única
+    # (id, started_at) en la base, id para el ORM. Resumen diario en sync_run_daily.
+    __table_args__ = (
+        Index("ix_sync_runs_source_started", "source", text("started_at DESC")),
+        {"postgresql_partition_by": "RANGE (started_at)"},
+    )
 
     id: Mapped[uuid.UUID] = mapped_column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
 
@@ -10,6 +10,9 @@ from sqlalchemy import (
     ForeignKey,
     Numeric,
     Integer,
+    BigInteger,
+    Index,
+    text,
 )
 from sqlalchemy.dialects.postgresql import UUID, JSONB
 from sqlalchemy.orm import Mapped, mapped_column, relationship
@@ -26,6 +29,15 @@ class TicketStatus(str, enum.Enum):
     CANCELADO = "CANCELADO"
 
 
+# Lo que el panel considera "activo" (PanelPage.tsx): todo menos CANCELADO.
+ACTIVE_TICKET_STATUSES = (
+    TicketStatus.PENDIENTE,
+    TicketStatus.EN_PREPARACION,
+    TicketStatus.PARCIAL,
+    TicketStatus.LISTO,
+)
+
+
 class ItemStatus(str, enum.Enum):
     PENDIENTE = "PENDIENTE"
     EN_PREPARACION = "EN_PREPARACION"
@@ -43,6 +55,17 @@ class AuditEventType(str, enum.Enum):
 
 class KitchenTicket(Base):
     __tablename__ = "kitchen_tickets"
+    __table_args__ = (
+        Index("ix_kitchen_tickets_version", "version"),
+        Index("ix_kitchen_tickets_hora_pedido_id", text("hora_pedido DESC"), text("id DESC")),
+        Index("ix_kitchen_tickets_status_hora_pedido_id", "status", text("hora_pedido DESC"), text("id DESC")),
+        Index("ix_kitchen_tickets_comanda_number", "comanda_number"),
+        Index("ix_kitchen_tickets_pos_consec_docto", "pos_consec_docto"),
+        Index("ix_kitchen_tickets_mesa_trgm", "mesa_ref", postgresql_using="gin", postgresql_ops={"mesa_ref": "gin_trgm_ops"}),
+        Index("ix_kitchen_tickets_mesero_trgm", "mesero_nombre", postgresql_using="gin", postgresql_ops={"mesero_nombre": "gin_trgm_ops"}),
+        Index("ix_kitchen_tickets_notas_trgm", "notas", postgresql_using="gin", postgresql_ops={"notas": "gin_trgm_ops"}),
+        # ix_kitchen_tickets_mesa_prefix es de expresión: lower(mesa_ref) text_pattern_ops (sql/002)
+    )
 
     id: Mapped[str] = mapped_column(UUID(as_uuid=True), primary_key=True)
 
@@ -77,15 +100,34 @@ class KitchenTicket(Base):
     created_at: Mapped[str] = mapped_column(DateTime(timezone=True), nullable=False, server_default=func.now())
     updated_at: Mapped[str] = mapped_column(DateTime(timezone=True), nullable=False, server_default=func.now())
 
+    # Versión para ETags; se toma de kitchen_board_version_seq en cada cambio (ver sql/001_ticket_versions.sql)
+    version: Mapped[int] = mapped_column(
+        BigInteger,
+        nullable=False,
+        server_default=text("nextval('kitchen_board_version_seq')"),
+    )
+
+    # Items por estado (sql/006_ticket_item_counters.sql). Se actualizan en el mismo
+    # statement que cambia los items: ver app/services/ticket_status_service.py
+    items_pendiente: Mapped[int] = mapped_column(Integer, nullable=False, server_default=text("0"))
+    items_en_preparacion: Mapped[int] = mapped_column(Integer, nullable=False, server_default=text("0"))
+    items_entregado: Mapped[int] = mapped_column(Integer, nullable=False, server_default=text("0"))
+    items_cancelado: Mapped[int] = mapped_column(Integer, nullable=False, server_default=text("0"))
+
+    # Carga explícita: selectinload(KitchenTicket.items) donde se necesiten.
+    # Los listados usan app/services/ticket_read_service.py y no tocan items.
     items: Mapped[list["KitchenTicketItem"]] = relationship(
         back_populates="ticket",
         cascade="all, delete-orphan",
-        lazy="selectin",
+        lazy="select",
     )
 
 
 class KitchenTicketItem(Base):
     __tablename__ = "kitchen_ticket_items"
+    __table_args__ = (
+        Index("ix_kitchen_ticket_items_ticket_id", "ticket_id"),
+    )
 
     id: Mapped[str] = mapped_column(UUID(as_uuid=True), primary_key=True)
     ticket_id: Mapped[str] = mapped_column(UUID(as_uuid=True), ForeignKey("kitchen_tickets.id", ondelete="CASCADE"))
@@ -111,6 +153,13 @@ class KitchenTicketItem(Base):
     change_reason: Mapped[str | None] = mapped_column(Text, nullable=True)
     replaced_by: Mapped[str | None] = mapped_column(Text, nullable=True)
 
+    # Control optimista por item (sql/007_item_versions.sql); misma secuencia que el ticket
+    version: Mapped[int] = mapped_column(
+        BigInteger,
+        nullable=False,
+        server_default=text("nextval('kitchen_board_version_seq')"),
+    )
+
     created_at: Mapped[str] = mapped_column(DateTime(timezone=True), nullable=False, server_default=func.now())
     updated_at: Mapped[str] = mapped_column(DateTime(timezone=True), nullable=False, server_default=func.now())
 
@@ -0,0 +1,70 @@
+from __future__ import annotations
+
+from sqlalchemy import BigInteger, Column, DateTime, SmallInteger, Table, select, union_all
+from sqlalchemy.orm import aliased
+from sqlalchemy.sql import func
+
+from app.models.base import Base
+from app.models.ticket import KitchenTicket, KitchenTicketItem, TicketStatus
+from app.models.ticket_event import TicketEvent
+
+# ==========================================================
+# ARCHIVO (sql/009_ticket_archive.sql)
+# Mismas columnas que las tablas calientes; solo se escriben desde
+# app/services/ticket_archive_service.py.
+# ==========================================================
+
+# Solo estos estados se archivan; el resto siempre está en la tabla caliente.
+ARCHIVED_TICKET_STATUSES = (TicketStatus.LISTO, TicketStatus.CANCELADO)
+
+
+def _archive_table(hot: Table, name: str, *extra: Column) -> Table:
+    columns = [Column(c.name, c.type, primary_key=c.primary_key, nullable=c.nullable) for c in hot.columns]
+    return Table(name, Base.metadata, *columns, *extra)
+
+
+kitchen_tickets_archive = _archive_table(
+    KitchenTicket.__table__,
+    "kitchen_tickets_archive",
+    Column("archived_at", DateTime(timezone=True), nullable=False, server_default=func.now()),
+)
+kitchen_ticket_items_archive = _archive_table(KitchenTicketItem.__table__, "kitchen_ticket_items_archive")
+ticket_events_archive = _archive_table(TicketEvent.__table__, "ticket_events_archive")
+
+ticket_archive_state = Table(
+    "ticket_archive_state",
+    Base.metadata,
+    Column("id", SmallInteger, primary_key=True),
+    Column("version", BigInteger, nullable=False),
+    Column("last_run_at", DateTime(timezone=True)),
+    Column("archived_total", BigInteger, nullable=False),
+)
+
+
+def _hot_and_cold(hot: Table, cold: Table, name: str):
+    # UNION ALL: Postgres empuja filtros/ORDER BY/LIMIT a cada rama (Merge Append sobre
+    # los índices de ambas tablas), igual que si fuera una sola.
+    names = [c.name for c in hot.columns]
+    return union_all(
+        select(*(hot.c[n] for n in names)),
+        select(*(cold.c[n] for n in names)),
+    ).subquery(name)
+
+
+# Entidades "todas" (caliente + archivo) para lecturas de historial: se usan igual que
+# el modelo (TicketAll.status, TicketAll.hora_pedido, ...).
+TicketAll = aliased(
+    KitchenTicket,
+    _hot_and_cold(KitchenTicket.__table__, kitchen_tickets_archive, "kitchen_tickets_all"),
+    adapt_on_names=True,
+)
+TicketItemAll = aliased(
+    KitchenTicketItem,
+    _hot_and_cold(KitchenTicketItem.__table__, kitchen_ticket_items_archive, "kitchen_ticket_items_all"),
+    adapt_on_names=True,
+)
+TicketEventAll = aliased(
+    TicketEvent,
+    _hot_and_cold(TicketEvent.__table__, ticket_events_archive, "ticket_events_all"),
+    adapt_on_names=True,
+)
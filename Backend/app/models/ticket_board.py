@@ -0,0 +1,48 @@
+from __future__ import annotations
+
+from sqlalchemy import BigInteger, DateTime, Enum as SAEnum, ForeignKey, Index, Integer, String, text
+from sqlalchemy.dialects.postgresql import JSONB, UUID
+from sqlalchemy.orm import Mapped, mapped_column
+from sqlalchemy.sql import func
+
+from app.models.base import Base
+from app.models.ticket import TicketStatus
+
+
+class TicketBoard(Base):
+    """
+    Proyección de lectura del tablero (sql/005_ticket_board_projection.sql).
+    No se escribe por ORM: la mantiene ticket_board_service.refresh_ticket_board.
+    """
+    __tablename__ = "ticket_board"
+    __table_args__ = (
+        Index("ix_ticket_board_hora_pedido", "hora_pedido", "ticket_id"),
+        Index("ix_ticket_board_status_hora_pedido", "status", "hora_pedido"),
+        Index("ix_ticket_board_mesa_status", "mesa_ref", "status"),
+    )
+
+    ticket_id: Mapped[str] = mapped_column(
+        UUID(as_uuid=True), ForeignKey("kitchen_tickets.id", ondelete="CASCADE"), primary_key=True
+    )
+
+    comanda_number: Mapped[int | None] = mapped_column(Integer, nullable=True)
+    pos_consec_docto: Mapped[int | None] = mapped_column(Integer, nullable=True)
+    mesa_ref: Mapped[str | None] = mapped_column(String(255), nullable=True)
+    mesero_nombre: Mapped[str | None] = mapped_column(String(255), nullable=True)
+
+    status: Mapped[TicketStatus] = mapped_column(
+        SAEnum(TicketStatus, name="ticket_status", native_enum=True, create_type=False),
+        nullable=False,
+    )
+    hora_pedido: Mapped[str] = mapped_column(DateTime(timezone=True), nullable=False)
+    hora_preparacion: Mapped[str | None] = mapped_column(DateTime(timezone=True), nullable=True)
+    hora_entrega: Mapped[str | None] = mapped_column(DateTime(timezone=True), nullable=True)
+
+    items: Mapped[list] = mapped_column(JSONB, nullable=False, server_default=text("'[]'::jsonb"))
+    items_pendiente: Mapped[int] = mapped_column(Integer, nullable=False, server_default=text("0"))
+    items_en_preparacion: Mapped[int] = mapped_column(Integer, nullable=False, server_default=text("0"))
+    items_entregado: Mapped[int] = mapped_column(Integer, nullable=False, server_default=text("0"))
+    items_cancelado: Mapped[int] = mapped_column(Integer, nullable=False, server_default=text("0"))
+
+    version: Mapped[int] = mapped_column(BigInteger, nullable=False)
+    refreshed_at: Mapped[str] = mapped_column(DateTime(timezone=True), nullable=False, server_default=func.now())
@@ -2,7 +2,7 @@ from __future__ import annotations
 
 from uuid import UUID, uuid4
 
-from sqlalchemy import DateTime, Text
+from sqlalchemy import DateTime, Index, Text, text
 from sqlalchemy.dialects.postgresql import UUID as PG_UUID, JSONB
 from sqlalchemy.orm import Mapped, mapped_column
 from sqlalchemy.sql import func
@@ -12,6 +12,16 @@ from app.models.base import Base
 
 class TicketEvent(Base):
     __tablename__ = "ticket_events"
+    # Particionada por mes en created_at (sql/010_monthly_partitions.sql). En la base la
+    # llave única es (id, created_at); para el ORM la identidad sigue siendo id.
+    __table_args__ = (
+        # sql/008_ticket_event_indexes.sql
+        Index("ix_ticket_events_ticket_created", "ticket_id", "created_at", "id"),
+        Index("ix_ticket_events_created_id", text("created_at DESC"), text("id DESC")),
+        Index("ix_ticket_events_type_created", "event_type", text("created_at DESC"), text("id DESC")),
+        Index("ix_ticket_events_user_created", "user_name", text("created_at DESC"), text("id DESC")),
+        {"postgresql_partition_by": "RANGE (created_at)"},
+    )
 
     id: Mapped[UUID] = mapped_column(PG_UUID(as_uuid=True), primary_key=True, default=uuid4)
 
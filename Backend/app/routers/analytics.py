@@ -0,0 +1,136 @@
+from __future__ import annotations
+
+from datetime import date, datetime, timedelta, timezone
+from typing import Literal, Optional
+from zoneinfo import ZoneInfo
+
+from fastapi import APIRouter, Depends, HTTPException, Query, Request
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+from app.core.fast_json import dumps
+from app.core.http_cache import cached_json_response
+from app.core.read_cache import analytics_cache
+from app.db.session import get_db
+from app.deps.auth import require_role
+from app.models.user import UserRole
+from app.services.kitchen_perf_service import local_today, perf_series, perf_state, perf_summary
+from app.services.prep_time_service import analyze_prep_times, load_frame
+from app.services.ticket_version_service import board_version
+
+# Dashboard de desempeño: summary/series salen de kitchen_perf_hourly / kitchen_perf_daily
+# (app/services/kitchen_perf_service.py); prep-times es el análisis ad-hoc sobre los
+# items del rango (app/services/prep_time_service.py), cacheado por rango y filtros.
+router = APIRouter(
+    prefix="/analytics",
+    tags=["analytics"],
+    dependencies=[Depends(require_role(UserRole.ADMIN))],
+)
+
+Dimension = Literal["all", "product", "mesero", "mesa"]
+
+_MAX_DAYS = 400
+_MAX_HOURLY_DAYS = 31
+
+
+def _range(from_date: Optional[date], to_date: Optional[date], default_days: int) -> tuple[date, date]:
+    to_day = to_date or local_today()
+    from_day = from_date or (to_day - timedelta(days=default_days - 1))
+    if from_day > to_day:
+        raise HTTPException(status_code=400, detail="from_date debe ser anterior o igual a to_date")
+    if (to_day - from_day).days >= _MAX_DAYS:
+        raise HTTPException(status_code=400, detail=f"Rango máximo: {_MAX_DAYS} días")
+    return from_day, to_day
+
+
+@router.get("/summary")
+def analytics_summary(
+    dim: Dimension = Query(default="all"),
+    from_date: Optional[date] = Query(default=None, description="Día local inicial (default: hace 7 días)"),
+    to_date: Optional[date] = Query(default=None, description="Día local final, inclusive (default: hoy)"),
+    limit: int = Query(default=50, ge=1, le=500),
+    db: Session = Depends(get_db),
+):
+    from_day, to_day = _range(from_date, to_date, 7)
+    return {
+        "from_date": from_day,
+        "to_date": to_day,
+        "dim": dim,
+        "rows": perf_summary(db, dim=dim, from_day=from_day, to_day=to_day, limit=limit),
+    }
+
+
+@router.get("/series")
+def analytics_series(
+    grain: Literal["day", "hour", "hour_of_day"] = Query(default="day"),
+    dim: Dimension = Query(default="all"),
+    key: str = Query(default="", description="Producto / mesero / mesa (vacío para dim=all)"),
+    from_date: Optional[date] = Query(default=None),
+    to_date: Optional[date] = Query(default=None),
+    db: Session = Depends(get_db),
+):
+    from_day, to_day = _range(from_date, to_date, 30 if grain == "day" else 1)
+    if grain == "hour" and (to_day - from_day).days >= _MAX_HOURLY_DAYS:
+        raise HTTPException(status_code=400, detail=f"Serie por hora: máximo {_MAX_HOURLY_DAYS} días")
+    return {
+        "from_date": from_day,
+        "to_date": to_day,
+        "grain": grain,
+        "dim": dim,
+        "key": "" if dim == "all" else key,
+        "points": perf_series(
+            db, grain=grain, dim=dim, key="" if dim == "all" else key, from_day=from_day, to_day=to_day
+        ),
+    }
+
+
+def _minute(ts: datetime) -> datetime:
+    if ts.tzinfo is None:
+        ts = ts.replace(tzinfo=ZoneInfo(settings.ANALYTICS_TIMEZONE))
+    return ts.astimezone(timezone.utc).replace(second=0, microsecond=0)
+
+
+@router.get("/prep-times")
+def analytics_prep_times(
+    request: Request,
+    from_ts: Optional[datetime] = Query(default=None, description="Entregados desde (default: hace 7 días)"),
+    to_ts: Optional[datetime] = Query(default=None, description="Entregados hasta, exclusivo (default: ahora)"),
+    product: Optional[str] = Query(default=None),
+    mesero: Optional[str] = Query(default=None),
+    mesa: Optional[str] = Query(default=None),
+    bin_s: int = Query(default=60, ge=10, le=3600, description="Ancho de cubeta de los histogramas"),
+    top: int = Query(default=50, ge=1, le=500),
+    outliers: int = Query(default=50, ge=0, le=500),
+    db: Session = Depends(get_db),
+):
+    # Rango redondeado al minuto: pedidos repetidos del mismo dashboard comparten entrada
+    now = _minute(datetime.now(timezone.utc))
+    end = _minute(to_ts) if to_ts else now + timedelta(minutes=1)
+    start = _minute(from_ts) if from_ts else end - timedelta(days=7)
+    if start >= end:
+        raise HTTPException(status_code=400, detail="from_ts debe ser anterior a to_ts")
+    if end - start > timedelta(days=settings.PREP_TIMES_MAX_DAYS):
+        raise HTTPException(status_code=400, detail=f"Rango máximo: {settings.PREP_TIMES_MAX_DAYS} días")
+
+    filters = {"product": product or None, "mesero": mesero or None, "mesa": mesa or None}
+    key = ("prep_times", start, end, *filters.values(), bin_s, top, outliers)
+    closed = end <= now - timedelta(minutes=settings.ANALYTICS_ROLLUP_GRACE_MINUTES)
+
+    def _build() -> bytes:
+        frame = load_frame(db, from_ts=start, to_ts=end, **filters)
+        result = analyze_prep_times(db, frame, bin_s=bin_s, top=top, outliers=outliers)
+        return dumps({"from_ts": start, "to_ts": end, **filters, **result})
+
+    return cached_json_response(
+        request,
+        cache=analytics_cache,
+        key=key,
+        # Rango cerrado: ya no cambia. Abierto: la versión del tablero sirve de ETag.
+        version=lambda: 0 if closed else board_version(db),
+        build=_build,
+    )
+
+
+@router.get("/status")
+def analytics_status(db: Session = Depends(get_db)):
+    return perf_state(db)
@@ -2,25 +2,51 @@ from __future__ import annotations
 
 from fastapi import APIRouter, Depends, HTTPException, status
 from fastapi.security import OAuth2PasswordRequestForm
-from sqlalchemy.orm import Session
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
 
-from app.db.session import get_db
-from app.core.security import verify_password, create_access_token
+from app.db.async_session import get_async_db
+from app.core.password_pool import PasswordPoolBusy, password_pool
+from app.core.security import create_access_token
 from app.models.user import AppUser
 from app.schemas.auth import LoginRequest, TokenResponse, UserOut
+from app.core.auth_cache import AuthUser, auth_cache
 from app.deps.auth import get_current_user
 
 router = APIRouter(prefix="/auth", tags=["auth"])
 
 
-def _issue_token(db: Session, username: str, password: str) -> TokenResponse:
-    user = db.query(AppUser).filter(AppUser.username == username).first()
-    if not user or not user.is_active:
+async def _check_password(db: AsyncSession, user: AppUser, password: str) -> None:
+    # Un login correcto reciente (mismo usuario, contraseña y hash) no repite bcrypt
+    key = auth_cache.login_key(user.username, password, user.password_hash)
+    if auth_cache.is_verified(key):
+        return
+    try:
+        ok, new_hash = await password_pool.verify_async(password, user.password_hash)
+    except PasswordPoolBusy:
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail="Demasiados inicios de sesión al mismo tiempo, intenta de nuevo",
+            headers={"Retry-After": "1"},
+        )
+    if not ok:
         raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Credenciales inválidas")
+    if new_hash:
+        # El hash tenía parámetros viejos (BCRYPT_ROUNDS cambió): se guarda el nuevo
+        user.password_hash = new_hash
+        await db.commit()
+        key = auth_cache.login_key(user.username, password, new_hash)
+    auth_cache.mark_verified(key)
+
 
-    if not verify_password(password, user.password_hash):
+async def _issue_token(db: AsyncSession, username: str, password: str) -> TokenResponse:
+    result = await db.execute(select(AppUser).where(AppUser.username == username))
+    user = result.scalars().first()
+    if not user or not user.is_active:
         raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Credenciales inválidas")
 
+    await _check_password(db, user, password)
+
     token = create_access_token(subject=user.username, extra_claims={"role": user.role.value})
 
     return TokenResponse(
@@ -37,20 +63,20 @@ def _issue_token(db: Session, username: str, password: str) -> TokenResponse:
 
 # ✅ Login para tu frontend (JSON)
 @router.post("/login", response_model=TokenResponse)
-def login(payload: LoginRequest, db: Session = Depends(get_db)):
-    return _issue_token(db, payload.username, payload.password)
+async def login(payload: LoginRequest, db: AsyncSession = Depends(get_async_db)):
+    return await _issue_token(db, payload.username, payload.password)
 
 
 # ✅ Token OAuth2 para Swagger (form-data)
 @router.post("/token", response_model=TokenResponse)
-def token(form_data: OAuth2PasswordRequestForm = Depends(), db: Session = Depends(get_db)):
-    return _issue_token(db, form_data.username, form_data.password)
+async def token(form_data: OAuth2PasswordRequestForm = Depends(), db: AsyncSession = Depends(get_async_db)):
+    return await _issue_token(db, form_data.username, form_data.password)
 
 
 @router.get("/me", response_model=UserOut)
-def me(user: AppUser = Depends(get_current_user)):
+async def me(user: AuthUser = Depends(get_current_user)):
     return UserOut(
-        id=str(user.id),
+        id=user.id,
         username=user.username,
         full_name=user.full_name,
         role=user.role,
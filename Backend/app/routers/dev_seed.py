@@ -8,8 +8,12 @@ from sqlalchemy.orm import Session
 
 from app.db.session import get_db
 from app.deps.auth import require_role
-from app.models.user import UserRole, AppUser
+from app.core.auth_cache import AuthUser
+from app.models.user import UserRole
 from app.models.ticket import KitchenTicket, KitchenTicketItem, TicketStatus, ItemStatus
+from app.services.cache_invalidation_service import publish_board_change
+from app.services.ticket_board_service import refresh_ticket_board
+from app.services.ticket_status_service import recount_ticket_items
 
 router = APIRouter(prefix="/dev", tags=["dev"])
 
@@ -19,13 +23,14 @@ def _now():
 @router.post("/seed-demo")
 def seed_demo(
     db: Session = Depends(get_db),
-    user: AppUser = Depends(require_role(UserRole.ADMIN)),
+    user: AuthUser = Depends(require_role(UserRole.ADMIN)),
 ):
     # Evita sembrar si ya hay datos
     existing = db.query(KitchenTicket).count()
     if existing > 0:
         raise HTTPException(status_code=400, detail="Ya existen tickets. No se sembró demo.")
 
+    seeded_ids = []
     for idx in range(1, 6):
         t = KitchenTicket(
             id=uuid4(),
@@ -45,6 +50,7 @@ def seed_demo(
         )
         db.add(t)
         db.flush()
+        seeded_ids.append(t.id)
 
         items = [
             ("Hamburguesa", 1, "UND"),
@@ -64,5 +70,8 @@ def seed_demo(
             )
             db.add(it)
 
+    recount_ticket_items(db, seeded_ids)
+    refresh_ticket_board(db, seeded_ids)
+    publish_board_change(db)
     db.commit()
     return {"ok": True, "seeded": 5}
\ No newline at end of file
@@ -0,0 +1,53 @@
+from __future__ import annotations
+
+from datetime import datetime
+from typing import Optional
+from uuid import UUID
+
+from fastapi import APIRouter, Depends, Query, Request
+from sqlalchemy.orm import Session
+
+from app.core.fast_json import maybe_gzip, rows_json
+from app.core.http_cache import json_bytes_response
+from app.core.keyset import decode_cursor
+from app.db.session import get_db
+from app.deps.auth import require_role
+from app.models.user import UserRole
+from app.routers.tickets import TicketEventOut
+from app.services.ticket_read_service import search_event_rows
+
+router = APIRouter(
+    prefix="/events",
+    tags=["events"],
+    dependencies=[Depends(require_role(UserRole.ADMIN))],
+)
+
+_EVENT_FIELDS = tuple(TicketEventOut.model_fields)
+
+
+@router.get("", response_model=list[TicketEventOut])
+def search_events(
+    request: Request,
+    event_type: Optional[list[str]] = Query(default=None, description="Uno o varios tipos (ITEM_STATUS, PRINT, ...)"),
+    user_name: Optional[str] = Query(default=None),
+    ticket_id: Optional[UUID] = Query(default=None),
+    from_ts: Optional[datetime] = Query(default=None, description="Desde (inclusive)"),
+    to_ts: Optional[datetime] = Query(default=None, description="Hasta (exclusivo)"),
+    limit: int = Query(default=100, ge=1, le=500),
+    cursor: Optional[str] = Query(default=None, description="X-Next-Cursor / X-Prev-Cursor de la página anterior"),
+    db: Session = Depends(get_db),
+):
+    rows, headers = search_event_rows(
+        db,
+        event_types=[t.strip().upper() for t in event_type if t.strip()] if event_type else None,
+        user_name=user_name.strip() if user_name and user_name.strip() else None,
+        ticket_id=ticket_id,
+        from_ts=from_ts,
+        to_ts=to_ts,
+        limit=limit,
+        cursor=decode_cursor(cursor) if cursor else None,
+    )
+    body = rows_json(rows, _EVENT_FIELDS)
+    response = json_bytes_response(request, body, gzip_body=maybe_gzip(body))
+    response.headers.update(headers)
+    return response
@@ -0,0 +1,45 @@
+from __future__ import annotations
+
+from fastapi import APIRouter, Depends
+
+from app.core.audit_writer import audit_writer
+from app.core.auth_cache import auth_cache
+from app.core.password_pool import password_pool
+from app.core.print_spooler import print_spooler
+from app.core.read_cache import analytics_cache, print_cache, ticket_read_cache
+from app.core.single_flight import async_read_flight, read_flight
+from app.deps.auth import require_role
+from app.models.user import UserRole
+
+router = APIRouter(
+    prefix="/admin/metrics",
+    tags=["admin"],
+    dependencies=[Depends(require_role(UserRole.ADMIN))],
+)
+
+
+@router.get("/cache")
+def cache_metrics():
+    return {
+        "ticket_read_cache": ticket_read_cache.stats(),
+        "analytics_cache": analytics_cache.stats(),
+        "print_cache": print_cache.stats(),
+        "auth_cache": auth_cache.stats(),
+        "read_single_flight": read_flight.stats(),
+        "async_read_single_flight": async_read_flight.stats(),
+    }
+
+
+@router.get("/audit")
+def audit_metrics():
+    return audit_writer.stats()
+
+
+@router.get("/printers")
+def printer_metrics():
+    return print_spooler.stats()
+
+
+@router.get("/auth")
+def auth_metrics():
+    return {"auth_cache": auth_cache.stats(), "password_pool": password_pool.stats()}
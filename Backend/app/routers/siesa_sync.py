@@ -4,12 +4,13 @@ import traceback
 from datetime import datetime
 from uuid import UUID
 
-from fastapi import APIRouter, Depends, HTTPException, Query
+from fastapi import APIRouter, Depends, HTTPException, Query, Request
 from pydantic import BaseModel, Field
 from sqlalchemy.orm import Session
 
+from app.core.fast_json import dumps, row_dict, rows_json
+from app.core.http_cache import coalesced_json_response
 from app.db.session import get_db
-from app.models.sync_run import SyncRun
 from app.services.siesa_sync_service import (
     run_siesa_sync,
     debug_latest_doctos,
@@ -22,6 +23,7 @@ from app.services.siesa_sync_service import (
     debug_connection_info,
     debug_mesa_from_docto,
 )
+from app.services.ticket_read_service import list_sync_run_rows
 from app.services.sync_run_service import (
     start_sync_run,
     finish_sync_run_success,
@@ -65,6 +67,9 @@ class SyncRunOut(BaseModel):
         from_attributes = True
 
 
+_RUN_FIELDS = tuple(SyncRunOut.model_fields)
+
+
 @router.post("/sync")
 def sync_now(payload: SyncIn, db: Session = Depends(get_db)):
     run = start_sync_run(
@@ -101,32 +106,30 @@ def sync_now(payload: SyncIn, db: Session = Depends(get_db)):
 
 @router.get("/sync/runs", response_model=list[SyncRunOut])
 def list_sync_runs(
+    request: Request,
     source: str = Query(default="SIESA"),
     limit: int = Query(default=50, ge=1, le=200),
     db: Session = Depends(get_db),
 ):
-    rows = (
-        db.query(SyncRun)
-        .filter(SyncRun.source == source)
-        .order_by(SyncRun.started_at.desc())
-        .limit(limit)
-        .all()
-    )
-    return rows
+    def _build() -> bytes:
+        rows = list_sync_run_rows(db, source=source, limit=limit)
+        return rows_json(rows, _RUN_FIELDS)
+
+    return coalesced_json_response(request, ("sync_runs", source, limit), _build)
 
 
 @router.get("/sync/runs/latest", response_model=SyncRunOut | None)
 def latest_sync_run(
+    request: Request,
     source: str = Query(default="SIESA"),
     db: Session = Depends(get_db),
 ):
-    row = (
-        db.query(SyncRun)
-        .filter(SyncRun.source == source)
-        .order_by(SyncRun.started_at.desc())
-        .first()
-    )
-    return row
+    def _build() -> bytes:
+        rows = list_sync_run_rows(db, source=source, limit=1)
+        row = rows[0] if rows else None
+        return dumps(row_dict(row, _RUN_FIELDS) if row else None)
+
+    return coalesced_json_response(request, ("sync_runs_latest", source), _build)
 
 
 @router.get("/sync/debug/connection-info")
@@ -1,24 +1,47 @@
 from __future__ import annotations
 
-from datetime import datetime, timezone
-from typing import Any, Optional
+import asyncio
+from datetime import datetime
+from typing import Any, Callable, Literal, Optional, TypeVar
 from uuid import UUID
 
-from fastapi import APIRouter, Depends, HTTPException, Query
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, Response
 from fastapi.responses import HTMLResponse
-from pydantic import BaseModel, Field
-from sqlalchemy import or_
-from sqlalchemy.orm import Session, selectinload
-
-from app.db.session import get_db
-from app.models.ticket import KitchenTicket, KitchenTicketItem, TicketStatus, ItemStatus
-from app.models.ticket_event import TicketEvent
-
+from pydantic import BaseModel, Field, model_validator
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+from app.core.fast_json import dumps, row_dict, rows_json
+from app.core.http_cache import cached_json_response_async, coalesced_json_response_async
+from app.core.keyset import decode_cursor
+from app.core.print_spooler import print_spooler
+from app.core.read_cache import ticket_read_cache
+from app.db.async_session import get_async_db
+from app.models.ticket import TicketStatus, ItemStatus
+from app.services.audit_service import log_event, log_events
+from app.services.cache_invalidation_service import publish_ticket_change
+from app.services.print_service import PrintBatch, render_print_batch
+from app.services.ticket_batch_service import apply_batch
+from app.services.ticket_board_service import board_json, board_stats, by_mesa_json, refresh_ticket_board
+from app.services.ticket_read_service import get_ticket_row, list_ticket_cards, list_ticket_event_rows
+from app.services.ticket_search_service import search_ranking
+from app.services.ticket_status_service import (
+    LOCK_RETRIES_KEY,
+    ItemTransition,
+    TicketBusyError,
+    apply_item_status,
+    lock_retry_delay,
+    lock_ticket,
+)
+from app.services.ticket_version_service import board_version, ticket_version, touch_item, touch_ticket
+
+# Endpoints async sobre app/db/async_session.py. Los servicios siguen siendo sync y
+# corren con `await db.run_sync(...)`: el I/O va por la conexión async y el event
+# loop atiende otros requests mientras tanto.
 router = APIRouter(prefix="/tickets", tags=["tickets"])
 
-
-def _now() -> datetime:
-    return datetime.now(timezone.utc)
+T = TypeVar("T")
 
 
 class TicketItemOut(BaseModel):
@@ -27,6 +50,7 @@ class TicketItemOut(BaseModel):
     product_name: Optional[str] = None
     unidad: Optional[str] = None
     status: ItemStatus
+    version: Optional[int] = None
 
     class Config:
         from_attributes = True
@@ -42,6 +66,7 @@ class TicketCardOut(BaseModel):
     hora_pedido: datetime
     hora_preparacion: Optional[datetime] = None
     hora_entrega: Optional[datetime] = None
+    version: Optional[int] = None
 
     class Config:
         from_attributes = True
@@ -68,481 +93,412 @@ class TicketEventOut(BaseModel):
         from_attributes = True
 
 
+# Serialización directa de filas (orjson) con los mismos campos que los response_model.
+_CARD_FIELDS = tuple(TicketCardOut.model_fields)
+_DETAIL_FIELDS = tuple(TicketDetailOut.model_fields)
+_ITEM_FIELDS = tuple(TicketItemOut.model_fields)
+_EVENT_FIELDS = tuple(TicketEventOut.model_fields)
+
+
 class UpdateItemStatusIn(BaseModel):
     status: ItemStatus
     user_name: str = Field(default="Operario")
+    expected_version: Optional[int] = Field(default=None, description="Versión del item leída por el cliente; si cambió responde 409")
 
 
 class CancelItemIn(BaseModel):
     reason: str = Field(min_length=2)
     user_name: str = Field(default="Operario")
+    expected_version: Optional[int] = Field(default=None, description="Versión del item leída por el cliente; si cambió responde 409")
 
 
 class ReplaceItemIn(BaseModel):
     new_product_name: str = Field(min_length=2)
     reason: str = Field(min_length=2)
     user_name: str = Field(default="Operario")
+    expected_version: Optional[int] = Field(default=None, description="Versión del item leída por el cliente; si cambió responde 409")
 
 
 class BulkTicketActionIn(BaseModel):
     user_name: str = Field(default="Operario")
+    expected_version: Optional[int] = Field(default=None, description="Versión del ticket leída por el cliente; si cambió responde 409")
 
 
-def _log_event(
-    db: Session,
-    *,
-    ticket_id: UUID,
-    item_id: Optional[UUID],
-    event_type: str,
-    message: str,
-    user_name: Optional[str],
-    meta: Optional[dict[str, Any]] = None,
-):
-    ev = TicketEvent(
-        ticket_id=ticket_id,
-        item_id=item_id,
-        event_type=event_type,
-        message=message,
-        meta=meta,
-        user_name=user_name,
-    )
-    db.add(ev)
-
-
-def _compute_ticket_status(items: list[KitchenTicketItem]) -> TicketStatus:
-    if not items:
-        return TicketStatus.PENDIENTE
-
-    st = [i.status for i in items]
-
-    if all(s == ItemStatus.CANCELADO for s in st):
-        return TicketStatus.CANCELADO
-
-    if all(s in (ItemStatus.ENTREGADO, ItemStatus.CANCELADO) for s in st):
-        return TicketStatus.LISTO
-
-    if any(s == ItemStatus.ENTREGADO for s in st) and any(s in (ItemStatus.PENDIENTE, ItemStatus.EN_PREPARACION) for s in st):
-        return TicketStatus.PARCIAL
-
-    if any(s == ItemStatus.EN_PREPARACION for s in st):
-        return TicketStatus.EN_PREPARACION
-
-    return TicketStatus.PENDIENTE
+class BatchOpIn(BaseModel):
+    op: Literal["status", "cancel", "replace"]
+    ticket_id: UUID
+    item_id: UUID
+    status: Optional[ItemStatus] = None
+    reason: Optional[str] = Field(default=None, min_length=2)
+    new_product_name: Optional[str] = Field(default=None, min_length=2)
+    expected_version: Optional[int] = Field(default=None, description="Versión del item leída por el cliente; si cambió la operación queda 'stale'")
+
+    @model_validator(mode="after")
+    def _required_fields(self):
+        if self.op == "status" and self.status is None:
+            raise ValueError("op=status requiere 'status'")
+        if self.op in ("cancel", "replace") and not self.reason:
+            raise ValueError(f"op={self.op} requiere 'reason'")
+        if self.op == "replace" and not self.new_product_name:
+            raise ValueError("op=replace requiere 'new_product_name'")
+        return self
+
+
+class BatchIn(BaseModel):
+    operations: list[BatchOpIn] = Field(min_length=1, max_length=500)
+    user_name: str = Field(default="Operario")
 
 
-def _set_ticket_times(ticket: KitchenTicket, new_status: TicketStatus):
-    now = _now()
-    if new_status in (TicketStatus.EN_PREPARACION, TicketStatus.PARCIAL) and ticket.hora_preparacion is None:
-        ticket.hora_preparacion = now
-    if new_status == TicketStatus.LISTO and ticket.hora_entrega is None:
-        ticket.hora_entrega = now
+class PrintBatchIn(BaseModel):
+    ticket_ids: list[UUID] = Field(min_length=1, max_length=settings.PRINT_BATCH_MAX)
+    width: int = Field(default=80, ge=58, le=120)
+    printer: Optional[str] = None  # impresora de PRINTERS: ESC/POS directo en vez de HTML
 
 
 @router.get("", response_model=list[TicketCardOut])
-def list_tickets(
+async def list_tickets(
+    request: Request,
     status: Optional[TicketStatus] = Query(default=None),
     q: Optional[str] = Query(default=None, description="Buscar por mesa, mesero, #pedido, #comanda"),
     limit: int = Query(default=200, ge=1, le=1000),
-    db: Session = Depends(get_db),
+    cursor: Optional[str] = Query(default=None, description="X-Next-Cursor / X-Prev-Cursor de la página anterior"),
+    db: AsyncSession = Depends(get_async_db),
 ):
-    qry = db.query(KitchenTicket)
-
-    if status:
-        qry = qry.filter(KitchenTicket.status == status)
-
-    if q:
-        qq = f"%{q.strip()}%"
-        conditions = [
-            KitchenTicket.mesa_ref.ilike(qq),
-            KitchenTicket.mesero_nombre.ilike(qq),
-            KitchenTicket.notas.ilike(qq),
-        ]
-        if q.strip().isdigit():
-            n = int(q.strip())
-            conditions.extend([
-                KitchenTicket.pos_consec_docto == n,
-                KitchenTicket.comanda_number == n,
-            ])
-        qry = qry.filter(or_(*conditions))
-
-    rows = qry.order_by(KitchenTicket.hora_pedido.desc()).limit(limit).all()
-    return rows
+    if cursor and q and search_ranking(q) is not None:
+        raise HTTPException(status_code=400, detail="La búsqueda por texto no admite paginación por cursor")
+    page_cursor = decode_cursor(cursor) if cursor else None
+
+    def _build(s: Session):
+        rows, headers = list_ticket_cards(s, status=status, q=q, limit=limit, cursor=page_cursor)
+        return rows_json(rows, _CARD_FIELDS), headers
+
+    # La versión se lee ANTES que las filas: si algo cambia en medio, el ETag queda
+    # "viejo" y el siguiente poll trae datos nuevos (nunca al revés).
+    return await cached_json_response_async(
+        request,
+        cache=ticket_read_cache,
+        key=("list", status.value if status else None, q, limit, cursor),
+        version=lambda: db.run_sync(board_version),
+        build=lambda: db.run_sync(_build),
+    )
 
 
-@router.get("/{ticket_id}", response_model=TicketDetailOut)
-def get_ticket_detail(ticket_id: UUID, db: Session = Depends(get_db)):
-    ticket = (
-        db.query(KitchenTicket)
-        .options(selectinload(KitchenTicket.items))
-        .filter(KitchenTicket.id == ticket_id)
-        .first()
+@router.get("/board")
+async def get_board(request: Request, db: AsyncSession = Depends(get_async_db)):
+    """
+    Tickets activos + items en una sola respuesta compacta:
+    {ticket_status, item_status, ticket_fields, item_fields, tickets: [[...], ...]}
+    donde `status` es el índice dentro de ticket_status / item_status.
+    """
+    return await cached_json_response_async(
+        request,
+        cache=ticket_read_cache,
+        key=("board",),
+        version=lambda: db.run_sync(board_version),
+        build=lambda: db.run_sync(board_json),
     )
-    if not ticket:
-        raise HTTPException(status_code=404, detail="Ticket no encontrado")
-    return ticket
 
 
-@router.patch("/{ticket_id}/items/{item_id}/status")
-def update_item_status(ticket_id: UUID, item_id: UUID, payload: UpdateItemStatusIn, db: Session = Depends(get_db)):
-    ticket = (
-        db.query(KitchenTicket)
-        .options(selectinload(KitchenTicket.items))
-        .filter(KitchenTicket.id == ticket_id)
-        .first()
+@router.get("/by-mesa")
+async def get_board_by_mesa(
+    request: Request,
+    mesa: Optional[str] = Query(default=None, description="Solo esta mesa (mesa_ref exacto)"),
+    db: AsyncSession = Depends(get_async_db),
+):
+    """
+    Despacho por mesa: {ticket_fields, mesas: [{mesa_ref, open_tickets, tickets_<estado>,
+    items_pendiente, items_en_preparacion, items_entregado, oldest_hora_pedido,
+    oldest_mesero_nombre, tickets: [[...], ...]}, ...]}, del más viejo al más nuevo.
+    """
+    return await cached_json_response_async(
+        request,
+        cache=ticket_read_cache,
+        key=("by-mesa", mesa),
+        version=lambda: db.run_sync(board_version),
+        build=lambda: db.run_sync(by_mesa_json, mesa),
     )
-    if not ticket:
-        raise HTTPException(status_code=404, detail="Ticket no encontrado")
 
-    item = next((x for x in ticket.items if x.id == item_id), None)
-    if not item:
-        raise HTTPException(status_code=404, detail="Item no encontrado")
 
-    old_item_status = item.status
-    if old_item_status == payload.status:
-        return {"ok": True}
+@router.get("/stats")
+async def get_board_stats(request: Request, db: AsyncSession = Depends(get_async_db)):
+    """
+    Barra superior del panel: tickets del tablero por estado y antigüedad del pedido
+    pendiente más viejo. Un GROUP BY por estado sobre ticket_board.
+    """
+    # La edad cambia cada segundo: sin ETag, solo se comparte entre polls simultáneos
+    return await coalesced_json_response_async(request, ("stats",), lambda: db.run_sync(lambda s: dumps(board_stats(s))))
 
-    now = _now()
 
-    if payload.status == ItemStatus.EN_PREPARACION and item.prep_started_at is None:
-        item.prep_started_at = now
-    if payload.status == ItemStatus.ENTREGADO and item.delivered_at is None:
-        item.delivered_at = now
-    if payload.status == ItemStatus.CANCELADO and item.canceled_at is None:
-        item.canceled_at = now
+@router.get("/{ticket_id}", response_model=TicketDetailOut)
+async def get_ticket_detail(ticket_id: UUID, request: Request, db: AsyncSession = Depends(get_async_db)):
+    async def _version() -> int:
+        version = await db.run_sync(ticket_version, ticket_id)
+        if version is None:
+            raise HTTPException(status_code=404, detail="Ticket no encontrado")
+        return version
+
+    def _build(s: Session) -> bytes:
+        ticket = get_ticket_row(s, ticket_id, with_items=True)
+        if not ticket:
+            raise HTTPException(status_code=404, detail="Ticket no encontrado")
+        return dumps(row_dict(ticket, _DETAIL_FIELDS, item_fields=_ITEM_FIELDS))
+
+    return await cached_json_response_async(
+        request,
+        cache=ticket_read_cache,
+        key=("detail", str(ticket_id)),
+        version=_version,
+        build=lambda: db.run_sync(_build),
+    )
 
-    item.status = payload.status
 
-    _log_event(
-        db,
-        ticket_id=ticket.id,
-        item_id=item.id,
-        event_type="ITEM_STATUS",
-        message=f"Item estado: {old_item_status.value} → {payload.status.value} ({item.product_name})",
-        user_name=payload.user_name,
-        meta={"from": old_item_status.value, "to": payload.status.value, "item_id": str(item.id)},
+def _busy() -> HTTPException:
+    return HTTPException(
+        status_code=409,
+        detail="Ticket ocupado por otra operación, intente de nuevo",
+        headers={"Retry-After": "1"},
     )
 
-    new_ticket_status = _compute_ticket_status(ticket.items)
-    if ticket.status != new_ticket_status:
-        old_ticket = ticket.status
-        ticket.status = new_ticket_status
-        _set_ticket_times(ticket, new_ticket_status)
-
-        _log_event(
-            db,
-            ticket_id=ticket.id,
-            item_id=None,
-            event_type="TICKET_STATUS",
-            message=f"Ticket estado: {old_ticket.value} → {new_ticket_status.value}",
-            user_name=payload.user_name,
-            meta={"from": old_ticket.value, "to": new_ticket_status.value},
-        )
 
+async def _locked(db: AsyncSession, fn: Callable[[Session], T]) -> T:
+    """
+    Corre una mutación completa (`fn` recibe la Session sync y hace commit) con los
+    reintentos por lock del lado async: run_with_lock_retry no reintenta
+    (LOCK_RETRIES_KEY = 0, su backoff es time.sleep) y aquí se repite la operación
+    después de un asyncio.sleep, sin frenar al resto del event loop.
+    """
+    db.info[LOCK_RETRIES_KEY] = 0
+    attempts = max(1, settings.LOCK_RETRIES + 1)
+    for attempt in range(attempts):
+        try:
+            return await db.run_sync(fn)
+        except TicketBusyError:
+            await db.rollback()
+            if attempt == attempts - 1:
+                raise _busy()
+            await asyncio.sleep(lock_retry_delay(attempt))
+
+
+def _transition_response(db: Session, ticket_id: UUID, res: ItemTransition, *, item_required: bool) -> ItemTransition:
+    if not res.ticket_found:
+        raise HTTPException(status_code=404, detail="Ticket no encontrado")
+    if item_required and not res.matched_items:
+        raise HTTPException(status_code=404, detail="Item no encontrado")
+    if res.stale_items:
+        db.rollback()
+        raise HTTPException(status_code=409, detail="El ticket cambió en otro dispositivo, recargue")
+    if res.changed_items:
+        refresh_ticket_board(db, [ticket_id])
+        publish_ticket_change(db, ticket_id, res.changed_statuses)
     db.commit()
-    return {"ok": True}
+    return res
 
 
-@router.post("/{ticket_id}/prepare-all")
-def prepare_all_items(ticket_id: UUID, payload: BulkTicketActionIn, db: Session = Depends(get_db)):
-    ticket = (
-        db.query(KitchenTicket)
-        .options(selectinload(KitchenTicket.items))
-        .filter(KitchenTicket.id == ticket_id)
-        .first()
-    )
-    if not ticket:
-        raise HTTPException(status_code=404, detail="Ticket no encontrado")
+async def _transition(db: AsyncSession, ticket_id: UUID, *, item_required: bool, **kwargs) -> ItemTransition:
+    def _run(s: Session) -> ItemTransition:
+        res = apply_item_status(s, ticket_id=ticket_id, **kwargs)
+        return _transition_response(s, ticket_id, res, item_required=item_required)
 
-    now = _now()
-    changed = 0
-
-    for item in ticket.items:
-        if item.status in (ItemStatus.PENDIENTE,):
-            old_status = item.status
-            item.status = ItemStatus.EN_PREPARACION
-            if item.prep_started_at is None:
-                item.prep_started_at = now
-            changed += 1
-
-            _log_event(
-                db,
-                ticket_id=ticket.id,
-                item_id=item.id,
-                event_type="ITEM_STATUS",
-                message=f"Item estado: {old_status.value} → EN_PREPARACION ({item.product_name})",
-                user_name=payload.user_name,
-                meta={"from": old_status.value, "to": "EN_PREPARACION", "item_id": str(item.id)},
-            )
-
-    old_ticket = ticket.status
-    ticket.status = _compute_ticket_status(ticket.items)
-    _set_ticket_times(ticket, ticket.status)
-
-    if old_ticket != ticket.status:
-        _log_event(
-            db,
-            ticket_id=ticket.id,
-            item_id=None,
-            event_type="TICKET_STATUS",
-            message=f"Ticket estado: {old_ticket.value} → {ticket.status.value}",
-            user_name=payload.user_name,
-            meta={"from": old_ticket.value, "to": ticket.status.value},
-        )
+    return await _locked(db, _run)
 
-    _log_event(
+
+@router.patch("/{ticket_id}/items/{item_id}/status")
+async def update_item_status(ticket_id: UUID, item_id: UUID, payload: UpdateItemStatusIn, db: AsyncSession = Depends(get_async_db)):
+    await _transition(
         db,
-        ticket_id=ticket.id,
-        item_id=None,
-        event_type="TICKET_PREPARE_ALL",
-        message=f"Preparación masiva aplicada a {changed} item(s)",
+        ticket_id,
+        item_required=True,
+        item_id=item_id,
+        status=payload.status,
         user_name=payload.user_name,
-        meta={"changed_items": changed},
+        expected_version=payload.expected_version,
     )
-
-    db.commit()
-    return {"ok": True, "changed_items": changed}
+    return {"ok": True}
 
 
-@router.post("/{ticket_id}/deliver-all")
-def deliver_all_items(ticket_id: UUID, payload: BulkTicketActionIn, db: Session = Depends(get_db)):
-    ticket = (
-        db.query(KitchenTicket)
-        .options(selectinload(KitchenTicket.items))
-        .filter(KitchenTicket.id == ticket_id)
-        .first()
+@router.post("/{ticket_id}/prepare-all")
+async def prepare_all_items(ticket_id: UUID, payload: BulkTicketActionIn, db: AsyncSession = Depends(get_async_db)):
+    res = await _transition(
+        db,
+        ticket_id,
+        item_required=False,
+        status=ItemStatus.EN_PREPARACION,
+        from_statuses=(ItemStatus.PENDIENTE,),
+        user_name=payload.user_name,
+        bulk_event=("TICKET_PREPARE_ALL", "Preparación masiva aplicada a %s item(s)"),
+        expected_ticket_version=payload.expected_version,
     )
-    if not ticket:
-        raise HTTPException(status_code=404, detail="Ticket no encontrado")
+    return {"ok": True, "changed_items": res.changed_items}
 
-    now = _now()
-    changed = 0
-
-    for item in ticket.items:
-        if item.status not in (ItemStatus.ENTREGADO, ItemStatus.CANCELADO):
-            old_status = item.status
-            item.status = ItemStatus.ENTREGADO
-            if item.delivered_at is None:
-                item.delivered_at = now
-            if item.prep_started_at is None:
-                item.prep_started_at = now
-            changed += 1
-
-            _log_event(
-                db,
-                ticket_id=ticket.id,
-                item_id=item.id,
-                event_type="ITEM_STATUS",
-                message=f"Item estado: {old_status.value} → ENTREGADO ({item.product_name})",
-                user_name=payload.user_name,
-                meta={"from": old_status.value, "to": "ENTREGADO", "item_id": str(item.id)},
-            )
-
-    old_ticket = ticket.status
-    ticket.status = _compute_ticket_status(ticket.items)
-    _set_ticket_times(ticket, ticket.status)
-
-    if old_ticket != ticket.status:
-        _log_event(
-            db,
-            ticket_id=ticket.id,
-            item_id=None,
-            event_type="TICKET_STATUS",
-            message=f"Ticket estado: {old_ticket.value} → {ticket.status.value}",
-            user_name=payload.user_name,
-            meta={"from": old_ticket.value, "to": ticket.status.value},
-        )
 
-    _log_event(
+@router.post("/{ticket_id}/deliver-all")
+async def deliver_all_items(ticket_id: UUID, payload: BulkTicketActionIn, db: AsyncSession = Depends(get_async_db)):
+    res = await _transition(
         db,
-        ticket_id=ticket.id,
-        item_id=None,
-        event_type="TICKET_DELIVER_ALL",
-        message=f"Entrega completa aplicada a {changed} item(s)",
+        ticket_id,
+        item_required=False,
+        status=ItemStatus.ENTREGADO,
+        from_statuses=(ItemStatus.PENDIENTE, ItemStatus.EN_PREPARACION),
         user_name=payload.user_name,
-        meta={"changed_items": changed},
+        bulk_event=("TICKET_DELIVER_ALL", "Entrega completa aplicada a %s item(s)"),
+        expected_ticket_version=payload.expected_version,
     )
-
-    db.commit()
-    return {"ok": True, "changed_items": changed}
+    return {"ok": True, "changed_items": res.changed_items}
 
 
 @router.post("/{ticket_id}/items/{item_id}/cancel")
-def cancel_item(ticket_id: UUID, item_id: UUID, payload: CancelItemIn, db: Session = Depends(get_db)):
-    ticket = (
-        db.query(KitchenTicket)
-        .options(selectinload(KitchenTicket.items))
-        .filter(KitchenTicket.id == ticket_id)
-        .first()
-    )
-    if not ticket:
-        raise HTTPException(status_code=404, detail="Ticket no encontrado")
-
-    item = next((x for x in ticket.items if x.id == item_id), None)
-    if not item:
-        raise HTTPException(status_code=404, detail="Item no encontrado")
-
-    now = _now()
-    item.status = ItemStatus.CANCELADO
-    item.canceled_at = item.canceled_at or now
-    item.change_reason = payload.reason
-
-    _log_event(
+async def cancel_item(ticket_id: UUID, item_id: UUID, payload: CancelItemIn, db: AsyncSession = Depends(get_async_db)):
+    await _transition(
         db,
-        ticket_id=ticket.id,
-        item_id=item.id,
-        event_type="ITEM_CANCEL",
-        message=f"Item cancelado ({item.product_name}). Motivo: {payload.reason}",
+        ticket_id,
+        item_required=True,
+        item_id=item_id,
+        status=ItemStatus.CANCELADO,
+        reason=payload.reason,
         user_name=payload.user_name,
-        meta={"reason": payload.reason, "item_id": str(item.id)},
+        event_type="ITEM_CANCEL",
+        expected_version=payload.expected_version,
     )
+    return {"ok": True}
 
-    new_ticket_status = _compute_ticket_status(ticket.items)
-    if ticket.status != new_ticket_status:
-        old_ticket = ticket.status
-        ticket.status = new_ticket_status
-        _set_ticket_times(ticket, new_ticket_status)
 
-        _log_event(
-            db,
+@router.post("/{ticket_id}/items/{item_id}/replace")
+async def replace_item(ticket_id: UUID, item_id: UUID, payload: ReplaceItemIn, db: AsyncSession = Depends(get_async_db)):
+    def _run(s: Session) -> None:
+        ticket = lock_ticket(s, ticket_id)
+        if not ticket:
+            raise HTTPException(status_code=404, detail="Ticket no encontrado")
+
+        item = next((x for x in ticket.items if x.id == item_id), None)
+        if not item:
+            raise HTTPException(status_code=404, detail="Item no encontrado")
+        if payload.expected_version is not None and item.version != payload.expected_version:
+            raise HTTPException(status_code=409, detail="El ticket cambió en otro dispositivo, recargue")
+
+        old_name = item.product_name
+        item.replaced_by = payload.new_product_name
+        item.change_reason = payload.reason
+        touch_item(item)
+        touch_ticket(ticket)
+
+        log_event(
+            s,
             ticket_id=ticket.id,
-            item_id=None,
-            event_type="TICKET_STATUS",
-            message=f"Ticket estado: {old_ticket.value} → {new_ticket_status.value}",
+            item_id=item.id,
+            event_type="ITEM_REPLACE",
+            message=f"Item cambiado: {old_name} → {payload.new_product_name}. Motivo: {payload.reason}",
             user_name=payload.user_name,
-            meta={"from": old_ticket.value, "to": new_ticket_status.value},
+            meta={"from": old_name, "to": payload.new_product_name, "reason": payload.reason, "item_id": str(item.id)},
         )
 
-    db.commit()
+        refresh_ticket_board(s, [ticket.id])
+
+        publish_ticket_change(s, ticket.id)
+        s.commit()
+
+    await _locked(db, _run)
     return {"ok": True}
 
 
-@router.post("/{ticket_id}/items/{item_id}/replace")
-def replace_item(ticket_id: UUID, item_id: UUID, payload: ReplaceItemIn, db: Session = Depends(get_db)):
-    ticket = (
-        db.query(KitchenTicket)
-        .options(selectinload(KitchenTicket.items))
-        .filter(KitchenTicket.id == ticket_id)
-        .first()
+@router.post("/batch")
+async def apply_ticket_batch(payload: BatchIn, db: AsyncSession = Depends(get_async_db)):
+    """
+    Varias operaciones (bump bar) en una sola transacción. Cada operación responde
+    ok / noop / not_found / stale; las que fallan no anulan al resto. Si algún ticket
+    está bloqueado por otra transacción no se aplica nada (409).
+    """
+
+    def _run(s: Session):
+        res = apply_batch(s, payload.operations, user_name=payload.user_name)
+        s.commit()
+        return res
+
+    res = await _locked(db, _run)
+    return {
+        "ok": True,
+        "changed_tickets": res.changed_tickets,
+        "changed_items": res.changed_items,
+        "results": res.results,
+    }
+
+
+def _log_prints(db: Session, batch: PrintBatch, width: int, printer: Optional[str] = None) -> None:
+    # PRINT pasa al buffer asíncrono de auditoría (AUDIT_ASYNC_EVENT_TYPES) después del
+    # commit; la transacción solo lee su now() para created_at.
+    where = f" en {printer}" if printer else ""
+    log_events(
+        db,
+        (
+            {
+                "ticket_id": tid,
+                "event_type": "PRINT",
+                "message": f"Impresión comanda ({width}mm){where}",
+                "meta": {"ticket_id": str(tid), "width": width, "printer": printer},
+            }
+            for tid, _ in batch.printed
+        ),
     )
-    if not ticket:
-        raise HTTPException(status_code=404, detail="Ticket no encontrado")
+    db.commit()
 
-    item = next((x for x in ticket.items if x.id == item_id), None)
-    if not item:
-        raise HTTPException(status_code=404, detail="Item no encontrado")
 
-    old_name = item.product_name
-    item.replaced_by = payload.new_product_name
-    item.change_reason = payload.reason
+async def _print(db: AsyncSession, ticket_ids: list[UUID], *, width: int, printer: Optional[str], not_found: str) -> Response:
+    """
+    Sin `printer`: documento HTML para imprimir desde el navegador. Con `printer`:
+    ESC/POS a la cola de esa impresora (app/core/print_spooler.py), responde 202.
+    """
+    if printer is not None and printer not in print_spooler.printers():
+        raise HTTPException(status_code=404, detail=f"Impresora no configurada: {printer}")
 
-    _log_event(
-        db,
-        ticket_id=ticket.id,
-        item_id=item.id,
-        event_type="ITEM_REPLACE",
-        message=f"Item cambiado: {old_name} → {payload.new_product_name}. Motivo: {payload.reason}",
-        user_name=payload.user_name,
-        meta={"from": old_name, "to": payload.new_product_name, "reason": payload.reason, "item_id": str(item.id)},
-    )
+    batch = await db.run_sync(render_print_batch, ticket_ids, width=width, fmt="escpos" if printer else "html")
+    if not batch.printed:
+        raise HTTPException(status_code=404, detail=not_found)
+    headers = {"X-Missing-Tickets": ",".join(str(t) for t in batch.missing)} if batch.missing else None
+
+    if printer is None:
+        await db.run_sync(_log_prints, batch, width)
+        return HTMLResponse(content=batch.content, headers=headers)
+
+    job = print_spooler.submit(printer, batch.content, [tid for tid, _ in batch.printed])
+    if job is None:
+        raise HTTPException(status_code=503, detail="Cola de impresión llena, intente de nuevo", headers={"Retry-After": "2"})
+    await db.run_sync(_log_prints, batch, width, printer)
+    body = {
+        "ok": True,
+        "job_id": job.id,
+        "printer": printer,
+        "tickets": len(batch.printed),
+        "queue_depth": print_spooler.queue_depth(printer),
+    }
+    return Response(content=dumps(body), status_code=202, media_type="application/json", headers=headers)
 
-    db.commit()
-    return {"ok": True}
+
+@router.post("/print-batch", response_class=HTMLResponse)
+async def print_tickets_batch(payload: PrintBatchIn, db: AsyncSession = Depends(get_async_db)):
+    """Varias comandas en un solo documento (una por página) o un solo trabajo de impresora, en el orden pedido."""
+    return await _print(db, payload.ticket_ids, width=payload.width, printer=payload.printer, not_found="Tickets no encontrados")
 
 
 @router.post("/{ticket_id}/print", response_class=HTMLResponse)
-def print_ticket(
+async def print_ticket(
     ticket_id: UUID,
     width: int = Query(default=80, ge=58, le=120),
-    db: Session = Depends(get_db),
+    printer: Optional[str] = Query(default=None, description="Impresora de PRINTERS: imprime directo en ESC/POS"),
+    db: AsyncSession = Depends(get_async_db),
 ):
-    ticket = (
-        db.query(KitchenTicket)
-        .options(selectinload(KitchenTicket.items))
-        .filter(KitchenTicket.id == ticket_id)
-        .first()
-    )
-    if not ticket:
-        raise HTTPException(status_code=404, detail="Ticket no encontrado")
-
-    try:
-        _log_event(
-            db,
-            ticket_id=ticket.id,
-            item_id=None,
-            event_type="PRINT",
-            message=f"Impresión comanda ({width}mm)",
-            user_name=None,
-            meta={"ticket_id": str(ticket.id), "width": width},
-        )
-        db.commit()
-    except Exception:
-        db.rollback()
-
-    items_html = ""
-    for it in ticket.items:
-        name = (it.product_name or "").strip()
-        items_html += f"""
-          <tr>
-            <td style="width:18%; text-align:right; padding:2px 0;"><strong>{float(it.qty):g}</strong></td>
-            <td style="width:82%; padding:2px 0 2px 8px;">{name}</td>
-          </tr>
-        """
-
-    html = f"""
-<!doctype html>
-<html>
-<head>
-  <meta charset="utf-8"/>
-  <title>Comanda #{ticket.comanda_number}</title>
-  <style>
-    @page {{
-      size: {width}mm auto;
-      margin: 4mm;
-    }}
-    body {{
-      font-family: Arial, sans-serif;
-      font-size: 12px;
-      color: #111;
-    }}
-    h1 {{
-      font-size: 16px;
-      margin: 0 0 6px 0;
-      text-align:center;
-    }}
-    .muted {{ color:#555; font-size: 11px; }}
-    .row {{ display:flex; justify-content:space-between; gap:8px; }}
-    hr {{ border:0; border-top:1px dashed #666; margin:8px 0; }}
-    table {{ width:100%; border-collapse:collapse; }}
-  </style>
-</head>
-<body>
-  <h1>COMANDA #{ticket.comanda_number or ""}</h1>
-  <div class="row"><div><strong>Mesa:</strong> {ticket.mesa_ref or ""}</div><div><strong>Pedido:</strong> {ticket.pos_consec_docto or ""}</div></div>
-  <div class="row muted"><div><strong>Mesero:</strong> {ticket.mesero_nombre or ""}</div><div>{ticket.hora_pedido.astimezone().strftime("%Y-%m-%d %H:%M")}</div></div>
-  <hr/>
-  <table>
-    {items_html}
-  </table>
-  <hr/>
-  <div class="muted">Estado: <strong>{ticket.status.value}</strong></div>
-  <script>
-    window.onload = function() {{
-      window.print();
-      setTimeout(()=>window.close(), 350);
-    }}
-  </script>
-</body>
-</html>
-"""
-    return HTMLResponse(content=html)
+    return await _print(db, [ticket_id], width=width, printer=printer, not_found="Ticket no encontrado")
 
 
 @router.get("/{ticket_id}/events", response_model=list[TicketEventOut])
-def get_ticket_events(ticket_id: UUID, db: Session = Depends(get_db)):
-    rows = (
-        db.query(TicketEvent)
-        .filter(TicketEvent.ticket_id == str(ticket_id))
-        .order_by(TicketEvent.created_at.asc())
-        .all()
-    )
-    return rows
\ No newline at end of file
+async def get_ticket_events(
+    ticket_id: UUID,
+    request: Request,
+    since_ts: Optional[datetime] = Query(default=None, description="Solo eventos desde este instante (inclusive)"),
+    since_id: Optional[UUID] = Query(default=None, description="Solo eventos posteriores a este evento"),
+    db: AsyncSession = Depends(get_async_db),
+):
+    def _build(s: Session) -> bytes:
+        rows = list_ticket_event_rows(s, ticket_id, since_ts=since_ts, since_id=since_id)
+        return rows_json(rows, _EVENT_FIELDS)
+
+    key = ("events", str(ticket_id), since_ts.isoformat() if since_ts else None, str(since_id) if since_id else None)
+    return await coalesced_json_response_async(request, key, lambda: db.run_sync(_build))
@@ -1,6 +1,32 @@
+from __future__ import annotations
+
+import time
+from typing import Any, Iterable, Optional
+from uuid import uuid4
+
+from sqlalchemy import event, insert, text
 from sqlalchemy.orm import Session
+
+from app.core.audit_writer import audit_writer
+from app.core.config import settings
 from app.models.ticket_event import TicketEvent
 
+# ==========================================================
+# AUDITORÍA (ticket_events)
+# - Por defecto el evento se junta en session.info y se escribe en un solo INSERT
+#   multi-fila justo antes del commit: misma transacción que el cambio auditado.
+# - Los tipos de AUDIT_ASYNC_EVENT_TYPES (PRINT) también esperan en session.info y pasan
+#   al buffer de app/core/audit_writer.py después del commit (un rollback los descarta),
+#   así no alargan la transacción. Si el buffer está lleno se escriben ahí mismo.
+# - created_at es el now() de la transacción en todos: el INSERT lo toma del default y
+#   los asíncronos lo leen antes del commit, igual que los eventos de los CTE.
+# ==========================================================
+
+_PENDING_KEY = "audit_events"
+_ASYNC_PENDING_KEY = "audit_events_async"
+_ASYNC_TYPES = settings.audit_async_types()
+
+
 def log_event(
     db: Session,
     *,
@@ -10,14 +36,61 @@ def log_event(
     message: str,
     user_name: str | None = None,
     meta: dict | None = None,
-):
-    ev = TicketEvent(
-        ticket_id=ticket_id,
-        item_id=item_id,
-        event_type=event_type,
-        message=message,
-        user_name=user_name,
-        meta=meta,
-    )
-    db.add(ev)
-    return ev
\ No newline at end of file
+) -> None:
+    row = {
+        "id": uuid4(),
+        "ticket_id": ticket_id,
+        "item_id": item_id,
+        "event_type": event_type,
+        "message": message,
+        "meta": meta,
+        "user_name": user_name,
+    }
+    key = _ASYNC_PENDING_KEY if event_type in _ASYNC_TYPES else _PENDING_KEY
+    db.info.setdefault(key, []).append(row)
+
+
+def log_events(db: Session, rows: Iterable[dict[str, Any]]) -> None:
+    """Varios eventos {ticket_id, item_id, event_type, message, meta, user_name} de una vez."""
+    for row in rows:
+        log_event(db, **row)
+
+
+def flush_events(db: Session) -> int:
+    """Escribe ya los eventos pendientes de la sesión (sin commit). Devuelve cuántos."""
+    rows: Optional[list[dict[str, Any]]] = db.info.pop(_PENDING_KEY, None)
+    if not rows:
+        return 0
+    t0 = time.perf_counter()
+    # insertmanyvalues: un INSERT ... VALUES (...), (...) por lote
+    db.execute(insert(TicketEvent), rows)
+    audit_writer.note_tx_flush(len(rows), (time.perf_counter() - t0) * 1000)
+    return len(rows)
+
+
+@event.listens_for(Session, "before_commit")
+def _flush_before_commit(session: Session) -> None:
+    flush_events(session)
+    rows = session.info.get(_ASYNC_PENDING_KEY)
+    if rows:
+        created_at = session.execute(text("SELECT now()")).scalar_one()
+        for row in rows:
+            row["created_at"] = created_at
+
+
+@event.listens_for(Session, "after_commit")
+def _enqueue_after_commit(session: Session) -> None:
+    rows = session.info.pop(_ASYNC_PENDING_KEY, None)
+    if rows:
+        rejected = [row for row in rows if not audit_writer.enqueue(row)]
+        if rejected:
+            audit_writer.write_now(rejected)
+
+
+@event.listens_for(Session, "after_transaction_end")
+def _discard_on_end(session: Session, transaction) -> None:
+    # Solo la transacción raíz: un SAVEPOINT revertido (reintento de lock) no descarta
+    # lo ya registrado en el request. Tras un commit la lista ya fue vaciada.
+    if transaction.parent is None:
+        session.info.pop(_PENDING_KEY, None)
+        session.info.pop(_ASYNC_PENDING_KEY, None)
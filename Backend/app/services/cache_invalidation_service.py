@@ -0,0 +1,64 @@
+from __future__ import annotations
+
+import json
+from typing import Any, Iterable
+from uuid import UUID
+
+from sqlalchemy import event, text
+from sqlalchemy.orm import Session
+
+from app.core.read_cache import ticket_read_cache
+
+CHANNEL = "ticket_cache"
+_PENDING_KEY = "ticket_cache_invalidations"
+
+
+def publish_ticket_change(db: Session, ticket_id: UUID, statuses: Iterable[Any] = ()) -> None:
+    """
+    Invalida el detalle del ticket, el tablero y todas las listas: las tarjetas traen
+    `version`, que cambia con cualquier cambio del ticket aunque no cambie su estado.
+    `statuses` (estados anterior/nuevo) va en el aviso como referencia.
+    """
+    values = sorted({getattr(s, "value", s) for s in statuses if s is not None})
+    _publish(db, {"t": str(ticket_id), "s": values})
+
+
+def publish_board_change(db: Session) -> None:
+    """Cambio masivo (sync): invalida todo."""
+    _publish(db, {"all": True})
+
+
+def _publish(db: Session, payload: dict) -> None:
+    # pg_notify es transaccional: los otros workers solo lo reciben si hay commit.
+    db.execute(text("SELECT pg_notify(:channel, :payload)"), {"channel": CHANNEL, "payload": json.dumps(payload)})
+    db.info.setdefault(_PENDING_KEY, []).append(payload)
+
+
+def apply_invalidation(payload: dict) -> None:
+    if payload.get("all"):
+        ticket_read_cache.clear()
+        return
+
+    ticket_id = payload.get("t")
+
+    def _match(key) -> bool:
+        if key[0] in ("board", "by-mesa"):
+            return True
+        if key[0] == "detail":
+            return key[1] == ticket_id
+        # Cualquier lista puede tener la tarjeta con su `version` vieja (expected_version)
+        return key[0] == "list"
+
+    ticket_read_cache.invalidate(_match)
+
+
+@event.listens_for(Session, "after_commit")
+def _apply_after_commit(session: Session) -> None:
+    # Invalidación local inmediata (read-your-writes); el NOTIFY cubre a los demás workers.
+    for payload in session.info.pop(_PENDING_KEY, []):
+        apply_invalidation(payload)
+
+
+@event.listens_for(Session, "after_rollback")
+def _discard_after_rollback(session: Session) -> None:
+    session.info.pop(_PENDING_KEY, None)
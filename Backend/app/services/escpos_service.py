@@ -0,0 +1,87 @@
+from __future__ import annotations
+
+import re
+import textwrap
+
+from app.services.ticket_read_service import TicketRow
+
+# ==========================================================
+# COMANDAS EN ESC/POS (impresoras térmicas de red, ver app/core/print_spooler.py)
+# Cada comanda es un stream completo: init + texto + corte. Texto en PC850 (ñ, tildes);
+# los caracteres de control que vengan en los datos se eliminan para que un nombre de
+# producto no pueda meter comandos a la impresora.
+# ==========================================================
+
+ESC = b"\x1b"
+GS = b"\x1d"
+
+INIT = ESC + b"@"
+CODEPAGE_PC850 = ESC + b"t\x02"
+ALIGN_LEFT = ESC + b"a\x00"
+ALIGN_CENTER = ESC + b"a\x01"
+BOLD_ON = ESC + b"E\x01"
+BOLD_OFF = ESC + b"E\x00"
+SIZE_NORMAL = GS + b"!\x00"
+SIZE_DOUBLE = GS + b"!\x11"
+FEED_AND_CUT = ESC + b"d\x03" + GS + b"V\x42\x00"  # 3 líneas y corte parcial
+# Estado en tiempo real (DLE EOT 1): la impresora responde un byte apenas lo procesa
+STATUS_REQUEST = b"\x10\x04\x01"
+
+_ENCODING = "cp850"
+_CONTROL = re.compile(r"[\x00-\x1f\x7f]")
+_QTY_COLS = 5
+
+
+def columns_for_width(width_mm: int) -> int:
+    """Caracteres por línea con la fuente A según el ancho del papel."""
+    if width_mm <= 60:
+        return 32
+    if width_mm < 76:
+        return 42
+    return 48
+
+
+def _clean(value) -> str:
+    return _CONTROL.sub(" ", str(value)).strip() if value else ""
+
+
+def _line(text: str) -> bytes:
+    return text.encode(_ENCODING, "replace") + b"\n"
+
+
+def _two_cols(left: str, right: str, cols: int) -> bytes:
+    # Si no caben en una línea, la derecha pasa a la siguiente alineada a la derecha
+    if len(left) + 1 + len(right) > cols:
+        return _line(left) + _line(right.rjust(cols))
+    return _line(left + " " * (cols - len(left) - len(right)) + right)
+
+
+def render_escpos(ticket: TicketRow, width: int) -> bytes:
+    cols = columns_for_width(width)
+    rule = _line("-" * cols)
+    out = [
+        INIT,
+        CODEPAGE_PC850,
+        ALIGN_CENTER,
+        SIZE_DOUBLE,
+        BOLD_ON,
+        _line(f"COMANDA #{_clean(ticket.comanda_number)}"),
+        SIZE_NORMAL,
+        BOLD_OFF,
+        ALIGN_LEFT,
+        _two_cols(f"Mesa: {_clean(ticket.mesa_ref)}", f"Pedido: {_clean(ticket.pos_consec_docto)}", cols),
+        _two_cols(f"Mesero: {_clean(ticket.mesero_nombre)}", ticket.hora_pedido.astimezone().strftime("%Y-%m-%d %H:%M"), cols),
+        rule,
+    ]
+    name_cols = cols - _QTY_COLS - 1
+    for it in ticket.items:
+        qty = f"{float(it.qty):g}".rjust(_QTY_COLS)
+        lines = textwrap.wrap(_clean(it.product_name), name_cols) or [""]
+        out.append(BOLD_ON + _line(f"{qty} {lines[0]}") + BOLD_OFF)
+        out.extend(_line(" " * (_QTY_COLS + 1) + rest) for rest in lines[1:])
+    out += [
+        rule,
+        _line(f"Estado: {getattr(ticket.status, 'value', ticket.status)}"),
+        FEED_AND_CUT,
+    ]
+    return b"".join(out)
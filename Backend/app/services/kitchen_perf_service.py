@@ -0,0 +1,377 @@
+from __future__ import annotations
+
+from dataclasses import dataclass
+from datetime import date, datetime, timedelta
+from typing import Optional
+from zoneinfo import ZoneInfo
+
+from sqlalchemy import text
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+
+# ==========================================================
+# ROLLUPS DE DESEMPEÑO DE COCINA (sql/011_kitchen_perf_rollups.sql)
+# Un job periódico agrega lo terminado desde la marca de agua (rolled_until):
+# - kitchen_perf_hourly: por hora UTC y dimensión (all/product/mesero/mesa)
+# - kitchen_perf_daily: los mismos números por día local, sumados desde las horas
+# Las horas >= rolled_until se borran y recalculan en cada corrida; las anteriores ya
+# no cambian (delivered_at/canceled_at se fijan una sola vez). /analytics solo lee
+# estas tablas: un año de dashboard son pocos cientos de filas diarias.
+# ==========================================================
+
+DIMENSIONS = ("all", "product", "mesero", "mesa")
+
+# Límites (segundos) de las cubetas de hist_prep / hist_total: width_bucket() da
+# 0..len(HIST_BOUNDS_S) → len + 1 cubetas. Cambiarlos obliga a recalcular todo.
+HIST_BOUNDS_S = (60, 120, 180, 240, 300, 420, 600, 900, 1200, 1800, 2700, 3600, 5400, 7200)
+_N_BUCKETS = len(HIST_BOUNDS_S) + 1
+_BOUNDS_SQL = "ARRAY[" + ",".join(str(b) for b in HIST_BOUNDS_S) + "]::float8[]"
+
+
+def _hist_count(column: str, cond: str) -> str:
+    return "ARRAY[" + ",".join(f"count(*) FILTER (WHERE {cond} AND {column} = {b})" for b in range(_N_BUCKETS)) + "]::int[]"
+
+
+def _hist_sum(column: str) -> str:
+    # Suma elemento a elemento (índices de arrays en Postgres empiezan en 1)
+    return "ARRAY[" + ",".join(f"sum({column}[{b + 1}])" for b in range(_N_BUCKETS)) + "]::int[]"
+
+
+_ZERO_HIST = "'{" + ",".join("0" for _ in range(_N_BUCKETS)) + "}'::int[]"
+
+_METRIC_COLS = (
+    "items_delivered, items_canceled, items_timed, qty_delivered, wait_s_sum, prep_s_sum, total_s_sum, "
+    "total_s_max, hist_prep, hist_total, tickets_done, ticket_s_sum"
+)
+
+_LOCK_STATE_SQL = text(
+    "SELECT rolled_until FROM kitchen_perf_state WHERE id = 1 FOR UPDATE SKIP LOCKED"
+)
+
+# Items entregados (por hora de delivered_at) y cancelados sin entregar (por canceled_at),
+# de las tablas calientes y del archivo.
+_ITEMS_SOURCE = """
+  SELECT i.product_name, i.qty, i.prep_started_at, i.delivered_at, i.canceled_at,
+         t.hora_pedido, t.mesero_nombre, t.mesa_ref
+  FROM {items} i JOIN {tickets} t ON t.id = i.ticket_id
+  WHERE i.delivered_at >= :since OR i.canceled_at >= :since
+"""
+
+_ROLLUP_ITEMS_SQL = text(
+    f"""
+    WITH src AS (
+      {_ITEMS_SOURCE.format(items="kitchen_ticket_items", tickets="kitchen_tickets")}
+      UNION ALL
+      {_ITEMS_SOURCE.format(items="kitchen_ticket_items_archive", tickets="kitchen_tickets_archive")}
+    ),
+    fin AS (
+      SELECT
+        date_trunc('hour', COALESCE(delivered_at, canceled_at), 'UTC') AS hour,
+        delivered_at IS NOT NULL AS delivered,
+        COALESCE(product_name, '') AS product,
+        COALESCE(mesero_nombre, '') AS mesero,
+        COALESCE(mesa_ref, '') AS mesa,
+        qty,
+        -- Sin prep_started_at (entregado sin pasar por EN_PREPARACION) no hay espera ni
+        -- preparación: NULL, no 0 (GREATEST ignora los NULL), y no entra en items_timed
+        prep_started_at IS NOT NULL AS timed,
+        CASE WHEN prep_started_at IS NOT NULL
+             THEN GREATEST(0, EXTRACT(EPOCH FROM prep_started_at - hora_pedido))::float8 END AS wait_s,
+        CASE WHEN prep_started_at IS NOT NULL
+             THEN GREATEST(0, EXTRACT(EPOCH FROM delivered_at - prep_started_at))::float8 END AS prep_s,
+        GREATEST(0, EXTRACT(EPOCH FROM delivered_at - hora_pedido))::float8 AS total_s
+      FROM src
+      WHERE COALESCE(delivered_at, canceled_at) >= :since
+    ),
+    b AS (
+      SELECT fin.*,
+             width_bucket(prep_s, {_BOUNDS_SQL}) AS prep_b,
+             width_bucket(total_s, {_BOUNDS_SQL}) AS total_b
+      FROM fin
+    )
+    INSERT INTO kitchen_perf_hourly (
+      dim, key, hour, items_delivered, items_canceled, items_timed, qty_delivered,
+      wait_s_sum, prep_s_sum, total_s_sum, total_s_max, hist_prep, hist_total
+    )
+    SELECT
+      CASE WHEN GROUPING(b.product) = 0 THEN 'product'
+           WHEN GROUPING(b.mesero) = 0 THEN 'mesero'
+           WHEN GROUPING(b.mesa) = 0 THEN 'mesa'
+           ELSE 'all' END,
+      CASE WHEN GROUPING(b.product) = 0 THEN b.product
+           WHEN GROUPING(b.mesero) = 0 THEN b.mesero
+           WHEN GROUPING(b.mesa) = 0 THEN b.mesa
+           ELSE '' END,
+      b.hour,
+      count(*) FILTER (WHERE b.delivered),
+      count(*) FILTER (WHERE NOT b.delivered),
+      count(*) FILTER (WHERE b.delivered AND b.timed),
+      COALESCE(sum(b.qty) FILTER (WHERE b.delivered), 0),
+      COALESCE(sum(b.wait_s) FILTER (WHERE b.delivered AND b.timed), 0),
+      COALESCE(sum(b.prep_s) FILTER (WHERE b.delivered AND b.timed), 0),
+      COALESCE(sum(b.total_s) FILTER (WHERE b.delivered), 0),
+      max(b.total_s) FILTER (WHERE b.delivered),
+      {_hist_count("b.prep_b", "b.delivered")},
+      {_hist_count("b.total_b", "b.delivered")}
+    FROM b
+    GROUP BY GROUPING SETS ((b.hour), (b.hour, b.product), (b.hour, b.mesero), (b.hour, b.mesa))
+    """
+)
+
+_TICKETS_SOURCE = """
+  SELECT date_trunc('hour', hora_entrega, 'UTC') AS hour,
+         COALESCE(mesero_nombre, '') AS mesero,
+         COALESCE(mesa_ref, '') AS mesa,
+         GREATEST(0, EXTRACT(EPOCH FROM hora_entrega - hora_pedido))::float8 AS ticket_s
+  FROM {tickets}
+  WHERE hora_entrega >= :since AND status = 'LISTO'
+"""
+
+_ROLLUP_TICKETS_SQL = text(
+    f"""
+    WITH t AS (
+      {_TICKETS_SOURCE.format(tickets="kitchen_tickets")}
+      UNION ALL
+      {_TICKETS_SOURCE.format(tickets="kitchen_tickets_archive")}
+    )
+    INSERT INTO kitchen_perf_hourly (dim, key, hour, hist_prep, hist_total, tickets_done, ticket_s_sum)
+    SELECT
+      CASE WHEN GROUPING(t.mesero) = 0 THEN 'mesero' WHEN GROUPING(t.mesa) = 0 THEN 'mesa' ELSE 'all' END,
+      CASE WHEN GROUPING(t.mesero) = 0 THEN t.mesero WHEN GROUPING(t.mesa) = 0 THEN t.mesa ELSE '' END,
+      t.hour, {_ZERO_HIST}, {_ZERO_HIST},
+      count(*), sum(t.ticket_s)
+    FROM t
+    GROUP BY GROUPING SETS ((t.hour), (t.hour, t.mesero), (t.hour, t.mesa))
+    ON CONFLICT (dim, key, hour) DO UPDATE SET
+      tickets_done = EXCLUDED.tickets_done,
+      ticket_s_sum = EXCLUDED.ticket_s_sum
+    """
+)
+
+_ROLLUP_DAILY_SQL = text(
+    f"""
+    INSERT INTO kitchen_perf_daily (dim, key, day, {_METRIC_COLS})
+    SELECT
+      dim, key, (hour AT TIME ZONE :tz)::date,
+      sum(items_delivered), sum(items_canceled), sum(items_timed), sum(qty_delivered),
+      sum(wait_s_sum), sum(prep_s_sum), sum(total_s_sum), max(total_s_max),
+      {_hist_sum("hist_prep")}, {_hist_sum("hist_total")},
+      sum(tickets_done), sum(ticket_s_sum)
+    FROM kitchen_perf_hourly
+    WHERE hour >= (CAST(:from_day AS date)::timestamp AT TIME ZONE :tz)
+    GROUP BY 1, 2, 3
+    """
+)
+
+
+@dataclass
+class RollupResult:
+    skipped: bool = False
+    since: Optional[datetime] = None
+    rolled_until: Optional[datetime] = None
+    hourly_rows: int = 0
+    daily_rows: int = 0
+
+
+def _tz() -> ZoneInfo:
+    return ZoneInfo(settings.ANALYTICS_TIMEZONE)
+
+
+def _utc_hour(dt: datetime) -> datetime:
+    return dt.replace(minute=0, second=0, microsecond=0)
+
+
+def rollup_kitchen_perf(db: Session) -> RollupResult:
+    """Recalcula desde la marca de agua y la avanza. Hace commit. Si otro proceso está
+    corriendo el rollup (fila de estado bloqueada) no hace nada."""
+    row = db.execute(_LOCK_STATE_SQL).first()
+    if row is None:
+        db.rollback()
+        return RollupResult(skipped=True)
+
+    now = db.execute(text("SELECT now()")).scalar_one()
+    since = row.rolled_until
+    if since is None:
+        start_day = now.astimezone(_tz()).date() - timedelta(days=settings.ANALYTICS_BACKFILL_DAYS)
+        since = datetime.combine(start_day, datetime.min.time(), _tz())
+
+    # El backfill agrega meses de items de una vez: sin esto el hash se va a disco
+    db.execute(text("SELECT set_config('work_mem', :v, true)"), {"v": f"{settings.ANALYTICS_ROLLUP_WORK_MEM_MB}MB"})
+    params = {"since": since}
+    db.execute(text("DELETE FROM kitchen_perf_hourly WHERE hour >= :since"), params)
+    hourly = db.execute(_ROLLUP_ITEMS_SQL, params).rowcount or 0
+    db.execute(_ROLLUP_TICKETS_SQL, params)
+
+    from_day = since.astimezone(_tz()).date()
+    db.execute(text("DELETE FROM kitchen_perf_daily WHERE day >= :from_day"), {"from_day": from_day})
+    daily = db.execute(_ROLLUP_DAILY_SQL, {"from_day": from_day, "tz": settings.ANALYTICS_TIMEZONE}).rowcount or 0
+
+    # Margen para transacciones que empezaron antes del cierre de la hora (now() es el
+    # inicio de la transacción) y todavía no han hecho commit.
+    rolled_until = max(since, _utc_hour(now - timedelta(minutes=settings.ANALYTICS_ROLLUP_GRACE_MINUTES)))
+    db.execute(
+        text("UPDATE kitchen_perf_state SET rolled_until = :r, last_run_at = now() WHERE id = 1"),
+        {"r": rolled_until},
+    )
+    db.commit()
+    return RollupResult(since=since, rolled_until=rolled_until, hourly_rows=hourly, daily_rows=daily)
+
+
+def reset_kitchen_perf(db: Session) -> None:
+    """Borra los rollups y la marca de agua (el siguiente rollup rehace el backfill)."""
+    db.execute(text("TRUNCATE kitchen_perf_hourly, kitchen_perf_daily"))
+    db.execute(text("UPDATE kitchen_perf_state SET rolled_until = NULL WHERE id = 1"))
+    db.commit()
+
+
+# ==========================================================
+# LECTURAS (/analytics)
+# ==========================================================
+
+
+def histogram_percentile(hist: list[int], q: float) -> Optional[float]:
+    """Percentil aproximado (interpolación lineal dentro de la cubeta). La última cubeta
+    es abierta: se reporta su límite inferior."""
+    n = sum(hist)
+    if n == 0:
+        return None
+    target = q * n
+    acc = 0
+    for b, count in enumerate(hist):
+        if count and acc + count >= target:
+            lo = HIST_BOUNDS_S[b - 1] if b > 0 else 0
+            if b >= len(HIST_BOUNDS_S):
+                return float(lo)
+            hi = HIST_BOUNDS_S[b]
+            return round(lo + (hi - lo) * (target - acc) / count, 1)
+        acc += count
+    return float(HIST_BOUNDS_S[-1])
+
+
+def _avg(total: float, n: int) -> Optional[float]:
+    return round(total / n, 1) if n else None
+
+
+def _metrics(r) -> dict:
+    hist_prep = list(r.hist_prep or [])
+    hist_total = list(r.hist_total or [])
+    return {
+        "items_delivered": r.items_delivered,
+        "items_canceled": r.items_canceled,
+        "qty_delivered": float(r.qty_delivered or 0),
+        "tickets_done": r.tickets_done,
+        "avg_wait_s": _avg(r.wait_s_sum, r.items_timed),
+        "avg_prep_s": _avg(r.prep_s_sum, r.items_timed),
+        "avg_total_s": _avg(r.total_s_sum, r.items_delivered),
+        "avg_ticket_s": _avg(r.ticket_s_sum, r.tickets_done),
+        "max_total_s": round(r.total_s_max, 1) if r.total_s_max is not None else None,
+        "p50_prep_s": histogram_percentile(hist_prep, 0.50),
+        "p90_prep_s": histogram_percentile(hist_prep, 0.90),
+        "p50_total_s": histogram_percentile(hist_total, 0.50),
+        "p90_total_s": histogram_percentile(hist_total, 0.90),
+        "p95_total_s": histogram_percentile(hist_total, 0.95),
+    }
+
+
+_SUM_METRICS = f"""
+  sum(items_delivered)::int AS items_delivered, sum(items_canceled)::int AS items_canceled,
+  sum(items_timed)::int AS items_timed,
+  sum(qty_delivered) AS qty_delivered, sum(wait_s_sum) AS wait_s_sum, sum(prep_s_sum) AS prep_s_sum,
+  sum(total_s_sum) AS total_s_sum, max(total_s_max) AS total_s_max,
+  {_hist_sum("hist_prep")} AS hist_prep, {_hist_sum("hist_total")} AS hist_total,
+  sum(tickets_done)::int AS tickets_done, sum(ticket_s_sum) AS ticket_s_sum
+"""
+
+_SUMMARY_SQL = text(
+    f"""
+    SELECT key, {_SUM_METRICS}
+    FROM kitchen_perf_daily
+    WHERE dim = :dim AND day >= :from_day AND day <= :to_day
+    GROUP BY key
+    ORDER BY sum(items_delivered) DESC, sum(tickets_done) DESC, key
+    LIMIT :limit
+    """
+)
+
+_DAILY_SERIES_SQL = text(
+    f"""
+    SELECT day AS bucket, {_METRIC_COLS}
+    FROM kitchen_perf_daily
+    WHERE dim = :dim AND key = :key AND day >= :from_day AND day <= :to_day
+    ORDER BY day
+    """
+)
+
+_HOURLY_SERIES_SQL = text(
+    f"""
+    SELECT hour AS bucket, {_METRIC_COLS}
+    FROM kitchen_perf_hourly
+    WHERE dim = :dim AND key = :key AND hour >= :from_ts AND hour < :to_ts
+    ORDER BY hour
+    """
+)
+
+# Perfil por hora del día (hora local), p. ej. "a qué hora se demora más la cocina"
+_HOUR_OF_DAY_SQL = text(
+    f"""
+    SELECT extract(hour FROM hour AT TIME ZONE :tz)::int AS bucket, {_SUM_METRICS}
+    FROM kitchen_perf_hourly
+    WHERE dim = :dim AND key = :key
+      AND hour >= (CAST(:from_day AS date)::timestamp AT TIME ZONE :tz)
+      AND hour < ((CAST(:to_day AS date) + 1)::timestamp AT TIME ZONE :tz)
+    GROUP BY 1
+    ORDER BY 1
+    """
+)
+
+
+def local_today() -> date:
+    return datetime.now(_tz()).date()
+
+
+def perf_summary(db: Session, *, dim: str, from_day: date, to_day: date, limit: int) -> list[dict]:
+    rows = db.execute(_SUMMARY_SQL, {"dim": dim, "from_day": from_day, "to_day": to_day, "limit": limit}).all()
+    return [{"key": r.key, **_metrics(r)} for r in rows]
+
+
+def perf_series(
+    db: Session,
+    *,
+    grain: str,
+    dim: str,
+    key: str,
+    from_day: date,
+    to_day: date,
+) -> list[dict]:
+    if grain == "day":
+        rows = db.execute(
+            _DAILY_SERIES_SQL, {"dim": dim, "key": key, "from_day": from_day, "to_day": to_day}
+        ).all()
+    elif grain == "hour":
+        tz = _tz()
+        rows = db.execute(
+            _HOURLY_SERIES_SQL,
+            {
+                "dim": dim,
+                "key": key,
+                "from_ts": datetime.combine(from_day, datetime.min.time(), tz),
+                "to_ts": datetime.combine(to_day + timedelta(days=1), datetime.min.time(), tz),
+            },
+        ).all()
+    else:  # hour_of_day
+        rows = db.execute(
+            _HOUR_OF_DAY_SQL,
+            {"dim": dim, "key": key, "from_day": from_day, "to_day": to_day, "tz": settings.ANALYTICS_TIMEZONE},
+        ).all()
+    return [{"bucket": r.bucket, **_metrics(r)} for r in rows]
+
+
+def perf_state(db: Session) -> dict:
+    row = db.execute(text("SELECT rolled_until, last_run_at FROM kitchen_perf_state WHERE id = 1")).first()
+    return {
+        "rolled_until": row.rolled_until if row else None,
+        "last_run_at": row.last_run_at if row else None,
+        "timezone": settings.ANALYTICS_TIMEZONE,
+        "hist_bounds_s": list(HIST_BOUNDS_S),
+    }
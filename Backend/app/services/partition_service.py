@@ -0,0 +1,152 @@
+from __future__ import annotations
+
+from dataclasses import dataclass, field
+from datetime import date, datetime, timedelta, timezone
+
+from sqlalchemy import text
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+
+# ==========================================================
+# PARTICIONES MENSUALES (sql/010_monthly_partitions.sql)
+# - Crea las particiones de los próximos meses antes de que lleguen filas (no hay
+#   partición DEFAULT: un INSERT fuera de rango falla en vez de ir a parar a una tabla
+#   que luego no se puede borrar por mes).
+# - Retención: DROP de particiones completas, nunca DELETE fila por fila.
+# - sync_runs se resume por día en sync_run_daily antes de borrar sus particiones.
+# ==========================================================
+
+# Retención EVENTS_RETENTION_MONTHS / SYNC_RUNS_RETENTION_MONTHS
+_EVENT_TABLES = ("ticket_events", "ticket_events_archive")
+_SYNC_RUNS = "sync_runs"
+
+_ROLLUP_SYNC_RUNS_SQL = text(
+    """
+    INSERT INTO sync_run_daily (
+      day, source, mode, runs, success_runs, error_runs,
+      total_doctos_sqlserver, new_tickets, updated_tickets, new_items, updated_items, skipped_items,
+      duration_ms_sum, duration_ms_max, last_error
+    )
+    SELECT
+      (started_at AT TIME ZONE 'UTC')::date,
+      source,
+      mode,
+      count(*),
+      count(*) FILTER (WHERE status = 'SUCCESS'),
+      count(*) FILTER (WHERE status = 'ERROR'),
+      sum(total_doctos_sqlserver),
+      sum(new_tickets),
+      sum(updated_tickets),
+      sum(new_items),
+      sum(updated_items),
+      sum(skipped_items),
+      COALESCE(sum(duration_ms), 0),
+      max(duration_ms),
+      (array_agg(error_message ORDER BY started_at DESC) FILTER (WHERE error_message IS NOT NULL))[1]
+    FROM sync_runs
+    WHERE started_at >= :from_ts AND started_at < :to_ts
+    GROUP BY 1, 2, 3
+    ON CONFLICT (day, source, mode) DO UPDATE SET
+      runs = EXCLUDED.runs,
+      success_runs = EXCLUDED.success_runs,
+      error_runs = EXCLUDED.error_runs,
+      total_doctos_sqlserver = EXCLUDED.total_doctos_sqlserver,
+      new_tickets = EXCLUDED.new_tickets,
+      updated_tickets = EXCLUDED.updated_tickets,
+      new_items = EXCLUDED.new_items,
+      updated_items = EXCLUDED.updated_items,
+      skipped_items = EXCLUDED.skipped_items,
+      duration_ms_sum = EXCLUDED.duration_ms_sum,
+      duration_ms_max = EXCLUDED.duration_ms_max,
+      last_error = EXCLUDED.last_error
+    """
+)
+
+
+@dataclass
+class PartitionMaintenanceResult:
+    created: dict[str, int] = field(default_factory=dict)
+    dropped: list[str] = field(default_factory=list)
+    rolled_up_days: int = 0
+
+
+def _month_start(d: date) -> datetime:
+    return datetime(d.year, d.month, 1, tzinfo=timezone.utc)
+
+
+def _months_back(months: int, today: date | None = None) -> datetime:
+    """Inicio del mes que está `months` meses antes del actual (UTC)."""
+    today = today or datetime.now(timezone.utc).date()
+    idx = today.year * 12 + (today.month - 1) - months
+    return datetime(idx // 12, idx % 12 + 1, 1, tzinfo=timezone.utc)
+
+
+def ensure_partitions(db: Session, months_ahead: int | None = None) -> dict[str, int]:
+    """Crea las particiones del mes actual y los siguientes. Devuelve cuántas creó por tabla."""
+    ahead = settings.PARTITION_MONTHS_AHEAD if months_ahead is None else months_ahead
+    this_month = _month_start(datetime.now(timezone.utc).date()).date()
+    out: dict[str, int] = {}
+    for parent in (*_EVENT_TABLES, _SYNC_RUNS):
+        out[parent] = int(
+            db.execute(
+                text("SELECT ensure_monthly_partitions(:parent, :from_month, :ahead)"),
+                {"parent": parent, "from_month": this_month, "ahead": ahead},
+            ).scalar_one()
+        )
+    return out
+
+
+def rollup_sync_runs(db: Session, from_ts: datetime, to_ts: datetime) -> int:
+    """(Re)calcula sync_run_daily para [from_ts, to_ts). Idempotente. Devuelve filas escritas."""
+    return db.execute(_ROLLUP_SYNC_RUNS_SQL, {"from_ts": from_ts, "to_ts": to_ts}).rowcount or 0
+
+
+def _drop_before(db: Session, parent: str, cutoff: datetime) -> list[str]:
+    return list(
+        db.execute(
+            text("SELECT drop_monthly_partitions_before(:parent, :cutoff)"),
+            {"parent": parent, "cutoff": cutoff},
+        ).scalars()
+    )
+
+
+def apply_retention(
+    db: Session,
+    *,
+    events_months: int | None = None,
+    sync_runs_months: int | None = None,
+) -> tuple[list[str], int]:
+    """Borra particiones vencidas. Antes resume los sync_runs que se van. Devuelve (borradas, días resumidos)."""
+    ev_months = settings.EVENTS_RETENTION_MONTHS if events_months is None else events_months
+    sr_months = settings.SYNC_RUNS_RETENTION_MONTHS if sync_runs_months is None else sync_runs_months
+
+    dropped: list[str] = []
+    ev_cutoff = _months_back(ev_months)
+    for parent in _EVENT_TABLES:
+        dropped += _drop_before(db, parent, ev_cutoff)
+
+    sr_cutoff = _months_back(sr_months)
+    # Todo lo anterior al corte queda resumido; el resumen se escribe en la misma
+    # transacción que el DROP, así que nunca hay un mes borrado sin resumir.
+    days = rollup_sync_runs(db, datetime(1970, 1, 1, tzinfo=timezone.utc), sr_cutoff)
+    dropped += _drop_before(db, _SYNC_RUNS, sr_cutoff)
+    return dropped, days
+
+
+def run_partition_maintenance(db: Session) -> PartitionMaintenanceResult:
+    """Particiones futuras + resumen de ayer/hoy + retención. Hace commit."""
+    db.execute(text("SELECT set_config('lock_timeout', :v, true)"), {"v": f"{settings.LOCK_TIMEOUT_MS}ms"})
+    res = PartitionMaintenanceResult()
+    res.created = ensure_partitions(db)
+
+    # sync_run_daily también sirve para los días recientes (dashboard), no solo como archivo
+    now = datetime.now(timezone.utc)
+    today = datetime(now.year, now.month, now.day, tzinfo=timezone.utc)
+    res.rolled_up_days = rollup_sync_runs(db, today - timedelta(days=1), today + timedelta(days=1))
+
+    res.dropped, days = apply_retention(db)
+    res.rolled_up_days += days
+    db.commit()
+    return res
+
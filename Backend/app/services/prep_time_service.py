@@ -0,0 +1,239 @@
+from __future__ import annotations
+
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Optional
+
+import numpy as np
+from sqlalchemy import text
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+
+# ==========================================================
+# ANÁLISIS AD-HOC DE TIEMPOS (/analytics/prep-times)
+# Trae los timestamps de los items entregados en el rango con un cursor del lado del
+# servidor (yield_per: psycopg va leyendo por bloques, nunca la consulta completa en
+# memoria), arma arrays de NumPy y calcula todo vectorizado. En SQL solo hay filtros y
+# el JOIN al ticket: nada de ventanas ni percentile_cont sobre la base en servicio.
+# Para dashboards recurrentes están los rollups (kitchen_perf_service).
+# ==========================================================
+
+PERCENTILES = (50, 75, 90, 95, 99)
+_STREAM_ROWS = 20_000
+
+# Filtros comunes al stream y a la consulta de outliers
+_WHERE = """
+  WHERE i.delivered_at >= :from_ts AND i.delivered_at < :to_ts
+    AND (CAST(:product AS text) IS NULL OR i.product_name = CAST(:product AS text))
+    AND (CAST(:mesero AS text) IS NULL OR t.mesero_nombre = CAST(:mesero AS text))
+    AND (CAST(:mesa AS text) IS NULL OR t.mesa_ref = CAST(:mesa AS text))
+"""
+
+# Solo lo que entra en las cuentas: cada columna extra es conversión por fila en Python
+_SOURCE = """
+  SELECT COALESCE(i.product_name, ''), COALESCE(t.mesero_nombre, ''),
+         EXTRACT(EPOCH FROM t.hora_pedido)::float8 AS pedido,
+         EXTRACT(EPOCH FROM COALESCE(i.prep_started_at, i.delivered_at))::float8 AS prep,
+         EXTRACT(EPOCH FROM i.delivered_at)::float8 AS entrega,
+         EXTRACT(HOUR FROM t.hora_pedido AT TIME ZONE :tz)::int AS hora_local
+  FROM {items} i JOIN {tickets} t ON t.id = i.ticket_id
+""" + _WHERE
+
+_ITEMS_SQL = text(
+    _SOURCE.format(items="kitchen_ticket_items", tickets="kitchen_tickets")
+    + " UNION ALL "
+    + _SOURCE.format(items="kitchen_ticket_items_archive", tickets="kitchen_tickets_archive")
+).execution_options(yield_per=_STREAM_ROWS)
+
+# Detalle de los outliers: pocas filas, se piden aparte una vez conocido el umbral
+_OUTLIER_SOURCE = """
+  SELECT i.id AS item_id, i.ticket_id, t.comanda_number, i.product_name, t.mesero_nombre, t.mesa_ref,
+         GREATEST(0, EXTRACT(EPOCH FROM COALESCE(i.prep_started_at, i.delivered_at) - t.hora_pedido))::float8 AS wait_s,
+         GREATEST(0, EXTRACT(EPOCH FROM i.delivered_at - COALESCE(i.prep_started_at, i.delivered_at)))::float8 AS prep_s,
+         EXTRACT(EPOCH FROM i.delivered_at - t.hora_pedido)::float8 AS total_s
+  FROM {items} i JOIN {tickets} t ON t.id = i.ticket_id
+""" + _WHERE + """
+    AND i.delivered_at - t.hora_pedido > make_interval(secs => :threshold)
+"""
+
+_OUTLIERS_SQL = text(
+    "SELECT * FROM ("
+    + _OUTLIER_SOURCE.format(items="kitchen_ticket_items", tickets="kitchen_tickets")
+    + " UNION ALL "
+    + _OUTLIER_SOURCE.format(items="kitchen_ticket_items_archive", tickets="kitchen_tickets_archive")
+    + ") o ORDER BY total_s DESC LIMIT :limit"
+)
+
+
+@dataclass
+class PrepTimeFrame:
+    """Columnas del rango, una posición por item."""
+
+    params: dict  # filtros con los que se cargó (para la consulta de outliers)
+    product: np.ndarray  # object (str)
+    mesero: np.ndarray  # object (str)
+    wait_s: np.ndarray  # float64: pedido → inicio preparación
+    prep_s: np.ndarray  # float64: inicio preparación → entrega
+    total_s: np.ndarray  # float64: pedido → entrega
+    hour: np.ndarray  # int16: hora local del pedido
+
+    def __len__(self) -> int:
+        return len(self.total_s)
+
+
+def load_frame(
+    db: Session,
+    *,
+    from_ts: datetime,
+    to_ts: datetime,
+    product: Optional[str] = None,
+    mesero: Optional[str] = None,
+    mesa: Optional[str] = None,
+) -> PrepTimeFrame:
+    params = {
+        "from_ts": from_ts,
+        "to_ts": to_ts,
+        "product": product,
+        "mesero": mesero,
+        "mesa": mesa,
+        "tz": settings.ANALYTICS_TIMEZONE,
+    }
+    cols: list[list] = [[] for _ in range(6)]
+    for block in db.execute(_ITEMS_SQL, params).partitions():
+        # zip(*) transpone el bloque; cada columna se vuelve array una sola vez al final
+        for acc, values in zip(cols, zip(*block)):
+            acc.extend(values)
+
+    product_c, mesero_c, pedido, prep, entrega, hour = cols
+    pedido_a = np.asarray(pedido, dtype=np.float64)
+    prep_a = np.asarray(prep, dtype=np.float64)
+    entrega_a = np.asarray(entrega, dtype=np.float64)
+    return PrepTimeFrame(
+        params=params,
+        product=np.asarray(product_c, dtype=object),
+        mesero=np.asarray(mesero_c, dtype=object),
+        wait_s=np.clip(prep_a - pedido_a, 0, None),
+        prep_s=np.clip(entrega_a - prep_a, 0, None),
+        total_s=np.clip(entrega_a - pedido_a, 0, None),
+        hour=np.asarray(hour, dtype=np.int16),
+    )
+
+
+def _stats(values: np.ndarray) -> dict:
+    if len(values) == 0:
+        return {"n": 0, "mean": None, **{f"p{p}": None for p in PERCENTILES}, "max": None}
+    pct = np.percentile(values, PERCENTILES)
+    return {
+        "n": int(len(values)),
+        "mean": round(float(values.mean()), 1),
+        **{f"p{p}": round(float(v), 1) for p, v in zip(PERCENTILES, pct)},
+        "max": round(float(values.max()), 1),
+    }
+
+
+def _histogram(values: np.ndarray, bin_s: int) -> dict:
+    if len(values) == 0:
+        return {"bin_s": bin_s, "edges": [], "counts": [], "overflow": 0}
+    # Hasta el p99: la cola larga va a `overflow` en vez de estirar el eje
+    top = max(bin_s, float(np.percentile(values, 99)))
+    edges = np.arange(0, top + bin_s, bin_s, dtype=np.float64)
+    counts, _ = np.histogram(values, bins=edges)
+    return {
+        "bin_s": bin_s,
+        "edges": edges.tolist(),
+        "counts": counts.tolist(),
+        "overflow": int((values >= edges[-1]).sum()),
+    }
+
+
+def _group_quantiles(codes: np.ndarray, values: np.ndarray, n_groups: int, qs: tuple[float, ...]) -> np.ndarray:
+    """Cuantiles por grupo sin loop de Python: se ordena por (grupo, valor) y se indexa
+    cada grupo en su posición (rango más cercano por debajo). Devuelve (n_groups, len(qs))."""
+    order = np.lexsort((values, codes))
+    sorted_vals = values[order]
+    counts = np.bincount(codes, minlength=n_groups)
+    starts = np.concatenate(([0], np.cumsum(counts)[:-1]))
+    out = np.full((n_groups, len(qs)), np.nan)
+    has = counts > 0
+    for j, q in enumerate(qs):
+        idx = starts[has] + np.floor(q * (counts[has] - 1)).astype(np.int64)
+        out[has, j] = sorted_vals[idx]
+    return out
+
+
+def _breakdown(labels: np.ndarray, frame: PrepTimeFrame, limit: int) -> list[dict]:
+    if len(frame) == 0:
+        return []
+    keys, codes = np.unique(labels, return_inverse=True)
+    codes = codes.ravel()
+    n = len(keys)
+    counts = np.bincount(codes, minlength=n)
+    mean_total = np.bincount(codes, weights=frame.total_s, minlength=n) / np.maximum(counts, 1)
+    mean_prep = np.bincount(codes, weights=frame.prep_s, minlength=n) / np.maximum(counts, 1)
+    mean_wait = np.bincount(codes, weights=frame.wait_s, minlength=n) / np.maximum(counts, 1)
+    q = _group_quantiles(codes, frame.total_s, n, (0.5, 0.9))
+    top = np.argsort(-counts, kind="stable")[:limit]
+    return [
+        {
+            "key": keys[g],
+            "n": int(counts[g]),
+            "mean_wait_s": round(float(mean_wait[g]), 1),
+            "mean_prep_s": round(float(mean_prep[g]), 1),
+            "mean_total_s": round(float(mean_total[g]), 1),
+            "p50_total_s": round(float(q[g, 0]), 1),
+            "p90_total_s": round(float(q[g, 1]), 1),
+        }
+        for g in top
+    ]
+
+
+def _by_hour(frame: PrepTimeFrame) -> list[dict]:
+    counts = np.bincount(frame.hour, minlength=24)
+    sums = np.bincount(frame.hour, weights=frame.total_s, minlength=24)
+    q = _group_quantiles(frame.hour.astype(np.int64), frame.total_s, 24, (0.5, 0.9)) if len(frame) else np.full((24, 2), np.nan)
+    return [
+        {
+            "hour": h,
+            "n": int(counts[h]),
+            "mean_total_s": round(float(sums[h] / counts[h]), 1) if counts[h] else None,
+            "p50_total_s": round(float(q[h, 0]), 1) if counts[h] else None,
+            "p90_total_s": round(float(q[h, 1]), 1) if counts[h] else None,
+        }
+        for h in range(24)
+    ]
+
+
+def _outliers(db: Session, frame: PrepTimeFrame, limit: int) -> dict:
+    if len(frame) == 0:
+        return {"threshold_s": None, "count": 0, "items": []}
+    # Regla de Tukey sobre el tiempo total: > Q3 + 1.5·IQR
+    q1, q3 = np.percentile(frame.total_s, (25, 75))
+    threshold = float(q3 + 1.5 * (q3 - q1))
+    count = int((frame.total_s > threshold).sum())
+    rows = []
+    if count and limit:
+        rows = db.execute(_OUTLIERS_SQL, {**frame.params, "threshold": threshold, "limit": limit}).mappings().all()
+    return {
+        "threshold_s": round(threshold, 1),
+        "count": count,
+        "items": [
+            {**r, "wait_s": round(r["wait_s"], 1), "prep_s": round(r["prep_s"], 1), "total_s": round(r["total_s"], 1)}
+            for r in rows
+        ],
+    }
+
+
+def analyze_prep_times(db: Session, frame: PrepTimeFrame, *, bin_s: int = 60, top: int = 50, outliers: int = 50) -> dict:
+    return {
+        "items": len(frame),
+        "wait_s": _stats(frame.wait_s),
+        "prep_s": _stats(frame.prep_s),
+        "total_s": _stats(frame.total_s),
+        "histogram_total_s": _histogram(frame.total_s, bin_s),
+        "histogram_prep_s": _histogram(frame.prep_s, bin_s),
+        "by_product": _breakdown(frame.product, frame, top),
+        "by_mesero": _breakdown(frame.mesero, frame, top),
+        "by_hour": _by_hour(frame),
+        "outliers": _outliers(db, frame, outliers),
+    }
@@ -0,0 +1,175 @@
+from __future__ import annotations
+
+from dataclasses import dataclass, field
+from html import escape
+from typing import Literal, Sequence
+from uuid import UUID
+
+from sqlalchemy import select
+from sqlalchemy.orm import Session
+
+from app.core.read_cache import CacheEntry, print_cache
+from app.models.ticket_archive import TicketAll
+from app.services.escpos_service import render_escpos
+from app.services.ticket_read_service import TicketRow, get_ticket_rows
+
+# ==========================================================
+# IMPRESIÓN DE COMANDAS (POST /tickets/{id}/print, POST /tickets/print-batch)
+# Plantillas armadas una vez al importar el módulo; por comanda solo se hace
+# format() con los campos ya escapados. Cada comanda renderizada (HTML o ESC/POS)
+# queda en print_cache por (ticket, versión, ancho, formato): una reimpresión cuesta
+# la consulta de versión.
+# ==========================================================
+
+_ITEM_ROW = (
+    '<tr><td style="width:18%; text-align:right; padding:2px 0;"><strong>{qty}</strong></td>'
+    '<td style="width:82%; padding:2px 0 2px 8px;">{name}</td></tr>'
+).format
+
+_COMANDA = """<section class="comanda">
+  <h1>COMANDA #{comanda}</h1>
+  <div class="row"><div><strong>Mesa:</strong> {mesa}</div><div><strong>Pedido:</strong> {pedido}</div></div>
+  <div class="row muted"><div><strong>Mesero:</strong> {mesero}</div><div>{hora}</div></div>
+  <hr/>
+  <table>
+    {items}
+  </table>
+  <hr/>
+  <div class="muted">Estado: <strong>{status}</strong></div>
+</section>""".format
+
+# {width} va en el @page; las llaves del CSS/JS están duplicadas por format()
+_DOCUMENT = """<!doctype html>
+<html>
+<head>
+  <meta charset="utf-8"/>
+  <title>{title}</title>
+  <style>
+    @page {{
+      size: {width}mm auto;
+      margin: 4mm;
+    }}
+    body {{
+      font-family: Arial, sans-serif;
+      font-size: 12px;
+      color: #111;
+    }}
+    h1 {{
+      font-size: 16px;
+      margin: 0 0 6px 0;
+      text-align:center;
+    }}
+    .muted {{ color:#555; font-size: 11px; }}
+    .row {{ display:flex; justify-content:space-between; gap:8px; }}
+    hr {{ border:0; border-top:1px dashed #666; margin:8px 0; }}
+    table {{ width:100%; border-collapse:collapse; }}
+    .comanda + .comanda {{ break-before: page; }}
+  </style>
+</head>
+<body>
+{comandas}
+  <script>
+    window.onload = function() {{
+      window.print();
+      setTimeout(()=>window.close(), 350);
+    }}
+  </script>
+</body>
+</html>
+""".format
+
+
+def _text(value) -> str:
+    return escape(str(value)) if value else ""
+
+
+def render_comanda(ticket: TicketRow, width: int) -> str:
+    """Fragmento HTML de una comanda (sin documento alrededor)."""
+    items = "\n    ".join(
+        _ITEM_ROW(qty=f"{float(it.qty):g}", name=escape((it.product_name or "").strip()))
+        for it in ticket.items
+    )
+    return _COMANDA(
+        comanda=_text(ticket.comanda_number),
+        mesa=_text(ticket.mesa_ref),
+        pedido=_text(ticket.pos_consec_docto),
+        mesero=_text(ticket.mesero_nombre),
+        hora=ticket.hora_pedido.astimezone().strftime("%Y-%m-%d %H:%M"),
+        items=items,
+        status=getattr(ticket.status, "value", ticket.status),
+    )
+
+
+def render_document(title: str, width: int, comandas: Sequence[str]) -> str:
+    return _DOCUMENT(title=escape(title), width=width, comandas="\n".join(comandas))
+
+
+PrintFormat = Literal["html", "escpos"]
+
+_RENDERERS = {
+    "html": lambda ticket, width: render_comanda(ticket, width).encode("utf-8"),
+    "escpos": render_escpos,
+}
+
+
+@dataclass
+class PrintBatch:
+    content: bytes  # documento HTML, o los streams ESC/POS concatenados
+    printed: list[tuple[UUID, int | None]] = field(default_factory=list)  # (id, comanda_number), en orden
+    missing: list[UUID] = field(default_factory=list)
+
+
+def _versions(db: Session, ticket_ids: Sequence[UUID]) -> dict[UUID, tuple[int, int | None]]:
+    """id -> (versión, comanda_number), caliente + archivo en una consulta."""
+    rows = db.execute(
+        select(TicketAll.id, TicketAll.version, TicketAll.comanda_number).where(TicketAll.id.in_(list(ticket_ids)))
+    ).all()
+    return {r.id: (r.version, r.comanda_number) for r in rows}
+
+
+def render_print_batch(
+    db: Session,
+    ticket_ids: Sequence[UUID],
+    *,
+    width: int,
+    fmt: PrintFormat = "html",
+) -> PrintBatch:
+    """
+    Comandas en el orden pedido (ids repetidos se imprimen una vez): un documento HTML
+    con una por página, o un stream ESC/POS con corte entre comandas. Solo se cargan de
+    la DB las que no están en print_cache.
+    """
+    ids = list(dict.fromkeys(ticket_ids))
+    versions = _versions(db, ids)
+    epoch = print_cache.epoch()
+
+    fragments: dict[UUID, bytes] = {}
+    misses = []
+    for tid, (version, _) in versions.items():
+        entry = print_cache.get((tid, version, width, fmt))
+        if entry is None:
+            misses.append(tid)
+        else:
+            fragments[tid] = entry.body
+
+    if misses:
+        render = _RENDERERS[fmt]
+        for tid, ticket in get_ticket_rows(db, misses).items():
+            body = render(ticket, width)
+            fragments[tid] = body
+            # La versión leída con la fila: si cambió entre las dos consultas, la
+            # entrada queda con su propia versión y no tapa la anterior.
+            print_cache.put((tid, ticket.version, width, fmt), CacheEntry(body=body, etag="", version=ticket.version), epoch)
+
+    printed = [tid for tid in ids if tid in fragments]
+    if fmt == "escpos":
+        content = b"".join(fragments[tid] for tid in printed)
+    else:
+        number = versions[printed[0]][1] if len(printed) == 1 else None
+        title = f"Comanda #{number or ''}" if len(printed) == 1 else f"Comandas ({len(printed)})"
+        content = render_document(title, width, [fragments[tid].decode("utf-8") for tid in printed]).encode("utf-8")
+    return PrintBatch(
+        content=content,
+        printed=[(tid, versions[tid][1]) for tid in printed],
+        missing=[tid for tid in ids if tid not in fragments],
+    )
@@ -5,11 +5,16 @@ from datetime import datetime, timedelta, timezone
 from typing import Optional
 from uuid import UUID, uuid4
 
-from sqlalchemy import text
+from sqlalchemy import exists, select, text
 from sqlalchemy.orm import Session, selectinload
 
 from app.integrations.siesa_sqlserver import connect_siesa, load_siesa_config_from_env, query
 from app.models.ticket import KitchenTicket, KitchenTicketItem, TicketStatus, ItemStatus
+from app.models.ticket_archive import kitchen_tickets_archive
+from app.services.cache_invalidation_service import publish_board_change
+from app.services.ticket_board_service import refresh_ticket_board
+from app.services.ticket_status_service import recount_ticket_items
+from app.services.ticket_version_service import touch_item, touch_ticket
 
 
 @dataclass
@@ -535,6 +540,7 @@ def run_siesa_sync(
     max_seen_rv: Optional[int] = last_rowversion
 
     doctos, used_rowversion, used_fallback = _fetch_doctos(conn, tipo_docto, since, last_rowversion, limit)
+    board_ids: set = set()  # tickets a recalcular en ticket_board
 
     for d in doctos:
         guid = _safe_uuid(d["f9820_guid"])
@@ -577,6 +583,12 @@ def run_siesa_sync(
             .first()
         )
 
+        if not ticket and db.scalar(
+            select(exists().where(kitchen_tickets_archive.c.pos_docto_guid == guid))
+        ):
+            # Ya terminado y archivado (app/services/ticket_archive_service.py): no se revive
+            continue
+
         if not ticket:
             ticket = KitchenTicket(
                 id=uuid4(),
@@ -599,6 +611,7 @@ def run_siesa_sync(
             )
             db.add(ticket)
             db.flush()
+            board_ids.add(ticket.id)
             res.new_tickets += 1
         else:
             changed = False
@@ -631,6 +644,8 @@ def run_siesa_sync(
                 changed = True
 
             if changed:
+                touch_ticket(ticket)
+                board_ids.add(ticket.id)
                 res.updated_tickets += 1
 
         lines = query(
@@ -650,6 +665,7 @@ def run_siesa_sync(
         )
 
         existing_by_movto = {str(it.pos_movto_guid): it for it in ticket.items}
+        items_changed = False
 
         for ln in lines:
             movto_guid_raw = ln.get("f9830_guid")
@@ -713,6 +729,8 @@ def run_siesa_sync(
                     item_changed = True
 
                 if item_changed:
+                    touch_item(existing)
+                    items_changed = True
                     res.updated_items += 1
                 else:
                     res.skipped_items += 1
@@ -732,11 +750,21 @@ def run_siesa_sync(
                     status=ItemStatus.PENDIENTE,
                 )
             )
+            items_changed = True
             res.new_items += 1
 
+        if items_changed:
+            touch_ticket(ticket)
+            board_ids.add(ticket.id)
+
     if max_seen_ts or max_seen_rv is not None:
         _set_sync_state(db, max_seen_ts, max_seen_rv)
 
+    if res.new_tickets or res.updated_tickets or res.new_items or res.updated_items:
+        recount_ticket_items(db, board_ids)
+        refresh_ticket_board(db, board_ids)
+        publish_board_change(db)
+
     db.commit()
 
     return {
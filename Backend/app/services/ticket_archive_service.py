@@ -0,0 +1,121 @@
+from __future__ import annotations
+
+from dataclasses import dataclass
+
+from sqlalchemy import bindparam, text
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+from app.models.ticket import KitchenTicket, KitchenTicketItem
+from app.models.ticket_archive import ARCHIVED_TICKET_STATUSES
+from app.models.ticket_event import TicketEvent
+from app.services.cache_invalidation_service import publish_board_change
+from app.services.ticket_version_service import BOARD_VERSION_SEQ
+
+# ==========================================================
+# ARCHIVADO DE TICKETS TERMINADOS
+# Mueve a *_archive los tickets LISTO/CANCELADO terminados hace más de N horas, con
+# sus items y eventos, en lotes pequeños: cada lote es un statement y un commit.
+# Los tickets se toman con SKIP LOCKED: si alguien los está tocando quedan para la
+# siguiente vuelta y nadie espera al archivador.
+# ==========================================================
+
+
+def _cols(table) -> str:
+    return ", ".join(c.name for c in table.columns)
+
+
+_TICKET_COLS = _cols(KitchenTicket.__table__)
+_ITEM_COLS = _cols(KitchenTicketItem.__table__)
+_EVENT_COLS = _cols(TicketEvent.__table__)
+
+_ARCHIVE_BATCH_SQL = text(
+    f"""
+    WITH victims AS (
+      SELECT id
+      FROM kitchen_tickets
+      WHERE status = ANY(CAST(:statuses AS ticket_status[]))
+        AND COALESCE(hora_entrega, updated_at) < now() - make_interval(hours => :older_than_hours)
+      ORDER BY id
+      LIMIT :batch_size
+      FOR UPDATE SKIP LOCKED
+    ),
+    ins_tickets AS (
+      INSERT INTO kitchen_tickets_archive ({_TICKET_COLS})
+      SELECT {_TICKET_COLS} FROM kitchen_tickets WHERE id IN (SELECT id FROM victims)
+      ON CONFLICT (id) DO NOTHING
+    ),
+    ins_items AS (
+      INSERT INTO kitchen_ticket_items_archive ({_ITEM_COLS})
+      SELECT {_ITEM_COLS} FROM kitchen_ticket_items WHERE ticket_id IN (SELECT id FROM victims)
+      ON CONFLICT (id) DO NOTHING
+    ),
+    ins_events AS (
+      INSERT INTO ticket_events_archive ({_EVENT_COLS})
+      SELECT {_EVENT_COLS} FROM ticket_events WHERE ticket_id IN (SELECT id FROM victims)
+      -- particionada por created_at: la llave única es (id, created_at)
+      ON CONFLICT DO NOTHING
+    ),
+    del_events AS (
+      DELETE FROM ticket_events WHERE ticket_id IN (SELECT id FROM victims)
+    ),
+    -- items y ticket_board se van por ON DELETE CASCADE
+    del_tickets AS (
+      DELETE FROM kitchen_tickets WHERE id IN (SELECT id FROM victims)
+      RETURNING id
+    )
+    SELECT count(*) FROM del_tickets
+    """
+).bindparams(bindparam("statuses", value=[s.value for s in ARCHIVED_TICKET_STATUSES]))
+
+_MARK_STATE_SQL = text(
+    f"""
+    UPDATE ticket_archive_state
+    SET version = CASE WHEN :moved > 0 THEN nextval('{BOARD_VERSION_SEQ}') ELSE version END,
+        last_run_at = now(),
+        archived_total = archived_total + :moved
+    WHERE id = 1
+    """
+)
+
+
+@dataclass
+class ArchiveResult:
+    batches: int = 0
+    tickets: int = 0
+
+
+def archive_batch(db: Session, *, older_than_hours: int, batch_size: int) -> int:
+    """Archiva un lote (sin commit). Devuelve cuántos tickets movió."""
+    db.execute(text("SELECT set_config('lock_timeout', :v, true)"), {"v": f"{settings.LOCK_TIMEOUT_MS}ms"})
+    moved = int(
+        db.execute(
+            _ARCHIVE_BATCH_SQL,
+            {"older_than_hours": older_than_hours, "batch_size": batch_size},
+        ).scalar_one()
+    )
+    db.execute(_MARK_STATE_SQL, {"moved": moved})
+    if moved:
+        publish_board_change(db)
+    return moved
+
+
+def archive_finished_tickets(
+    db: Session,
+    *,
+    older_than_hours: int | None = None,
+    batch_size: int | None = None,
+    max_batches: int | None = None,
+) -> ArchiveResult:
+    """Archiva lotes hasta que no quede nada viejo (o hasta max_batches). Hace commit por lote."""
+    hours = settings.ARCHIVE_AFTER_HOURS if older_than_hours is None else older_than_hours
+    size = settings.ARCHIVE_BATCH_SIZE if batch_size is None else batch_size
+    res = ArchiveResult()
+    while max_batches is None or res.batches < max_batches:
+        moved = archive_batch(db, older_than_hours=hours, batch_size=size)
+        db.commit()
+        res.batches += 1
+        res.tickets += moved
+        if moved < size:
+            break
+    return res
@@ -0,0 +1,300 @@
+from __future__ import annotations
+
+from dataclasses import dataclass, field
+from typing import Any, Optional, Sequence
+from uuid import UUID
+
+from sqlalchemy import text
+from sqlalchemy.orm import Session
+
+from app.models.ticket import ItemStatus, TicketStatus
+from app.services.audit_service import log_events
+from app.services.cache_invalidation_service import publish_ticket_change
+from app.services.ticket_board_service import refresh_ticket_board
+from app.services.ticket_status_service import run_with_lock_retry, status_from_counts
+from app.services.ticket_version_service import BOARD_VERSION_SEQ
+
+# ==========================================================
+# BATCH DE MUTACIONES (POST /tickets/batch)
+# Las operaciones se resuelven en memoria sobre las filas bloqueadas y se escriben con
+# un UPDATE set-based para items, otro para tickets; la auditoría sale en un INSERT multi-fila.
+# ==========================================================
+
+_COUNTER_BY_STATUS = {
+    ItemStatus.PENDIENTE: "items_pendiente",
+    ItemStatus.EN_PREPARACION: "items_en_preparacion",
+    ItemStatus.ENTREGADO: "items_entregado",
+    ItemStatus.CANCELADO: "items_cancelado",
+}
+
+# Orden fijo de locks (por id) para que dos batches cruzados no hagan deadlock.
+_LOCK_TICKETS_SQL = text(
+    """
+    SELECT id, status, items_pendiente, items_en_preparacion, items_entregado, items_cancelado
+    FROM kitchen_tickets
+    WHERE id = ANY(:ids)
+    ORDER BY id
+    FOR UPDATE
+    """
+)
+
+_LOCK_ITEMS_SQL = text(
+    """
+    SELECT id, ticket_id, status, version, product_name
+    FROM kitchen_ticket_items
+    WHERE id = ANY(:ids) AND ticket_id = ANY(:ticket_ids)
+    ORDER BY id
+    FOR UPDATE
+    """
+)
+
+_UPDATE_ITEMS_SQL = text(
+    f"""
+    UPDATE kitchen_ticket_items i
+    SET status = v.status,
+        prep_started_at = CASE WHEN v.status_changed AND v.status IN ('EN_PREPARACION', 'ENTREGADO')
+                               THEN COALESCE(i.prep_started_at, now()) ELSE i.prep_started_at END,
+        delivered_at = CASE WHEN v.status_changed AND v.status = 'ENTREGADO'
+                            THEN COALESCE(i.delivered_at, now()) ELSE i.delivered_at END,
+        canceled_at = CASE WHEN v.status_changed AND v.status = 'CANCELADO'
+                           THEN COALESCE(i.canceled_at, now()) ELSE i.canceled_at END,
+        change_reason = COALESCE(v.change_reason, i.change_reason),
+        replaced_by = COALESCE(v.replaced_by, i.replaced_by),
+        version = nextval('{BOARD_VERSION_SEQ}'),
+        updated_at = now()
+    FROM unnest(
+      CAST(:ids AS uuid[]),
+      CAST(:statuses AS item_status[]),
+      CAST(:status_changed AS boolean[]),
+      CAST(:change_reasons AS text[]),
+      CAST(:replaced_by AS text[])
+    ) AS v(id, status, status_changed, change_reason, replaced_by)
+    WHERE i.id = v.id
+    RETURNING i.id, i.version
+    """
+)
+
+_UPDATE_TICKETS_SQL = text(
+    f"""
+    UPDATE kitchen_tickets t
+    SET items_pendiente = v.pendiente,
+        items_en_preparacion = v.en_preparacion,
+        items_entregado = v.entregado,
+        items_cancelado = v.cancelado,
+        status = v.status,
+        hora_preparacion = CASE WHEN v.status IN ('EN_PREPARACION', 'PARCIAL')
+                                THEN COALESCE(t.hora_preparacion, now()) ELSE t.hora_preparacion END,
+        hora_entrega = CASE WHEN v.status = 'LISTO'
+                            THEN COALESCE(t.hora_entrega, now()) ELSE t.hora_entrega END,
+        version = nextval('{BOARD_VERSION_SEQ}'),
+        updated_at = now()
+    FROM unnest(
+      CAST(:ids AS uuid[]),
+      CAST(:pendiente AS integer[]),
+      CAST(:en_preparacion AS integer[]),
+      CAST(:entregado AS integer[]),
+      CAST(:cancelado AS integer[]),
+      CAST(:statuses AS ticket_status[])
+    ) AS v(id, pendiente, en_preparacion, entregado, cancelado, status)
+    WHERE t.id = v.id
+    """
+)
+
+
+@dataclass
+class _ItemState:
+    id: UUID
+    ticket_id: UUID
+    status: ItemStatus
+    version: Optional[int]
+    product_name: Optional[str]
+    status_changed: bool = False
+    change_reason: Optional[str] = None
+    replaced_by: Optional[str] = None
+    dirty: bool = False
+
+
+@dataclass
+class _TicketState:
+    id: UUID
+    status: TicketStatus
+    counters: dict[str, int]
+    dirty: bool = False
+
+
+@dataclass
+class BatchResult:
+    results: list[dict[str, Any]] = field(default_factory=list)
+    changed_tickets: int = 0
+    changed_items: int = 0
+
+
+def _result(index: int, status: str, **extra) -> dict[str, Any]:
+    return {"index": index, "status": status, **extra}
+
+
+def apply_batch(db: Session, operations: Sequence[Any], *, user_name: Optional[str]) -> BatchResult:
+    """
+    Aplica operaciones {op: status|cancel|replace, ticket_id, item_id, ...} en orden,
+    dentro de la transacción actual. Cada operación tiene su resultado:
+    ok / noop / not_found / stale. No hace commit.
+    """
+    ticket_ids = sorted({op.ticket_id for op in operations}, key=str)
+    item_ids = sorted({op.item_id for op in operations}, key=str)
+
+    def _lock():
+        t_rows = db.execute(_LOCK_TICKETS_SQL, {"ids": ticket_ids}).all()
+        i_rows = db.execute(_LOCK_ITEMS_SQL, {"ids": item_ids, "ticket_ids": ticket_ids}).all()
+        return t_rows, i_rows
+
+    ticket_rows, item_rows = run_with_lock_retry(db, ticket_ids[0], _lock)
+
+    tickets = {
+        r.id: _TicketState(
+            id=r.id,
+            status=TicketStatus(r.status),
+            counters={c: getattr(r, c) for c in _COUNTER_BY_STATUS.values()},
+        )
+        for r in ticket_rows
+    }
+    items = {
+        r.id: _ItemState(
+            id=r.id,
+            ticket_id=r.ticket_id,
+            status=ItemStatus(r.status),
+            version=r.version,
+            product_name=r.product_name,
+        )
+        for r in item_rows
+    }
+
+    out = BatchResult()
+    events: list[dict[str, Any]] = []
+
+    for index, op in enumerate(operations):
+        ticket = tickets.get(op.ticket_id)
+        item = items.get(op.item_id)
+        if ticket is None or item is None or item.ticket_id != op.ticket_id:
+            out.results.append(_result(index, "not_found"))
+            continue
+        if op.expected_version is not None and item.version != op.expected_version:
+            out.results.append(_result(index, "stale"))
+            continue
+
+        if op.op == "replace":
+            old_name = item.product_name
+            item.replaced_by = op.new_product_name
+            item.change_reason = op.reason
+            events.append(
+                {
+                    "ticket_id": ticket.id,
+                    "item_id": item.id,
+                    "event_type": "ITEM_REPLACE",
+                    "message": f"Item cambiado: {old_name} → {op.new_product_name}. Motivo: {op.reason}",
+                    "meta": {"from": old_name, "to": op.new_product_name, "reason": op.reason, "item_id": str(item.id)},
+                    "user_name": user_name,
+                }
+            )
+        else:
+            new_status = ItemStatus.CANCELADO if op.op == "cancel" else op.status
+            old_status = item.status
+            if old_status == new_status and op.op == "status":
+                out.results.append(_result(index, "noop"))
+                continue
+
+            if old_status != new_status:
+                ticket.counters[_COUNTER_BY_STATUS[old_status]] -= 1
+                ticket.counters[_COUNTER_BY_STATUS[new_status]] += 1
+                item.status = new_status
+                item.status_changed = True
+
+            if op.op == "cancel":
+                item.change_reason = op.reason
+                message = f"Item cancelado ({item.product_name}). Motivo: {op.reason}"
+                meta = {"reason": op.reason, "item_id": str(item.id)}
+            else:
+                message = f"Item estado: {old_status.value} → {new_status.value} ({item.product_name})"
+                meta = {"from": old_status.value, "to": new_status.value, "item_id": str(item.id)}
+
+            events.append(
+                {
+                    "ticket_id": ticket.id,
+                    "item_id": item.id,
+                    "event_type": "ITEM_CANCEL" if op.op == "cancel" else "ITEM_STATUS",
+                    "message": message,
+                    "meta": meta,
+                    "user_name": user_name,
+                }
+            )
+
+        item.dirty = True
+        item.version = None  # la nueva versión la asigna el UPDATE
+        ticket.dirty = True
+        out.results.append(_result(index, "ok"))
+
+    dirty_items = [i for i in items.values() if i.dirty]
+    dirty_tickets = [t for t in tickets.values() if t.dirty]
+    if not dirty_items:
+        return out
+
+    new_versions = dict(
+        db.execute(
+            _UPDATE_ITEMS_SQL,
+            {
+                "ids": [i.id for i in dirty_items],
+                "statuses": [i.status.value for i in dirty_items],
+                "status_changed": [i.status_changed for i in dirty_items],
+                "change_reasons": [i.change_reason for i in dirty_items],
+                "replaced_by": [i.replaced_by for i in dirty_items],
+            },
+        ).all()
+    )
+
+    # Estado de cada ticket una sola vez, con los contadores finales
+    changed_statuses: dict[UUID, tuple] = {}
+    for t in dirty_tickets:
+        c = t.counters
+        new_status = status_from_counts(
+            c["items_pendiente"], c["items_en_preparacion"], c["items_entregado"], c["items_cancelado"]
+        )
+        if new_status != t.status:
+            changed_statuses[t.id] = (t.status, new_status)
+            events.append(
+                {
+                    "ticket_id": t.id,
+                    "item_id": None,
+                    "event_type": "TICKET_STATUS",
+                    "message": f"Ticket estado: {t.status.value} → {new_status.value}",
+                    "meta": {"from": t.status.value, "to": new_status.value},
+                    "user_name": user_name,
+                }
+            )
+            t.status = new_status
+
+    db.execute(
+        _UPDATE_TICKETS_SQL,
+        {
+            "ids": [t.id for t in dirty_tickets],
+            "pendiente": [t.counters["items_pendiente"] for t in dirty_tickets],
+            "en_preparacion": [t.counters["items_en_preparacion"] for t in dirty_tickets],
+            "entregado": [t.counters["items_entregado"] for t in dirty_tickets],
+            "cancelado": [t.counters["items_cancelado"] for t in dirty_tickets],
+            "statuses": [t.status.value for t in dirty_tickets],
+        },
+    )
+
+    # Se escriben todos juntos (INSERT multi-fila) al hacer commit
+    log_events(db, events)
+
+    for r in out.results:
+        if r["status"] == "ok":
+            op = operations[r["index"]]
+            r["item_version"] = new_versions.get(op.item_id)
+
+    refresh_ticket_board(db, [t.id for t in dirty_tickets])
+    for t in dirty_tickets:
+        publish_ticket_change(db, t.id, changed_statuses.get(t.id, ()))
+
+    out.changed_tickets = len(dirty_tickets)
+    out.changed_items = len(dirty_items)
+    return out
@@ -0,0 +1,209 @@
+from __future__ import annotations
+
+from typing import Iterable
+from uuid import UUID
+
+from sqlalchemy import bindparam, text
+from sqlalchemy.orm import Session
+
+from app.models.ticket import ACTIVE_TICKET_STATUSES, TicketStatus
+
+TICKET_FIELDS = ("id", "comanda_number", "pos_consec_docto", "mesa_ref", "mesero_nombre",
+                 "status", "hora_pedido", "hora_preparacion", "hora_entrega", "items")
+ITEM_FIELDS = ("id", "qty", "product_name", "unidad", "status")
+
+_ACTIVE = [s.value for s in ACTIVE_TICKET_STATUSES]
+
+# ==========================================================
+# PROYECCIÓN ticket_board (sql/005_ticket_board_projection.sql)
+# Fila por ticket activo con items ya en formato compacto y conteos por estado.
+# ==========================================================
+
+# Fuente de la proyección: tickets + items agregados. {where} filtra los tickets.
+_SOURCE_SQL = """
+    SELECT
+      t.id AS ticket_id, t.comanda_number, t.pos_consec_docto, t.mesa_ref, t.mesero_nombre,
+      t.status, t.hora_pedido, t.hora_preparacion, t.hora_entrega,
+      it.items, it.items_pendiente, it.items_en_preparacion, it.items_entregado, it.items_cancelado,
+      t.version
+    FROM kitchen_tickets t
+    CROSS JOIN LATERAL (
+      SELECT
+        COALESCE(jsonb_agg(
+            jsonb_build_array(
+              i.id, i.qty, i.product_name, i.unidad,
+              array_position(enum_range(NULL::item_status), i.status) - 1
+            )
+            ORDER BY i.created_at, i.id
+          ), '[]'::jsonb) AS items,
+        count(*) FILTER (WHERE i.status = 'PENDIENTE') AS items_pendiente,
+        count(*) FILTER (WHERE i.status = 'EN_PREPARACION') AS items_en_preparacion,
+        count(*) FILTER (WHERE i.status = 'ENTREGADO') AS items_entregado,
+        count(*) FILTER (WHERE i.status = 'CANCELADO') AS items_cancelado
+      FROM kitchen_ticket_items i
+      WHERE i.ticket_id = t.id
+    ) it
+    WHERE {where}
+"""
+
+_PROJECTION_COLUMNS = (
+    "ticket_id, comanda_number, pos_consec_docto, mesa_ref, mesero_nombre, status, hora_pedido, "
+    "hora_preparacion, hora_entrega, items, items_pendiente, items_en_preparacion, items_entregado, "
+    "items_cancelado, version"
+)
+
+_UPSERT_SET = ", ".join(
+    f"{c} = EXCLUDED.{c}" for c in _PROJECTION_COLUMNS.replace(" ", "").split(",") if c != "ticket_id"
+)
+
+# Set-based: un solo statement por transacción, sin importar cuántos tickets cambiaron.
+# Los que dejaron de estar activos (o ya no existen) salen de la proyección.
+_REFRESH_SQL = text(
+    f"""
+    WITH src AS ({_SOURCE_SQL.format(where="t.id = ANY(:ids)")}),
+    gone AS (
+      DELETE FROM ticket_board b
+      WHERE b.ticket_id = ANY(:ids)
+        AND NOT EXISTS (
+          SELECT 1 FROM src
+          WHERE src.ticket_id = b.ticket_id AND src.status = ANY(CAST(:statuses AS ticket_status[]))
+        )
+    )
+    INSERT INTO ticket_board ({_PROJECTION_COLUMNS})
+    SELECT {_PROJECTION_COLUMNS} FROM src
+    WHERE src.status = ANY(CAST(:statuses AS ticket_status[]))
+    ON CONFLICT (ticket_id) DO UPDATE SET {_UPSERT_SET}, refreshed_at = now()
+    """
+).bindparams(bindparam("statuses", value=_ACTIVE))
+
+_REBUILD_SQL = text(
+    f"""
+    INSERT INTO ticket_board ({_PROJECTION_COLUMNS})
+    SELECT {_PROJECTION_COLUMNS} FROM ({_SOURCE_SQL.format(where="t.status = ANY(CAST(:statuses AS ticket_status[]))")}) src
+    """
+).bindparams(bindparam("statuses", value=_ACTIVE))
+
+
+def refresh_ticket_board(db: Session, ticket_ids: Iterable[UUID]) -> None:
+    """
+    Recalcula las filas de la proyección para esos tickets dentro de la transacción
+    actual. Llamar antes del commit, después de aplicar los cambios.
+    """
+    ids = list({tid for tid in ticket_ids if tid is not None})
+    if not ids:
+        return
+    db.flush()  # SessionLocal usa autoflush=False
+    db.execute(_REFRESH_SQL, {"ids": ids})
+
+
+def rebuild_ticket_board(db: Session) -> int:
+    """Regenera toda la proyección desde kitchen_tickets / kitchen_ticket_items."""
+    db.flush()
+    db.execute(text("DELETE FROM ticket_board"))
+    return db.execute(_REBUILD_SQL).rowcount
+
+
+# Postgres arma el JSON completo: una sola ida a la DB y cero serialización en Python.
+# `status` va como índice dentro de ticket_status / item_status (orden del enum en DB).
+# Lee solo la proyección: un scan por ix_ticket_board_hora_pedido, sin joins.
+_BOARD_SQL = text(
+    """
+    SELECT json_build_object(
+      'ticket_status', to_json(enum_range(NULL::ticket_status)),
+      'item_status', to_json(enum_range(NULL::item_status)),
+      'ticket_fields', to_json(CAST(:ticket_fields AS text[])),
+      'item_fields', to_json(CAST(:item_fields AS text[])),
+      'tickets', COALESCE(json_agg(
+          json_build_array(
+            b.ticket_id, b.comanda_number, b.pos_consec_docto, b.mesa_ref, b.mesero_nombre,
+            array_position(enum_range(NULL::ticket_status), b.status) - 1,
+            b.hora_pedido, b.hora_preparacion, b.hora_entrega, b.items
+          )
+          ORDER BY b.hora_pedido, b.ticket_id
+        ), '[]'::json)
+    )::text
+    FROM ticket_board b
+    """
+).bindparams(
+    bindparam("ticket_fields", value=list(TICKET_FIELDS)),
+    bindparam("item_fields", value=list(ITEM_FIELDS)),
+)
+
+
+def board_json(db: Session) -> bytes:
+    """Tickets activos con sus items, en formato compacto (ver TICKET_FIELDS / ITEM_FIELDS)."""
+    return db.execute(_BOARD_SQL).scalar_one().encode("utf-8")
+
+
+MESA_TICKET_FIELDS = ("id", "comanda_number", "pos_consec_docto", "mesero_nombre", "status", "hora_pedido")
+
+# Despacho por mesa: un GROUP BY sobre la proyección (ix_ticket_board_mesa_status) con
+# los conteos de items que ya trae cada fila; sin items, solo referencias a los tickets.
+_BY_MESA_SQL = text(
+    """
+    SELECT json_build_object(
+      'ticket_fields', to_json(CAST(:ticket_fields AS text[])),
+      'mesas', COALESCE(json_agg(m ORDER BY m.oldest_hora_pedido, m.mesa_ref), '[]'::json)
+    )::text
+    FROM (
+      SELECT
+        b.mesa_ref,
+        count(*) AS open_tickets,
+        count(*) FILTER (WHERE b.status = 'PENDIENTE') AS tickets_pendiente,
+        count(*) FILTER (WHERE b.status = 'EN_PREPARACION') AS tickets_en_preparacion,
+        count(*) FILTER (WHERE b.status = 'PARCIAL') AS tickets_parcial,
+        count(*) FILTER (WHERE b.status = 'LISTO') AS tickets_listo,
+        sum(b.items_pendiente) AS items_pendiente,
+        sum(b.items_en_preparacion) AS items_en_preparacion,
+        sum(b.items_entregado) AS items_entregado,
+        min(b.hora_pedido) AS oldest_hora_pedido,
+        (array_agg(b.mesero_nombre ORDER BY b.hora_pedido, b.ticket_id))[1] AS oldest_mesero_nombre,
+        json_agg(
+          json_build_array(b.ticket_id, b.comanda_number, b.pos_consec_docto, b.mesero_nombre, b.status, b.hora_pedido)
+          ORDER BY b.hora_pedido, b.ticket_id
+        ) AS tickets
+      FROM ticket_board b
+      WHERE CAST(:mesa AS text) IS NULL OR b.mesa_ref = CAST(:mesa AS text)
+      GROUP BY b.mesa_ref
+    ) m
+    """
+).bindparams(bindparam("ticket_fields", value=list(MESA_TICKET_FIELDS)))
+
+
+def by_mesa_json(db: Session, mesa: str | None = None) -> bytes:
+    """Tickets activos agrupados por mesa: conteos, pedido más viejo y tickets (ver MESA_TICKET_FIELDS)."""
+    return db.execute(_BY_MESA_SQL, {"mesa": mesa}).scalar_one().encode("utf-8")
+
+# Lo que todavía no sale de cocina: cuenta para la edad del pedido más viejo
+_UNFINISHED = {s.value for s in (TicketStatus.PENDIENTE, TicketStatus.EN_PREPARACION, TicketStatus.PARCIAL)}
+
+# /tickets/stats cuenta la proyección al leer: un GROUP BY sobre
+# ix_ticket_board_status_hora_pedido (index-only scan de los tickets activos, que
+# también da el más viejo por estado). Sin contadores que escribir, ninguna escritura
+# del tablero espera a otra por ellos.
+_STATS_SQL = text(
+    """
+    SELECT s.status::text AS status, count(b.ticket_id) AS tickets, min(b.hora_pedido) AS oldest_hora_pedido,
+           now() AS as_of
+    FROM unnest(CAST(:statuses AS ticket_status[])) AS s(status)
+    LEFT JOIN ticket_board b ON b.status = s.status
+    GROUP BY s.status
+    ORDER BY s.status
+    """
+).bindparams(bindparam("statuses", value=_ACTIVE))
+
+
+def board_stats(db: Session) -> dict:
+    """Conteos del tablero por estado y antigüedad del pedido pendiente más viejo."""
+    rows = db.execute(_STATS_SQL).all()
+    as_of = rows[0].as_of if rows else None
+    pending = [r.oldest_hora_pedido for r in rows if r.status in _UNFINISHED and r.oldest_hora_pedido]
+    oldest = min(pending) if pending else None
+    return {
+        "as_of": as_of,
+        "total": sum(r.tickets for r in rows),
+        "by_status": {r.status: r.tickets for r in rows},
+        "oldest_by_status": {r.status: r.oldest_hora_pedido for r in rows},
+        "oldest_pending_at": oldest,
+        "oldest_pending_age_s": max(0, int((as_of - oldest).total_seconds())) if oldest else None,
+    }
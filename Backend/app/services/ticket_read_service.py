@@ -0,0 +1,217 @@
+from __future__ import annotations
+
+from datetime import datetime
+from typing import Optional, Sequence
+from uuid import UUID
+
+from sqlalchemy import select, tuple_
+from sqlalchemy.orm import Session
+
+from app.core.keyset import Cursor, apply_keyset, finish_keyset
+from app.models.sync_run import SyncRun
+from app.models.ticket import KitchenTicket, KitchenTicketItem, TicketStatus
+from app.models.ticket_archive import ARCHIVED_TICKET_STATUSES, TicketAll, TicketEventAll, TicketItemAll
+from app.models.ticket_event import TicketEvent
+from app.services.ticket_search_service import search_condition, search_ranking
+
+# ==========================================================
+# READ MODELS
+# Filas livianas para endpoints de lectura: solo las columnas que se muestran,
+# sin identity map ni relaciones. Los items se cargan solo si el endpoint los pide.
+# Historial: lo que puede estar archivado (LISTO/CANCELADO, detalle, eventos) se lee
+# de TicketAll / TicketItemAll / TicketEventAll (caliente + archivo).
+# ==========================================================
+
+CARD_COLUMNS = (
+    KitchenTicket.id,
+    KitchenTicket.mesa_ref,
+    KitchenTicket.mesero_nombre,
+    KitchenTicket.pos_consec_docto,
+    KitchenTicket.comanda_number,
+    KitchenTicket.status,
+    KitchenTicket.hora_pedido,
+    KitchenTicket.hora_preparacion,
+    KitchenTicket.hora_entrega,
+    KitchenTicket.version,
+)
+
+ITEM_COLUMNS = (
+    KitchenTicketItem.ticket_id,
+    KitchenTicketItem.id,
+    KitchenTicketItem.qty,
+    KitchenTicketItem.product_name,
+    KitchenTicketItem.unidad,
+    KitchenTicketItem.status,
+    KitchenTicketItem.version,
+)
+
+
+class TicketRow:
+    __slots__ = tuple(c.key for c in CARD_COLUMNS) + ("items",)
+
+    def __init__(self, row, items: Optional[list["ItemRow"]] = None):
+        for c in CARD_COLUMNS:
+            setattr(self, c.key, getattr(row, c.key))
+        self.items = items if items is not None else []
+
+
+class ItemRow:
+    __slots__ = tuple(c.key for c in ITEM_COLUMNS)
+
+    def __init__(self, row):
+        for c in ITEM_COLUMNS:
+            setattr(self, c.key, getattr(row, c.key))
+
+
+def _columns(entity, columns) -> tuple:
+    return tuple(getattr(entity, c.key) for c in columns)
+
+
+def _attach_items(db: Session, tickets: list[TicketRow], it=KitchenTicketItem) -> None:
+    if not tickets:
+        return
+    by_id = {t.id: t for t in tickets}
+    rows = db.execute(
+        select(*_columns(it, ITEM_COLUMNS))
+        .where(it.ticket_id.in_(list(by_id)))
+        .order_by(it.created_at, it.id)
+    ).all()
+    for r in rows:
+        by_id[r.ticket_id].items.append(ItemRow(r))
+
+
+def list_ticket_cards(
+    db: Session,
+    *,
+    status: Optional[TicketStatus],
+    q: Optional[str],
+    limit: int,
+    cursor: Optional[Cursor],
+    with_items: bool = False,
+) -> tuple[list[TicketRow], dict[str, str]]:
+    """Listado de tarjetas. Devuelve (filas, headers de paginación)."""
+    # Estados que nunca se archivan: solo la tabla caliente
+    hot_only = status is not None and status not in ARCHIVED_TICKET_STATUSES
+    t = KitchenTicket if hot_only else TicketAll
+
+    stmt = select(*_columns(t, CARD_COLUMNS))
+    if status:
+        stmt = stmt.where(t.status == status)
+
+    ranking = None
+    if q and q.strip():
+        stmt = stmt.where(search_condition(q, t))
+        ranking = search_ranking(q, t)
+
+    if ranking is not None:
+        rows = db.execute(stmt.order_by(*ranking).limit(limit)).all()
+        headers: dict[str, str] = {}
+    else:
+        stmt = apply_keyset(stmt, ts_col=t.hora_pedido, id_col=t.id, limit=limit, cursor=cursor)
+        rows, headers = finish_keyset(db.execute(stmt).all(), ts_attr="hora_pedido", limit=limit, cursor=cursor)
+
+    tickets = [TicketRow(r) for r in rows]
+    if with_items:
+        _attach_items(db, tickets, KitchenTicketItem if hot_only else TicketItemAll)
+    return tickets, headers
+
+
+def get_ticket_row(db: Session, ticket_id: UUID, *, with_items: bool = True) -> Optional[TicketRow]:
+    it = KitchenTicketItem
+    row = db.execute(select(*CARD_COLUMNS).where(KitchenTicket.id == ticket_id)).first()
+    if row is None:
+        # Ticket archivado
+        row = db.execute(select(*_columns(TicketAll, CARD_COLUMNS)).where(TicketAll.id == ticket_id)).first()
+        it = TicketItemAll
+    if row is None:
+        return None
+    ticket = TicketRow(row)
+    if with_items:
+        _attach_items(db, [ticket], it)
+    return ticket
+
+
+def get_ticket_rows(db: Session, ticket_ids: Sequence[UUID]) -> dict[UUID, TicketRow]:
+    """Varios tickets con items (calientes o archivados), por id."""
+    if not ticket_ids:
+        return {}
+    rows = db.execute(select(*_columns(TicketAll, CARD_COLUMNS)).where(TicketAll.id.in_(list(ticket_ids)))).all()
+    tickets = [TicketRow(r) for r in rows]
+    _attach_items(db, tickets, TicketItemAll)
+    return {t.id: t for t in tickets}
+
+
+EVENT_COLUMNS = (
+    TicketEvent.id,
+    TicketEvent.ticket_id,
+    TicketEvent.item_id,
+    TicketEvent.event_type,
+    TicketEvent.message,
+    TicketEvent.meta,
+    TicketEvent.user_name,
+    TicketEvent.created_at,
+)
+
+
+def list_ticket_event_rows(
+    db: Session,
+    ticket_id: UUID,
+    *,
+    since_ts: Optional[datetime] = None,
+    since_id: Optional[UUID] = None,
+):
+    """
+    Línea de tiempo en orden (created_at, id) por ix_ticket_events_ticket_created.
+    since_id: solo lo posterior a ese evento (si no existe, todo). since_ts: desde ese
+    instante inclusive; el cliente deduplica por id.
+    """
+    e = TicketEventAll
+    stmt = select(*_columns(e, EVENT_COLUMNS)).where(e.ticket_id == ticket_id)
+    if since_id is not None:
+        anchor = db.execute(
+            select(e.created_at).where(e.ticket_id == ticket_id, e.id == since_id)
+        ).scalar_one_or_none()
+        if anchor is not None:
+            stmt = stmt.where(tuple_(e.created_at, e.id) > tuple_(anchor, since_id))
+    if since_ts is not None:
+        stmt = stmt.where(e.created_at >= since_ts)
+    return db.execute(stmt.order_by(e.created_at.asc(), e.id.asc())).all()
+
+
+def search_event_rows(
+    db: Session,
+    *,
+    event_types: Optional[Sequence[str]],
+    user_name: Optional[str],
+    ticket_id: Optional[UUID],
+    from_ts: Optional[datetime],
+    to_ts: Optional[datetime],
+    limit: int,
+    cursor: Optional[Cursor],
+):
+    """Auditoría entre tickets, más reciente primero. Devuelve (filas, headers de paginación)."""
+    e = TicketEventAll
+    stmt = select(*_columns(e, EVENT_COLUMNS))
+    if event_types:
+        stmt = stmt.where(e.event_type.in_(event_types))
+    if user_name:
+        stmt = stmt.where(e.user_name == user_name)
+    if ticket_id is not None:
+        stmt = stmt.where(e.ticket_id == ticket_id)
+    if from_ts is not None:
+        stmt = stmt.where(e.created_at >= from_ts)
+    if to_ts is not None:
+        stmt = stmt.where(e.created_at < to_ts)
+
+    stmt = apply_keyset(stmt, ts_col=e.created_at, id_col=e.id, limit=limit, cursor=cursor)
+    return finish_keyset(db.execute(stmt).all(), ts_attr="created_at", limit=limit, cursor=cursor)
+
+
+def list_sync_run_rows(db: Session, *, source: str, limit: int):
+    # Filas de columnas (Row), no objetos SyncRun: sin identity map ni tracking.
+    return db.execute(
+        select(*SyncRun.__table__.columns)
+        .where(SyncRun.source == source)
+        .order_by(SyncRun.started_at.desc())
+        .limit(limit)
+    ).all()
@@ -0,0 +1,63 @@
+from __future__ import annotations
+
+from sqlalchemy import case, func, or_
+
+from app.models.ticket import KitchenTicket
+
+
+def _escape_like(term: str) -> str:
+    return term.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
+
+
+def is_numeric_query(q: str) -> bool:
+    return q.strip().isdigit()
+
+
+def mesa_prefix_condition(term: str, t=KitchenTicket):
+    # Usa ix_kitchen_tickets_mesa_prefix (lower(mesa_ref) text_pattern_ops).
+    return func.lower(t.mesa_ref).like(_escape_like(term.lower()) + "%", escape="\\")
+
+
+def search_condition(q: str, t=KitchenTicket):
+    """
+    Dos caminos de búsqueda (ver sql/002_ticket_search_indexes.sql):
+
+    - Numérico: igualdad exacta en #comanda / #pedido (btree) + prefijo de mesa.
+    - Texto: ILIKE sobre mesa/mesero/notas respaldado por índices GIN pg_trgm.
+
+    `t`: KitchenTicket o TicketAll (caliente + archivo, app/models/ticket_archive.py).
+    """
+    term = q.strip()
+
+    if is_numeric_query(term):
+        n = int(term)
+        return or_(
+            t.comanda_number == n,
+            t.pos_consec_docto == n,
+            mesa_prefix_condition(term, t),
+        )
+
+    pattern = f"%{_escape_like(term)}%"
+    return or_(
+        t.mesa_ref.ilike(pattern, escape="\\"),
+        t.mesero_nombre.ilike(pattern, escape="\\"),
+        t.notas.ilike(pattern, escape="\\"),
+    )
+
+
+def search_ranking(q: str, t=KitchenTicket) -> list | None:
+    """
+    Orden por relevancia para búsquedas de texto (prefijo de mesa, luego similitud).
+    None para búsquedas numéricas: esas usan el orden cronológico normal.
+    """
+    term = q.strip()
+    if is_numeric_query(term):
+        return None
+
+    mesa_first = case((mesa_prefix_condition(term, t), 1), else_=0)
+    score = func.greatest(
+        func.similarity(func.coalesce(t.mesa_ref, ""), term),
+        func.similarity(func.coalesce(t.mesero_nombre, ""), term),
+        func.word_similarity(term, func.coalesce(t.notas, "")),
+    )
+    return [mesa_first.desc(), score.desc(), t.hora_pedido.desc(), t.id.desc()]
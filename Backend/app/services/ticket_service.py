@@ -4,14 +4,16 @@ from datetime import datetime, timezone
 from sqlalchemy.orm import Session
 
 from app.models.ticket import (
-    KitchenTicket,
     KitchenTicketItem,
-    TicketStatus,
     ItemStatus,
     AuditEventType,
 )
 
-from app.models.ticket_event import TicketEvent
+from app.services.audit_service import log_event
+from app.services.cache_invalidation_service import publish_ticket_change
+from app.services.ticket_board_service import refresh_ticket_board
+from app.services.ticket_status_service import apply_item_status
+from app.services.ticket_version_service import touch_item, touch_ticket
 
 
 def _now():
@@ -19,34 +21,7 @@ def _now():
 
 
 # ==========================================================
-# STATUS LOGIC
-# ==========================================================
-
-def compute_ticket_status(items: list[KitchenTicketItem]) -> TicketStatus:
-    if not items:
-        return TicketStatus.PENDIENTE
-
-    statuses = [i.status for i in items]
-
-    if all(s == ItemStatus.CANCELADO for s in statuses):
-        return TicketStatus.CANCELADO
-
-    if all(s in (ItemStatus.ENTREGADO, ItemStatus.CANCELADO) for s in statuses):
-        return TicketStatus.LISTO
-
-    if any(s == ItemStatus.ENTREGADO for s in statuses) and any(
-        s in (ItemStatus.PENDIENTE, ItemStatus.EN_PREPARACION) for s in statuses
-    ):
-        return TicketStatus.PARCIAL
-
-    if any(s == ItemStatus.EN_PREPARACION for s in statuses):
-        return TicketStatus.EN_PREPARACION
-
-    return TicketStatus.PENDIENTE
-
-
-# ==========================================================
-# AUDIT (usa ticket_events ✅)
+# AUDIT (usa ticket_events ✅, ver app/services/audit_service.py)
 # ==========================================================
 
 def log_ticket_event(
@@ -59,7 +34,8 @@ def log_ticket_event(
     user_name: str | None,
     meta: dict | None = None,
 ):
-    ev = TicketEvent(
+    log_event(
+        db,
         ticket_id=ticket_id,
         item_id=item_id,
         event_type=event_type,
@@ -67,7 +43,6 @@ def log_ticket_event(
         meta=meta,
         user_name=user_name,
     )
-    db.add(ev)
 
 
 # ==========================================================
@@ -83,76 +58,18 @@ def update_item_status(
     user_id: str | None,
     user_name: str,
 ) -> KitchenTicketItem:
-
-    ticket = db.query(KitchenTicket).filter(KitchenTicket.id == ticket_id).first()
-    if not ticket:
+    # Contadores + estado del ticket + auditoría en un solo statement
+    res = apply_item_status(db, ticket_id=ticket_id, item_id=item_id, status=new_status, user_name=user_name)
+    if not res.ticket_found:
         raise ValueError("Ticket no encontrado")
-
-    item = (
-        db.query(KitchenTicketItem)
-        .filter(KitchenTicketItem.id == item_id, KitchenTicketItem.ticket_id == ticket_id)
-        .first()
-    )
-    if not item:
+    if not res.matched_items:
         raise ValueError("Item no encontrado")
 
-    old_status = item.status
-    if old_status == new_status:
-        return item
-
-    now = _now()
-
-    if new_status == ItemStatus.EN_PREPARACION and item.prep_started_at is None:
-        item.prep_started_at = now
-
-    if new_status == ItemStatus.ENTREGADO and item.delivered_at is None:
-        item.delivered_at = now
-
-    if new_status == ItemStatus.CANCELADO and item.canceled_at is None:
-        item.canceled_at = now
-
-    item.status = new_status
-
-    # Auditoría (ticket_events)
-    log_ticket_event(
-        db,
-        ticket_id=str(ticket_id),
-        item_id=str(item.id),
-        event_type=AuditEventType.ITEM_STATUS.value,
-        message=f"Item estado: {old_status.value} → {new_status.value} ({item.product_name})",
-        user_name=user_name,
-        meta={"from": old_status.value, "to": new_status.value, "item_id": str(item.id)},
-    )
-
-    db.flush()
-
-    items = db.query(KitchenTicketItem).filter(KitchenTicketItem.ticket_id == ticket_id).all()
-    new_ticket_status = compute_ticket_status(items)
-
-    # Horas del ticket
-    if new_ticket_status in (TicketStatus.EN_PREPARACION, TicketStatus.PARCIAL) and ticket.hora_preparacion is None:
-        ticket.hora_preparacion = now
-
-    if new_ticket_status == TicketStatus.LISTO and ticket.hora_entrega is None:
-        ticket.hora_entrega = now
-
-    if ticket.status != new_ticket_status:
-        old = ticket.status
-        ticket.status = new_ticket_status
-
-        log_ticket_event(
-            db,
-            ticket_id=str(ticket_id),
-            item_id=None,
-            event_type=AuditEventType.TICKET_STATUS.value,
-            message=f"Ticket estado: {old.value} → {new_ticket_status.value}",
-            user_name=user_name,
-            meta={"from": old.value, "to": new_ticket_status.value},
-        )
-
+    if res.changed_items:
+        refresh_ticket_board(db, [ticket_id])
+        publish_ticket_change(db, ticket_id, res.changed_statuses)
     db.commit()
-    db.refresh(item)
-    return item
+    return db.get(KitchenTicketItem, item_id)
 
 
 # ==========================================================
@@ -168,56 +85,20 @@ def cancel_item(
     user_id: str | None,
     user_name: str,
 ):
-    ticket = db.query(KitchenTicket).filter(KitchenTicket.id == ticket_id).first()
-    if not ticket:
-        raise ValueError("Ticket no encontrado")
-
-    item = (
-        db.query(KitchenTicketItem)
-        .filter(KitchenTicketItem.id == item_id, KitchenTicketItem.ticket_id == ticket_id)
-        .first()
-    )
-    if not item:
-        raise ValueError("Item no encontrado")
-
-    old_status = item.status
-    now = _now()
-
-    item.status = ItemStatus.CANCELADO
-    item.canceled_at = item.canceled_at or now
-    item.change_reason = reason
-
-    log_ticket_event(
+    res = apply_item_status(
         db,
-        ticket_id=str(ticket_id),
-        item_id=str(item.id),
-        event_type=AuditEventType.ITEM_CANCEL.value,
-        message=f"Item cancelado ({item.product_name}). Motivo: {reason}",
+        ticket_id=ticket_id,
+        item_id=item_id,
+        status=ItemStatus.CANCELADO,
+        reason=reason,
         user_name=user_name,
-        meta={"reason": reason, "item_id": str(item.id)},
+        event_type=AuditEventType.ITEM_CANCEL.value,
     )
+    if not res.ticket_found or not res.matched_items:
+        raise ValueError("Item no encontrado")
 
-    db.flush()
-
-    items = db.query(KitchenTicketItem).filter(KitchenTicketItem.ticket_id == ticket_id).all()
-    new_ticket_status = compute_ticket_status(items)
-
-    if ticket.status != new_ticket_status:
-        old = ticket.status
-        ticket.status = new_ticket_status
-        if new_ticket_status == TicketStatus.LISTO and ticket.hora_entrega is None:
-            ticket.hora_entrega = now
-
-        log_ticket_event(
-            db,
-            ticket_id=str(ticket_id),
-            item_id=None,
-            event_type=AuditEventType.TICKET_STATUS.value,
-            message=f"Ticket estado: {old.value} → {new_ticket_status.value}",
-            user_name=user_name,
-            meta={"from": old.value, "to": new_ticket_status.value},
-        )
-
+    refresh_ticket_board(db, [ticket_id])
+    publish_ticket_change(db, ticket_id, res.changed_statuses)
     db.commit()
 
 
@@ -246,6 +127,8 @@ def replace_item(
     old_name = item.product_name
     item.replaced_by = new_product_name
     item.change_reason = reason
+    touch_item(item)
+    touch_ticket(item.ticket)
 
     log_ticket_event(
         db,
@@ -257,6 +140,9 @@ def replace_item(
         meta={"from": old_name, "to": new_product_name, "reason": reason, "item_id": str(item.id)},
     )
 
+    refresh_ticket_board(db, [item.ticket_id])
+
+    publish_ticket_change(db, item.ticket_id)
     db.commit()
 
 
@@ -0,0 +1,338 @@
+from __future__ import annotations
+
+import random
+import time
+from dataclasses import dataclass
+from typing import Callable, Iterable, Optional, TypeVar
+from uuid import UUID
+
+from sqlalchemy import text
+from sqlalchemy.exc import OperationalError
+from sqlalchemy.orm import Session, selectinload
+
+from app.core.config import settings
+from app.models.ticket import ItemStatus, KitchenTicket, TicketStatus
+from app.services.ticket_version_service import BOARD_VERSION_SEQ
+
+T = TypeVar("T")
+
+# ==========================================================
+# ESTADO DEL TICKET POR CONTADORES
+# kitchen_tickets.items_* (sql/006_ticket_item_counters.sql) lleva cuántos items hay
+# en cada estado; el estado del ticket se calcula con esos 4 números.
+# ==========================================================
+
+
+def status_from_counts(pendiente: int, en_preparacion: int, entregado: int, cancelado: int) -> TicketStatus:
+    """Misma regla que la función SQL ticket_status_from_counts()."""
+    if pendiente + en_preparacion + entregado + cancelado == 0:
+        return TicketStatus.PENDIENTE
+    if pendiente + en_preparacion + entregado == 0:
+        return TicketStatus.CANCELADO
+    if pendiente + en_preparacion == 0:
+        return TicketStatus.LISTO
+    if entregado > 0:
+        return TicketStatus.PARCIAL
+    if en_preparacion > 0:
+        return TicketStatus.EN_PREPARACION
+    return TicketStatus.PENDIENTE
+
+
+@dataclass
+class ItemTransition:
+    ticket_found: bool
+    matched_items: int
+    changed_items: int
+    stale_items: int = 0
+    old_ticket_status: Optional[TicketStatus] = None
+    new_ticket_status: Optional[TicketStatus] = None
+
+    @property
+    def changed_statuses(self) -> tuple:
+        """Estados (viejo, nuevo) del ticket si cambió; para publish_ticket_change."""
+        if self.old_ticket_status is None or self.old_ticket_status == self.new_ticket_status:
+            return ()
+        return (self.old_ticket_status, self.new_ticket_status)
+
+
+# Plantillas de format(): %1$s estado anterior, %2$s nuevo, %3$s producto, %4$s motivo
+_ITEM_MESSAGES = {
+    "ITEM_STATUS": "Item estado: %1$s → %2$s (%3$s)",
+    "ITEM_CANCEL": "Item cancelado (%3$s). Motivo: %4$s",
+}
+
+
+class TicketBusyError(Exception):
+    """El ticket (o sus items) está bloqueado por otra transacción y se agotaron los reintentos."""
+
+
+# Un solo round trip: cambio de items + contadores + estado/horas del ticket + auditoría.
+# Concurrencia:
+# - El ticket se bloquea primero (tk): dos cambios simultáneos no calculan contadores
+#   sobre la misma foto. La espera está acotada por lock_timeout (run_with_lock_retry):
+#   entre tablets el lock dura milisegundos y conviene esperar; si lo tiene una
+#   transacción larga (sync) se corta y se reintenta en vez de encolar requests.
+# - Items: un item puntual espera igual que el ticket; las acciones masivas usan
+#   SKIP LOCKED (los ocupados quedan para el siguiente clic).
+# - Optimista: :expected_version (item) / :expected_ticket_version (ticket) hacen el
+#   UPDATE condicional; si no coincide no se cambia nada y se informa `stale`.
+def _apply_sql(item_lock: str):
+    return text(
+        f"""
+    WITH tk AS (
+      SELECT id, status, version, items_pendiente, items_en_preparacion, items_entregado, items_cancelado
+      FROM kitchen_tickets
+      WHERE id = :ticket_id
+      FOR UPDATE
+    ),
+    old AS (
+      SELECT i.id, i.status, i.version, i.product_name
+      FROM kitchen_ticket_items i
+      JOIN tk ON i.ticket_id = tk.id
+      WHERE (CAST(:item_id AS uuid) IS NULL OR i.id = CAST(:item_id AS uuid))
+        AND (CAST(:from_statuses AS item_status[]) IS NULL
+             OR i.status = ANY(CAST(:from_statuses AS item_status[])))
+      FOR UPDATE OF i {item_lock}
+    ),
+    fresh AS (
+      SELECT old.*
+      FROM old, tk
+      WHERE (CAST(:expected_version AS bigint) IS NULL OR old.version = CAST(:expected_version AS bigint))
+        AND (CAST(:expected_ticket_version AS bigint) IS NULL OR tk.version = CAST(:expected_ticket_version AS bigint))
+    ),
+    upd AS (
+      UPDATE kitchen_ticket_items i
+      SET status = CAST(:status AS item_status),
+          prep_started_at = CASE WHEN CAST(:status AS item_status) IN ('EN_PREPARACION', 'ENTREGADO')
+                                 THEN COALESCE(i.prep_started_at, now()) ELSE i.prep_started_at END,
+          delivered_at = CASE WHEN CAST(:status AS item_status) = 'ENTREGADO'
+                              THEN COALESCE(i.delivered_at, now()) ELSE i.delivered_at END,
+          canceled_at = CASE WHEN CAST(:status AS item_status) = 'CANCELADO'
+                             THEN COALESCE(i.canceled_at, now()) ELSE i.canceled_at END,
+          change_reason = COALESCE(CAST(:reason AS text), i.change_reason),
+          version = nextval('{BOARD_VERSION_SEQ}'),
+          updated_at = now()
+      FROM fresh
+      WHERE i.id = fresh.id
+        AND (fresh.status <> CAST(:status AS item_status) OR CAST(:reason AS text) IS NOT NULL)
+      RETURNING i.id, fresh.status AS old_status, i.status AS new_status, fresh.product_name
+    ),
+    delta AS (
+      SELECT
+        count(*) AS n,
+        count(*) FILTER (WHERE new_status = 'PENDIENTE') - count(*) FILTER (WHERE old_status = 'PENDIENTE') AS d_pendiente,
+        count(*) FILTER (WHERE new_status = 'EN_PREPARACION') - count(*) FILTER (WHERE old_status = 'EN_PREPARACION') AS d_en_preparacion,
+        count(*) FILTER (WHERE new_status = 'ENTREGADO') - count(*) FILTER (WHERE old_status = 'ENTREGADO') AS d_entregado,
+        count(*) FILTER (WHERE new_status = 'CANCELADO') - count(*) FILTER (WHERE old_status = 'CANCELADO') AS d_cancelado
+      FROM upd
+    ),
+    nxt AS (
+      SELECT c.*, ticket_status_from_counts(c.pendiente, c.en_preparacion, c.entregado, c.cancelado) AS new_status
+      FROM (
+        SELECT tk.id, tk.status AS old_status,
+               (tk.items_pendiente + d.d_pendiente)::int AS pendiente,
+               (tk.items_en_preparacion + d.d_en_preparacion)::int AS en_preparacion,
+               (tk.items_entregado + d.d_entregado)::int AS entregado,
+               (tk.items_cancelado + d.d_cancelado)::int AS cancelado
+        FROM tk, delta d
+        WHERE d.n > 0
+      ) c
+    ),
+    upd_ticket AS (
+      UPDATE kitchen_tickets t
+      SET items_pendiente = nxt.pendiente,
+          items_en_preparacion = nxt.en_preparacion,
+          items_entregado = nxt.entregado,
+          items_cancelado = nxt.cancelado,
+          status = nxt.new_status,
+          hora_preparacion = CASE WHEN nxt.new_status IN ('EN_PREPARACION', 'PARCIAL')
+                                  THEN COALESCE(t.hora_preparacion, now()) ELSE t.hora_preparacion END,
+          hora_entrega = CASE WHEN nxt.new_status = 'LISTO'
+                              THEN COALESCE(t.hora_entrega, now()) ELSE t.hora_entrega END,
+          version = nextval('{BOARD_VERSION_SEQ}'),
+          updated_at = now()
+      FROM nxt
+      WHERE t.id = nxt.id
+      RETURNING t.id
+    ),
+    ev_items AS (
+      INSERT INTO ticket_events (id, ticket_id, item_id, event_type, message, meta, user_name)
+      SELECT gen_random_uuid(), :ticket_id, upd.id, :event_type,
+             format(:item_message, upd.old_status, upd.new_status, upd.product_name, CAST(:reason AS text)),
+             jsonb_strip_nulls(jsonb_build_object(
+               'from', upd.old_status, 'to', upd.new_status, 'item_id', upd.id, 'reason', CAST(:reason AS text)
+             )),
+             :user_name
+      FROM upd
+    ),
+    ev_ticket AS (
+      INSERT INTO ticket_events (id, ticket_id, item_id, event_type, message, meta, user_name)
+      SELECT gen_random_uuid(), nxt.id, NULL, 'TICKET_STATUS',
+             format('Ticket estado: %s → %s', nxt.old_status, nxt.new_status),
+             jsonb_build_object('from', nxt.old_status, 'to', nxt.new_status),
+             :user_name
+      FROM nxt
+      WHERE nxt.old_status <> nxt.new_status
+    ),
+    ev_bulk AS (
+      INSERT INTO ticket_events (id, ticket_id, item_id, event_type, message, meta, user_name)
+      SELECT gen_random_uuid(), tk.id, NULL, CAST(:bulk_event_type AS text),
+             format(:bulk_message, (SELECT n FROM delta)),
+             jsonb_build_object('changed_items', (SELECT n FROM delta)),
+             :user_name
+      FROM tk
+      WHERE CAST(:bulk_event_type AS text) IS NOT NULL
+    )
+    SELECT
+      (SELECT count(*) FROM tk) AS ticket_found,
+      (SELECT count(*) FROM old) AS matched_items,
+      (SELECT count(*) FROM old) - (SELECT count(*) FROM fresh)
+        + (SELECT count(*) FROM tk
+           WHERE CAST(:expected_ticket_version AS bigint) IS NOT NULL
+             AND tk.version <> CAST(:expected_ticket_version AS bigint)) AS stale_items,
+      (SELECT n FROM delta) AS changed_items,
+      (SELECT old_status::text FROM nxt) AS old_ticket_status,
+      (SELECT new_status::text FROM nxt) AS new_ticket_status
+    """
+    )
+
+
+_APPLY_SQL_ONE = _apply_sql("")
+_APPLY_SQL_SKIP_LOCKED = _apply_sql("SKIP LOCKED")
+
+_LOCK_NOT_AVAILABLE = "55P03"
+
+
+def _is_lock_not_available(exc: OperationalError) -> bool:
+    return getattr(exc.orig, "sqlstate", None) == _LOCK_NOT_AVAILABLE
+
+
+# db.info[LOCK_RETRIES_KEY] = 0: sin reintentos aquí (el backoff es time.sleep). Lo usan
+# los routers async, que reintentan la operación completa con asyncio.sleep.
+LOCK_RETRIES_KEY = "lock_retries"
+
+
+def lock_retry_delay(attempt: int) -> float:
+    """Segundos a esperar antes del reintento `attempt` (0, 1, ...): exponencial + jitter."""
+    delay = settings.LOCK_RETRY_BASE_MS * (2 ** attempt) / 1000
+    return delay + random.uniform(0, delay)
+
+
+def run_with_lock_retry(db: Session, ticket_id: UUID, fn: Callable[[], T]) -> T:
+    """
+    Ejecuta `fn` (que toma row locks) dentro de un SAVEPOINT con lock_timeout; si el
+    lock no llega a tiempo reintenta con backoff exponencial + jitter y al final lanza
+    TicketBusyError. El SAVEPOINT evita que el error aborte la transacción del request.
+    """
+    # SET LOCAL dura hasta el fin de la transacción: el resto del request también
+    # queda con esperas acotadas.
+    db.execute(text("SELECT set_config('lock_timeout', :v, true)"), {"v": f"{settings.LOCK_TIMEOUT_MS}ms"})
+    attempts = max(1, db.info.get(LOCK_RETRIES_KEY, settings.LOCK_RETRIES) + 1)
+    for attempt in range(attempts):
+        try:
+            with db.begin_nested():
+                return fn()
+        except OperationalError as e:
+            if not _is_lock_not_available(e):
+                raise
+            if attempt == attempts - 1:
+                raise TicketBusyError(str(ticket_id)) from e
+            time.sleep(lock_retry_delay(attempt))
+
+
+def lock_ticket(db: Session, ticket_id: UUID) -> Optional[KitchenTicket]:
+    """Ticket con sus items y el row lock del ticket (lock_timeout + reintentos), para mutaciones por ORM."""
+    return run_with_lock_retry(
+        db,
+        ticket_id,
+        lambda: db.query(KitchenTicket)
+        .options(selectinload(KitchenTicket.items))
+        .filter(KitchenTicket.id == ticket_id)
+        .with_for_update(of=KitchenTicket)
+        .first(),
+    )
+
+
+def apply_item_status(
+    db: Session,
+    *,
+    ticket_id: UUID,
+    status: ItemStatus,
+    user_name: Optional[str],
+    item_id: Optional[UUID] = None,
+    from_statuses: Optional[Iterable[ItemStatus]] = None,
+    reason: Optional[str] = None,
+    event_type: str = "ITEM_STATUS",
+    bulk_event: Optional[tuple[str, str]] = None,
+    expected_version: Optional[int] = None,
+    expected_ticket_version: Optional[int] = None,
+) -> ItemTransition:
+    """
+    Cambia a `status` el item `item_id` (o todos los del ticket que estén en
+    `from_statuses`) sin cargar el ticket: actualiza contadores, estado y horas del
+    ticket y escribe la auditoría en el mismo statement. `bulk_event` =
+    (event_type, mensaje con %s para la cantidad) agrega un evento resumen.
+    Locks y reintentos: ver run_with_lock_retry. No hace commit.
+    """
+    bulk_type, bulk_message = bulk_event or (None, None)
+    stmt = _APPLY_SQL_ONE if item_id is not None else _APPLY_SQL_SKIP_LOCKED
+    params = {
+        "ticket_id": ticket_id,
+        "item_id": item_id,
+        "from_statuses": [s.value for s in from_statuses] if from_statuses is not None else None,
+        "status": status.value,
+        "reason": reason,
+        "user_name": user_name,
+        "event_type": event_type,
+        "item_message": _ITEM_MESSAGES[event_type],
+        "bulk_event_type": bulk_type,
+        "bulk_message": bulk_message,
+        "expected_version": expected_version,
+        "expected_ticket_version": expected_ticket_version,
+    }
+
+    row = run_with_lock_retry(db, ticket_id, lambda: db.execute(stmt, params).one())
+
+    return ItemTransition(
+        ticket_found=bool(row.ticket_found),
+        matched_items=int(row.matched_items),
+        changed_items=int(row.changed_items),
+        stale_items=int(row.stale_items),
+        old_ticket_status=TicketStatus(row.old_ticket_status) if row.old_ticket_status else None,
+        new_ticket_status=TicketStatus(row.new_ticket_status) if row.new_ticket_status else None,
+    )
+
+
+_RECOUNT_SQL = text(
+    """
+    UPDATE kitchen_tickets t
+    SET items_pendiente = c.pendiente,
+        items_en_preparacion = c.en_preparacion,
+        items_entregado = c.entregado,
+        items_cancelado = c.cancelado
+    FROM (
+      SELECT tt.id,
+             count(i.id) FILTER (WHERE i.status = 'PENDIENTE') AS pendiente,
+             count(i.id) FILTER (WHERE i.status = 'EN_PREPARACION') AS en_preparacion,
+             count(i.id) FILTER (WHERE i.status = 'ENTREGADO') AS entregado,
+             count(i.id) FILTER (WHERE i.status = 'CANCELADO') AS cancelado
+      FROM kitchen_tickets tt
+      LEFT JOIN kitchen_ticket_items i ON i.ticket_id = tt.id
+      WHERE tt.id = ANY(:ids)
+      GROUP BY tt.id
+    ) c
+    WHERE t.id = c.id
+    """
+)
+
+
+def recount_ticket_items(db: Session, ticket_ids: Iterable[UUID]) -> None:
+    """
+    Recalcula los contadores desde los items (para cargas que insertan items por ORM,
+    como el sync). No toca el estado del ticket.
+    """
+    ids = list({tid for tid in ticket_ids if tid is not None})
+    if not ids:
+        return
+    db.flush()
+    db.execute(_RECOUNT_SQL, {"ids": ids})
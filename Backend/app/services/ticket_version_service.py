@@ -0,0 +1,57 @@
+from __future__ import annotations
+
+import hashlib
+from typing import Optional
+from uuid import UUID
+
+from sqlalchemy import func, select, true
+from sqlalchemy.orm import Session
+
+from app.models.ticket import KitchenTicket, KitchenTicketItem
+from app.models.ticket_archive import kitchen_tickets_archive, ticket_archive_state
+
+BOARD_VERSION_SEQ = "kitchen_board_version_seq"
+
+
+def touch_ticket(ticket: KitchenTicket) -> None:
+    """Marca el ticket como modificado: nueva versión (ETag) y updated_at."""
+    ticket.version = func.nextval(BOARD_VERSION_SEQ)
+    ticket.updated_at = func.now()
+
+
+def touch_item(item: KitchenTicketItem) -> None:
+    """Nueva versión del item: invalida los expected_version que tengan los clientes."""
+    item.version = func.nextval(BOARD_VERSION_SEQ)
+    item.updated_at = func.now()
+
+
+def board_version(db: Session) -> int:
+    # Las versiones salen de nextval a mitad de transacción, así que los commits llegan
+    # desordenados: un sync largo con la versión 100 puede confirmar después de una
+    # transición con la 101, y un max(version) no cambiaría. count + sum(version) sí:
+    # todo UPDATE confirmado sube la suma (la versión nueva es mayor que la que pisa)
+    # y todo INSERT cambia el conteo. Index-only scan sobre ix_kitchen_tickets_version,
+    # que solo cubre la tabla caliente. El archivado saca tickets: entra su propio estado.
+    hot = select(
+        func.count(),
+        func.coalesce(func.sum(KitchenTicket.version), 0),
+        func.coalesce(func.max(KitchenTicket.version), 0),
+    ).subquery()
+    archived = (
+        select(ticket_archive_state.c.version, ticket_archive_state.c.archived_total)
+        .where(ticket_archive_state.c.id == 1)
+        .subquery()
+    )
+    row = db.execute(select(hot, archived).select_from(hot.outerjoin(archived, true()))).one()
+    digest = hashlib.blake2b(repr(tuple(row)).encode(), digest_size=8).digest()
+    return int.from_bytes(digest, "big") >> 1
+
+
+def ticket_version(db: Session, ticket_id: UUID) -> Optional[int]:
+    version = db.execute(select(KitchenTicket.version).where(KitchenTicket.id == ticket_id)).scalar_one_or_none()
+    if version is None:
+        # Archivado: ya no cambia
+        version = db.execute(
+            select(kitchen_tickets_archive.c.version).where(kitchen_tickets_archive.c.id == ticket_id)
+        ).scalar_one_or_none()
+    return version
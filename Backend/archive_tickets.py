@@ -0,0 +1,31 @@
+"""
+Archiva ya los tickets LISTO/CANCELADO terminados hace más de N horas (lo mismo que
+hace el hilo de app/core/ticket_archiver.py cada ARCHIVE_INTERVAL_SECONDS).
+
+    cd Backend
+    python archive_tickets.py --hours 12
+"""
+import argparse
+
+from app.core.config import settings
+from app.db.session import SessionLocal
+from app.services.ticket_archive_service import archive_finished_tickets
+
+
+def main():
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--hours", type=int, default=settings.ARCHIVE_AFTER_HOURS)
+    ap.add_argument("--batch-size", type=int, default=settings.ARCHIVE_BATCH_SIZE)
+    args = ap.parse_args()
+
+    db = SessionLocal()
+    try:
+        res = archive_finished_tickets(db, older_than_hours=args.hours, batch_size=args.batch_size)
+    finally:
+        db.close()
+
+    print(f"✅ archivados: {res.tickets} tickets en {res.batches} lotes")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,30 @@
+from __future__ import annotations
+
+import statistics
+import time
+from typing import Callable
+
+
+def measure(fn: Callable[[], object], *, runs: int = 50, warmup: int = 5) -> dict:
+    for _ in range(warmup):
+        fn()
+    samples = []
+    for _ in range(runs):
+        t0 = time.perf_counter()
+        fn()
+        samples.append((time.perf_counter() - t0) * 1000)
+    samples.sort()
+    return {
+        "runs": runs,
+        "mean_ms": statistics.fmean(samples),
+        "p50_ms": samples[len(samples) // 2],
+        "p95_ms": samples[min(len(samples) - 1, int(len(samples) * 0.95))],
+        "max_ms": samples[-1],
+    }
+
+
+def print_table(title: str, rows: list[tuple[str, dict]]) -> None:
+    print(f"\n== {title}")
+    print(f"{'case':<40} {'mean':>9} {'p50':>9} {'p95':>9} {'max':>9}")
+    for name, r in rows:
+        print(f"{name:<40} {r['mean_ms']:>8.2f}ms {r['p50_ms']:>8.2f}ms {r['p95_ms']:>8.2f}ms {r['max_ms']:>8.2f}ms")
@@ -0,0 +1,182 @@
+"""
+Dashboard de desempeño: agregando directo de las tablas de items vs leyendo los
+rollups de app/services/kitchen_perf_service.py, con un año de historia; y el
+análisis ad-hoc de /analytics/prep-times (NumPy) vs las mismas cuentas en SQL.
+
+Crea un schema aparte (`bench_perf`) con tickets/items (casi todo en *_archive,
+como en producción), corre el backfill del rollup y mide las consultas de
+/analytics contra su equivalente sobre las filas crudas.
+
+    cd Backend
+    python -m benchmarks.bench_analytics --tickets 300000 --items 4
+"""
+from __future__ import annotations
+
+import argparse
+import time
+from datetime import timedelta
+
+from sqlalchemy import create_engine, text
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+from app.db.session import engine
+from app.services.kitchen_perf_service import local_today, perf_series, perf_summary, rollup_kitchen_perf
+from app.services.prep_time_service import analyze_prep_times, load_frame
+from benchmarks._common import measure, print_table
+
+SCHEMA = "bench_perf"
+
+_TABLES = (
+    "kitchen_tickets",
+    "kitchen_ticket_items",
+    "kitchen_tickets_archive",
+    "kitchen_ticket_items_archive",
+    "kitchen_perf_hourly",
+    "kitchen_perf_daily",
+    "kitchen_perf_state",
+)
+
+# Lo que haría /analytics sin rollups: percentiles exactos sobre todas las filas
+_RAW_SUMMARY_SQL = """
+    SELECT {key} AS key, count(*),
+           avg(EXTRACT(EPOCH FROM i.delivered_at - t.hora_pedido)),
+           percentile_cont(0.9) WITHIN GROUP (ORDER BY EXTRACT(EPOCH FROM i.delivered_at - t.hora_pedido))
+    FROM (
+      SELECT ticket_id, product_name, delivered_at FROM kitchen_ticket_items WHERE delivered_at IS NOT NULL
+      UNION ALL
+      SELECT ticket_id, product_name, delivered_at FROM kitchen_ticket_items_archive WHERE delivered_at IS NOT NULL
+    ) i
+    JOIN (
+      SELECT id, hora_pedido FROM kitchen_tickets
+      UNION ALL
+      SELECT id, hora_pedido FROM kitchen_tickets_archive
+    ) t ON t.id = i.ticket_id
+    WHERE i.delivered_at >= now() - interval '365 days'
+    GROUP BY 1
+    ORDER BY 2 DESC
+    LIMIT 50
+"""
+
+
+# Percentiles por producto y por hora en SQL para 30 días (lo que reemplaza prep-times)
+_RAW_PREP_TIMES_SQL = """
+    WITH x AS (
+      SELECT i.product_name, EXTRACT(HOUR FROM t.hora_pedido) AS h,
+             EXTRACT(EPOCH FROM i.delivered_at - t.hora_pedido) AS total_s
+      FROM kitchen_ticket_items_archive i JOIN kitchen_tickets_archive t ON t.id = i.ticket_id
+      WHERE i.delivered_at >= now() - interval '30 days'
+    )
+    SELECT 'product', product_name::text, count(*), avg(total_s),
+           percentile_cont(ARRAY[0.5, 0.9]) WITHIN GROUP (ORDER BY total_s)
+    FROM x GROUP BY product_name
+    UNION ALL
+    SELECT 'hour', h::text, count(*), avg(total_s),
+           percentile_cont(ARRAY[0.5, 0.9]) WITHIN GROUP (ORDER BY total_s)
+    FROM x GROUP BY h
+"""
+
+
+def _setup(tickets: int, items: int) -> None:
+    with engine.begin() as conn:
+        conn.execute(text(f"DROP SCHEMA IF EXISTS {SCHEMA} CASCADE"))
+        conn.execute(text(f"CREATE SCHEMA {SCHEMA}"))
+        for table in _TABLES:
+            conn.execute(text(f"CREATE TABLE {SCHEMA}.{table} (LIKE public.{table} INCLUDING ALL)"))
+        conn.execute(text(f"INSERT INTO {SCHEMA}.kitchen_perf_state (id) VALUES (1)"))
+        # Un año de tickets terminados en el archivo, repartidos en horario de servicio
+        conn.execute(
+            text(
+                f"""
+                INSERT INTO {SCHEMA}.kitchen_tickets_archive (
+                  id, pos_docto_guid, pos_id_cia, pos_tipo_docto, pos_consec_docto,
+                  mesa_ref, mesero_nombre, hora_pedido, hora_entrega, status, comanda_number
+                )
+                SELECT gen_random_uuid(), gen_random_uuid(), 1, '01f', g, (1 + g % 40)::text,
+                       'Mesero ' || (g % 12), ts, ts + (600 + g % 1800) * interval '1 second', 'LISTO', g
+                FROM (
+                  SELECT g, date_trunc('day', now()) - (g % 365) * interval '1 day'
+                            + (16 + g % 12) * interval '1 hour' + (g % 3600) * interval '1 second' AS ts
+                  FROM generate_series(1, :n) g
+                ) s
+                """
+            ),
+            {"n": tickets},
+        )
+        conn.execute(
+            text(
+                f"""
+                INSERT INTO {SCHEMA}.kitchen_ticket_items_archive (
+                  id, ticket_id, pos_movto_guid, pos_rowid_item_ext, product_name, qty, unidad, status,
+                  prep_started_at, delivered_at
+                )
+                SELECT gen_random_uuid(), t.id, gen_random_uuid(), k, 'Producto ' || ((k * 7 + t.pos_consec_docto) % 60),
+                       1, 'UND', 'ENTREGADO',
+                       t.hora_pedido + ((t.pos_consec_docto * k) % 400) * interval '1 second',
+                       t.hora_pedido + (300 + (t.pos_consec_docto * k) % 2400) * interval '1 second'
+                FROM {SCHEMA}.kitchen_tickets_archive t, generate_series(1, :k) k
+                """
+            ),
+            {"k": items},
+        )
+        for table in _TABLES:
+            conn.execute(text(f"ANALYZE {SCHEMA}.{table}"))
+
+
+def main() -> None:
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--tickets", type=int, default=300_000)
+    ap.add_argument("--items", type=int, default=4)
+    ap.add_argument("--runs", type=int, default=10)
+    args = ap.parse_args()
+
+    print(f"Preparando {args.tickets:,} tickets x {args.items} items (un año) en {SCHEMA}...")
+    _setup(args.tickets, args.items)
+
+    # Las consultas del servicio son SQL textual: se aísla con search_path
+    bench_engine = create_engine(settings.DATABASE_URL, connect_args={"options": f"-csearch_path={SCHEMA},public"})
+    results = []
+    try:
+        with Session(bind=bench_engine) as db:
+            t0 = time.perf_counter()
+            res = rollup_kitchen_perf(db)
+            print(f"Backfill del rollup: {(time.perf_counter() - t0):.1f}s ({res.hourly_rows:,} filas por hora, {res.daily_rows:,} por día)")
+
+            now = db.execute(text("SELECT now()")).scalar_one()
+
+            def prep_times():
+                frame = load_frame(db, from_ts=now - timedelta(days=30), to_ts=now)
+                return analyze_prep_times(db, frame)
+
+            n_items = len(load_frame(db, from_ts=now - timedelta(days=30), to_ts=now))
+            print(f"prep-times: {n_items:,} items en 30 días")
+
+            to_day = local_today()
+            from_day = to_day - timedelta(days=364)
+            for name, fn in (
+                ("crudo: resumen del año", lambda: db.execute(text(_RAW_SUMMARY_SQL.format(key="''"))).all()),
+                ("crudo: por producto, año", lambda: db.execute(text(_RAW_SUMMARY_SQL.format(key="i.product_name"))).all()),
+                ("rollup: resumen del año", lambda: perf_summary(db, dim="all", from_day=from_day, to_day=to_day, limit=50)),
+                ("rollup: por producto, año", lambda: perf_summary(db, dim="product", from_day=from_day, to_day=to_day, limit=50)),
+                ("rollup: por mesero, año", lambda: perf_summary(db, dim="mesero", from_day=from_day, to_day=to_day, limit=50)),
+                ("rollup: serie diaria, año", lambda: perf_series(db, grain="day", dim="all", key="", from_day=from_day, to_day=to_day)),
+                ("rollup: hora del día, 90 días", lambda: perf_series(
+                    db, grain="hour_of_day", dim="all", key="", from_day=to_day - timedelta(days=89), to_day=to_day
+                )),
+                ("rollup: incremental (sin cambios)", lambda: rollup_kitchen_perf(db)),
+                ("crudo SQL: percentiles 30 días", lambda: db.execute(text(_RAW_PREP_TIMES_SQL)).all()),
+                ("prep-times NumPy: 30 días", prep_times),
+                ("prep-times: solo carga (cursor)", lambda: load_frame(db, from_ts=now - timedelta(days=30), to_ts=now)),
+            ):
+                runs = 3 if name.startswith(("crudo", "prep-times")) else args.runs
+                results.append((name, measure(fn, runs=runs, warmup=1)))
+    finally:
+        bench_engine.dispose()
+        with engine.begin() as conn:
+            conn.execute(text(f"DROP SCHEMA IF EXISTS {SCHEMA} CASCADE"))
+
+    print_table("Analytics: crudo vs rollups (un año)", results)
+
+
+if __name__ == "__main__":
+    main()
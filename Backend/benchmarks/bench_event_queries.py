@@ -0,0 +1,136 @@
+"""
+Latencia de la línea de tiempo (GET /tickets/{id}/events) y de la búsqueda de
+auditoría (GET /events) con N eventos (por defecto 10M).
+
+Crea un schema aparte (`bench_events`) con ticket_events, lo llena con
+generate_series y mide las mismas consultas primero sin los índices de
+sql/008_ticket_event_indexes.sql y luego con ellos.
+
+    cd Backend
+    python -m benchmarks.bench_event_queries --rows 10000000
+"""
+from __future__ import annotations
+
+import argparse
+from datetime import timedelta
+
+from sqlalchemy import text
+from sqlalchemy.orm import Session
+
+from app.core.keyset import decode_cursor
+from app.db.session import engine
+from app.services.ticket_read_service import list_ticket_event_rows, search_event_rows
+from benchmarks._common import measure, print_table
+
+SCHEMA = "bench_events"
+EVENTS_PER_TICKET = 40
+
+_INDEXES = (
+    "CREATE INDEX ix_ticket_events_ticket_created ON {s}.ticket_events (ticket_id, created_at, id)",
+    "CREATE INDEX ix_ticket_events_created_id ON {s}.ticket_events (created_at DESC, id DESC)",
+    "CREATE INDEX ix_ticket_events_type_created ON {s}.ticket_events (event_type, created_at DESC, id DESC)",
+    "CREATE INDEX ix_ticket_events_user_created ON {s}.ticket_events (user_name, created_at DESC, id DESC)",
+)
+
+
+def _setup(rows: int) -> None:
+    with engine.begin() as conn:
+        conn.execute(text(f"DROP SCHEMA IF EXISTS {SCHEMA} CASCADE"))
+        conn.execute(text(f"CREATE SCHEMA {SCHEMA}"))
+        # Sin índices (solo la PK): el "antes"
+        conn.execute(text(f"CREATE TABLE {SCHEMA}.ticket_events (LIKE public.ticket_events INCLUDING DEFAULTS)"))
+        conn.execute(text(f"ALTER TABLE {SCHEMA}.ticket_events ADD PRIMARY KEY (id)"))
+        # Las lecturas incluyen el archivo (vacío aquí)
+        conn.execute(text(f"CREATE TABLE {SCHEMA}.ticket_events_archive (LIKE public.ticket_events_archive INCLUDING ALL)"))
+        # Tickets: bloques de EVENTS_PER_TICKET eventos seguidos en el tiempo
+        conn.execute(
+            text(
+                f"""
+                INSERT INTO {SCHEMA}.ticket_events (id, ticket_id, item_id, event_type, message, meta, user_name, created_at)
+                SELECT
+                  gen_random_uuid(),
+                  md5('t' || (g / :per))::uuid,
+                  CASE WHEN g % 5 = 0 THEN NULL ELSE gen_random_uuid() END,
+                  (ARRAY['ITEM_STATUS','ITEM_STATUS','ITEM_STATUS','TICKET_STATUS','ITEM_CANCEL','PRINT'])[1 + g % 6],
+                  'Item estado: PENDIENTE → EN_PREPARACION (Producto ' || (g % 300) || ')',
+                  jsonb_build_object('from', 'PENDIENTE', 'to', 'EN_PREPARACION'),
+                  'Operario ' || (g % 30),
+                  now() - ((:rows - g) * interval '250 milliseconds')
+                FROM generate_series(1, :rows) g
+                """
+            ),
+            {"rows": rows, "per": EVENTS_PER_TICKET},
+        )
+        conn.execute(text(f"ANALYZE {SCHEMA}.ticket_events"))
+
+
+def _add_indexes() -> None:
+    with engine.begin() as conn:
+        for ddl in _INDEXES:
+            conn.execute(text(ddl.format(s=SCHEMA)))
+        conn.execute(text(f"ANALYZE {SCHEMA}.ticket_events"))
+
+
+def _cases(db: Session) -> list[tuple[str, object]]:
+    sample = db.execute(
+        text(f"SELECT ticket_id, max(created_at) FROM {SCHEMA}.ticket_events GROUP BY ticket_id ORDER BY 1 LIMIT 1 OFFSET 1000")
+    ).one()
+    ticket_id, last_ts = sample
+    since = last_ts - timedelta(seconds=3)
+    newest = db.execute(text(f"SELECT max(created_at) FROM {SCHEMA}.ticket_events")).scalar_one()
+
+    def search(**kw):
+        base = dict(event_types=None, user_name=None, ticket_id=None, from_ts=None, to_ts=None, limit=100, cursor=None)
+        base.update(kw)
+        return lambda: search_event_rows(db, **base)
+
+    return [
+        ("timeline completo", lambda: list_ticket_event_rows(db, ticket_id)),
+        ("timeline since_ts", lambda: list_ticket_event_rows(db, ticket_id, since_ts=since)),
+        ("/events primera página", search()),
+        ("/events event_type=PRINT", search(event_types=["PRINT"])),
+        ("/events user_name", search(user_name="Operario 7")),
+        ("/events ventana 1h", search(from_ts=newest - timedelta(hours=1), to_ts=newest - timedelta(minutes=30))),
+        ("/events página 20", search(cursor=_cursor_at_page(db, 20))),
+    ]
+
+
+def _cursor_at_page(db: Session, page: int):
+    cursor = None
+    for _ in range(page - 1):
+        _, headers = search_event_rows(
+            db, event_types=None, user_name=None, ticket_id=None, from_ts=None, to_ts=None, limit=100, cursor=cursor
+        )
+        cursor = decode_cursor(headers["X-Next-Cursor"])
+    return cursor
+
+
+def main() -> None:
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--rows", type=int, default=10_000_000)
+    ap.add_argument("--runs", type=int, default=10)
+    ap.add_argument("--keep", action="store_true", help="no borrar el schema al terminar")
+    args = ap.parse_args()
+
+    print(f"Preparando {args.rows:,} eventos en {SCHEMA}...")
+    _setup(args.rows)
+
+    bench_engine = engine.execution_options(schema_translate_map={None: SCHEMA})
+    results = []
+    try:
+        for label in ("sin índices", "con índices"):
+            if label == "con índices":
+                _add_indexes()
+            with Session(bind=bench_engine) as db:
+                for name, fn in _cases(db):
+                    results.append((f"{label:<11} {name}", measure(fn, runs=args.runs, warmup=2)))
+    finally:
+        if not args.keep:
+            with engine.begin() as conn:
+                conn.execute(text(f"DROP SCHEMA IF EXISTS {SCHEMA} CASCADE"))
+
+    print_table(f"Eventos de auditoría ({args.rows:,} filas)", results)
+
+
+if __name__ == "__main__":
+    main()
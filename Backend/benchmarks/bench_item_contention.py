@@ -0,0 +1,205 @@
+"""
+Prueba de contención sobre mutaciones de items (app/services/ticket_status_service.py).
+
+N clientes (threads, cada uno con su sesión) cambian el estado de items al azar sobre
+pocos tickets "calientes". Opcionalmente un hilo simula el sync reteniendo el lock de
+un ticket por --sync-hold-ms. Se mide throughput, latencia y cuántos 409 (ticket
+ocupado) hubo; al final se verifica que los contadores por ticket coincidan con los
+items (sin updates perdidos).
+
+    cd Backend
+    python -m benchmarks.bench_item_contention --tickets 5 --items 6 --clients 1,4,16,32 --seconds 5
+"""
+from __future__ import annotations
+
+import argparse
+import random
+import statistics
+import threading
+import time
+
+from sqlalchemy import create_engine, text
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+from app.db.session import engine
+from app.models.ticket import ItemStatus
+from app.services.ticket_board_service import refresh_ticket_board
+from app.services.ticket_status_service import TicketBusyError, apply_item_status
+
+SCHEMA = "bench_contention"
+_TABLES = ("kitchen_tickets", "kitchen_ticket_items", "ticket_events", "ticket_board")
+_STATUSES = (ItemStatus.PENDIENTE, ItemStatus.EN_PREPARACION, ItemStatus.ENTREGADO)
+
+
+def _setup(tickets: int, items: int) -> None:
+    with engine.begin() as conn:
+        conn.execute(text(f"DROP SCHEMA IF EXISTS {SCHEMA} CASCADE"))
+        conn.execute(text(f"CREATE SCHEMA {SCHEMA}"))
+        for table in _TABLES:
+            conn.execute(text(f"CREATE TABLE {SCHEMA}.{table} (LIKE public.{table} INCLUDING ALL)"))
+        conn.execute(
+            text(
+                f"""
+                INSERT INTO {SCHEMA}.kitchen_tickets (
+                  id, pos_docto_guid, pos_id_cia, pos_tipo_docto, pos_consec_docto,
+                  mesa_ref, hora_pedido, status, comanda_number, items_pendiente
+                )
+                SELECT gen_random_uuid(), gen_random_uuid(), 1, '01f', g, g::text, now(), 'PENDIENTE', g, :k
+                FROM generate_series(1, :n) g
+                """
+            ),
+            {"n": tickets, "k": items},
+        )
+        conn.execute(
+            text(
+                f"""
+                INSERT INTO {SCHEMA}.kitchen_ticket_items (
+                  id, ticket_id, pos_movto_guid, pos_rowid_item_ext, product_name, qty, unidad, status
+                )
+                SELECT gen_random_uuid(), t.id, gen_random_uuid(), k, 'Producto ' || k, 1, 'UND', 'PENDIENTE'
+                FROM {SCHEMA}.kitchen_tickets t, generate_series(1, :k) k
+                """
+            ),
+            {"k": items},
+        )
+
+
+def _targets(bench_engine) -> list[tuple]:
+    with bench_engine.connect() as conn:
+        return conn.execute(text("SELECT ticket_id, id FROM kitchen_ticket_items")).all()
+
+
+def _run(bench_engine, targets, clients: int, seconds: float, sync_hold_ms: int) -> dict:
+    stop = time.perf_counter() + seconds
+    lock = threading.Lock()
+    latencies: list[float] = []
+    counts = {"ok": 0, "busy": 0, "error": 0}
+    ticket_ids = sorted({t for t, _ in targets})
+
+    def client() -> None:
+        rnd = random.Random()
+        with Session(bind=bench_engine) as db:
+            while time.perf_counter() < stop:
+                ticket_id, item_id = rnd.choice(targets)
+                t0 = time.perf_counter()
+                outcome = "ok"
+                try:
+                    res = apply_item_status(
+                        db,
+                        ticket_id=ticket_id,
+                        item_id=item_id,
+                        status=rnd.choice(_STATUSES),
+                        user_name="bench",
+                    )
+                    if res.changed_items:
+                        refresh_ticket_board(db, [ticket_id])
+                    db.commit()
+                except TicketBusyError:
+                    db.rollback()
+                    outcome = "busy"
+                except Exception:
+                    db.rollback()
+                    outcome = "error"
+                elapsed = (time.perf_counter() - t0) * 1000
+                with lock:
+                    counts[outcome] += 1
+                    latencies.append(elapsed)
+
+    def slow_sync() -> None:
+        # Transacción larga que retiene el lock de un ticket (como el sync con SQL Server lento)
+        with bench_engine.connect() as conn:
+            while time.perf_counter() < stop:
+                conn.execute(
+                    text("SELECT 1 FROM kitchen_tickets WHERE id = :id FOR UPDATE"),
+                    {"id": random.choice(ticket_ids)},
+                )
+                time.sleep(sync_hold_ms / 1000)
+                conn.commit()
+                time.sleep(sync_hold_ms / 1000)
+
+    threads = [threading.Thread(target=client) for _ in range(clients)]
+    if sync_hold_ms:
+        threads.append(threading.Thread(target=slow_sync))
+    t_start = time.perf_counter()
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    wall = time.perf_counter() - t_start
+
+    latencies.sort()
+    return {
+        "clients": clients,
+        "ops_s": counts["ok"] / wall,
+        **counts,
+        "p50_ms": statistics.median(latencies) if latencies else 0.0,
+        "p95_ms": latencies[min(len(latencies) - 1, int(len(latencies) * 0.95))] if latencies else 0.0,
+    }
+
+
+def _check_counters(bench_engine) -> int:
+    with bench_engine.connect() as conn:
+        return conn.execute(
+            text(
+                """
+                SELECT count(*) FROM kitchen_tickets t
+                JOIN LATERAL (
+                  SELECT count(*) FILTER (WHERE status = 'PENDIENTE') AS p,
+                         count(*) FILTER (WHERE status = 'EN_PREPARACION') AS e,
+                         count(*) FILTER (WHERE status = 'ENTREGADO') AS d,
+                         count(*) FILTER (WHERE status = 'CANCELADO') AS c
+                  FROM kitchen_ticket_items i WHERE i.ticket_id = t.id
+                ) x ON true
+                WHERE (t.items_pendiente, t.items_en_preparacion, t.items_entregado, t.items_cancelado)
+                      <> (x.p, x.e, x.d, x.c)
+                   OR t.status <> ticket_status_from_counts(x.p::int, x.e::int, x.d::int, x.c::int)
+                """
+            )
+        ).scalar_one()
+
+
+def main() -> None:
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--tickets", type=int, default=5)
+    ap.add_argument("--items", type=int, default=6)
+    ap.add_argument("--clients", default="1,4,16,32")
+    ap.add_argument("--seconds", type=float, default=5)
+    ap.add_argument("--sync-hold-ms", type=int, default=0)
+    args = ap.parse_args()
+
+    client_counts = [int(x) for x in args.clients.split(",")]
+    _setup(args.tickets, args.items)
+    # text() no usa schema_translate_map: el esquema de prueba va primero en search_path
+    bench_engine = create_engine(
+        settings.DATABASE_URL,
+        pool_size=max(client_counts) + 2,
+        connect_args={"options": f"-csearch_path={SCHEMA},public"},
+    )
+
+    rows = []
+    try:
+        targets = _targets(bench_engine)
+        for n in client_counts:
+            rows.append(_run(bench_engine, targets, n, args.seconds, args.sync_hold_ms))
+        mismatches = _check_counters(bench_engine)
+    finally:
+        bench_engine.dispose()
+        with engine.begin() as conn:
+            conn.execute(text(f"DROP SCHEMA IF EXISTS {SCHEMA} CASCADE"))
+
+    print(
+        f"\n== Contención: {args.tickets} tickets x {args.items} items, {args.seconds:g}s por corrida, "
+        f"sync reteniendo lock {args.sync_hold_ms} ms"
+    )
+    print(f"{'clientes':>8} {'ops/s':>9} {'ok':>7} {'409':>6} {'error':>6} {'p50':>9} {'p95':>9}")
+    for r in rows:
+        print(
+            f"{r['clients']:>8} {r['ops_s']:>9.1f} {r['ok']:>7} {r['busy']:>6} {r['error']:>6} "
+            f"{r['p50_ms']:>7.2f}ms {r['p95_ms']:>7.2f}ms"
+        )
+    print(f"\ntickets con contadores/estado inconsistentes: {mismatches}")
+
+
+if __name__ == "__main__":
+    main()
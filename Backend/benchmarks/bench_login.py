@@ -0,0 +1,137 @@
+"""
+Logins simultáneos (cambio de turno): bcrypt en el hilo del request, como antes,
+contra app/core/password_pool.py (procesos aparte + admisión) y contra la cache de
+logins correctos. Mientras corre la tanda de logins, un hilo "sonda" hace el trabajo
+de un request de tickets (serializar el tablero) y se mide cuánto se atrasa.
+
+No usa DB: los hashes se generan con BCRYPT_ROUNDS de la configuración.
+
+    cd Backend
+    python -m benchmarks.bench_login --clients 12 --logins 24
+"""
+from __future__ import annotations
+
+import argparse
+import json
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable
+
+from app.core.auth_cache import AuthCache
+from app.core.config import settings
+from app.core.password_pool import PasswordPool, PasswordPoolBusy
+from app.core.security import hash_password, verify_and_update
+from benchmarks._common import print_table
+
+_BOARD = [
+    {"id": f"{n:08d}", "mesa_ref": str(1 + n % 40), "status": "PENDIENTE", "items": [{"qty": 1, "name": "Producto"}] * 5}
+    for n in range(300)
+]
+
+
+def _summary(samples: list[float]) -> dict:
+    samples = sorted(samples) or [0.0]
+    return {
+        "runs": len(samples),
+        "mean_ms": sum(samples) / len(samples),
+        "p50_ms": samples[len(samples) // 2],
+        "p95_ms": samples[min(len(samples) - 1, int(len(samples) * 0.95))],
+        "max_ms": samples[-1],
+    }
+
+
+def _storm(login: Callable[[int], object], *, clients: int, logins: int) -> tuple[dict, dict, float, int]:
+    """(latencia de login, latencia de la sonda, logins/s, rechazados)."""
+    stop = threading.Event()
+    probe: list[float] = []
+
+    def _probe():
+        while not stop.is_set():
+            t0 = time.perf_counter()
+            json.dumps(_BOARD)
+            probe.append((time.perf_counter() - t0) * 1000)
+            time.sleep(0.01)
+
+    lat: list[float] = []
+    rejected = 0
+
+    def _one(i: int):
+        nonlocal rejected
+        t0 = time.perf_counter()
+        try:
+            login(i)
+        except PasswordPoolBusy:
+            rejected += 1
+            return
+        lat.append((time.perf_counter() - t0) * 1000)
+
+    prober = threading.Thread(target=_probe, daemon=True)
+    prober.start()
+    t0 = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=clients) as ex:
+        list(ex.map(_one, range(logins)))
+    elapsed = time.perf_counter() - t0
+    stop.set()
+    prober.join()
+    return _summary(lat), _summary(probe), len(lat) / elapsed, rejected
+
+
+def main() -> None:
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--clients", type=int, default=12, help="Logins en paralelo")
+    ap.add_argument("--logins", type=int, default=24)
+    ap.add_argument("--workers", type=int, default=settings.PASSWORD_POOL_WORKERS)
+    ap.add_argument("--max-pending", type=int, default=settings.PASSWORD_POOL_MAX_PENDING)
+    args = ap.parse_args()
+
+    users = [(f"mesero{n}", f"clave-{n}") for n in range(args.logins)]
+    print(f"Generando {len(users)} hashes (bcrypt, {settings.BCRYPT_ROUNDS} rounds)...")
+    hashes = [hash_password(pw) for _, pw in users]
+
+    pool = PasswordPool(
+        workers=args.workers,
+        max_pending=args.max_pending,
+        admission_timeout_ms=settings.PASSWORD_POOL_ADMISSION_TIMEOUT_MS,
+    )
+    pool.verify(*users[0][1:], hashes[0])  # arranca los procesos fuera de la medición
+    cache = AuthCache(max_entries=1000, ttl_seconds=60, verify_ttl_seconds=300)
+
+    def inline(i: int):
+        assert verify_and_update(users[i][1], hashes[i])[0]
+
+    def pooled(i: int):
+        assert pool.verify(users[i][1], hashes[i])[0]
+
+    def cached(i: int):
+        key = cache.login_key(users[i][0], users[i][1], hashes[i])
+        if not cache.is_verified(key):
+            assert pool.verify(users[i][1], hashes[i])[0]
+            cache.mark_verified(key)
+
+    _, idle_probe, _, _ = _storm(lambda i: time.sleep(0.2), clients=args.clients, logins=args.clients)
+    rows = [("sonda sin logins", idle_probe)]
+    throughput = []
+    cases = [
+        ("en el hilo (antes)", inline),
+        (f"pool {args.workers} procesos", pooled),
+        ("pool, cache fría", cached),
+        ("pool, cache caliente", cached),
+    ]
+    try:
+        for name, fn in cases:
+            login_lat, probe_lat, rate, rejected = _storm(fn, clients=args.clients, logins=args.logins)
+            rows.append((f"login: {name}", login_lat))
+            rows.append((f"sonda: {name}", probe_lat))
+            throughput.append((name, rate, rejected))
+    finally:
+        pool.shutdown()
+
+    print_table(f"{args.logins} logins, {args.clients} en paralelo", rows)
+    print()
+    for name, rate, rejected in throughput:
+        print(f"{name:<40} {rate:>8.1f} logins/s  rechazados (503): {rejected}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,148 @@
+"""
+Impresión de comandas: el camino anterior (ORM + commit + f-strings por llamada)
+contra app/services/print_service.py (plantillas precompiladas + print_cache), para
+una comanda y para lotes de /tickets/print-batch.
+
+Crea un schema aparte (`bench_print`) con tickets e items y lo borra al final.
+
+    cd Backend
+    python -m benchmarks.bench_print --tickets 500 --items 6 --batch 30
+"""
+from __future__ import annotations
+
+import argparse
+
+from sqlalchemy import create_engine, text
+from sqlalchemy.orm import Session, selectinload
+
+from app.core.config import settings
+from app.core.read_cache import print_cache
+from app.db.session import engine
+from app.models.ticket import KitchenTicket
+from app.services.print_service import render_print_batch
+from benchmarks._common import measure, print_table
+
+SCHEMA = "bench_print"
+
+_TABLES = (
+    "kitchen_tickets",
+    "kitchen_ticket_items",
+    "kitchen_tickets_archive",
+    "kitchen_ticket_items_archive",
+)
+
+
+def _setup(tickets: int, items: int) -> None:
+    with engine.begin() as conn:
+        conn.execute(text(f"DROP SCHEMA IF EXISTS {SCHEMA} CASCADE"))
+        conn.execute(text(f"CREATE SCHEMA {SCHEMA}"))
+        for table in _TABLES:
+            conn.execute(text(f"CREATE TABLE {SCHEMA}.{table} (LIKE public.{table} INCLUDING ALL)"))
+        conn.execute(
+            text(
+                f"""
+                INSERT INTO {SCHEMA}.kitchen_tickets (
+                  id, pos_docto_guid, pos_id_cia, pos_tipo_docto, pos_consec_docto,
+                  mesa_ref, mesero_nombre, hora_pedido, status, comanda_number, version
+                )
+                SELECT gen_random_uuid(), gen_random_uuid(), 1, '01f', g, (1 + g % 40)::text,
+                       'Mesero ' || (g % 12), now() - g * interval '1 minute', 'PENDIENTE', g, g
+                FROM generate_series(1, :n) g
+                """
+            ),
+            {"n": tickets},
+        )
+        conn.execute(
+            text(
+                f"""
+                INSERT INTO {SCHEMA}.kitchen_ticket_items (
+                  id, ticket_id, pos_movto_guid, pos_rowid_item_ext, product_name, qty, unidad, status
+                )
+                SELECT gen_random_uuid(), t.id, gen_random_uuid(), k, 'Producto ' || k || ' <sin cebolla>',
+                       1 + k % 3, 'UND', 'PENDIENTE'
+                FROM {SCHEMA}.kitchen_tickets t, generate_series(1, :k) k
+                """
+            ),
+            {"k": items},
+        )
+        for table in _TABLES:
+            conn.execute(text(f"ANALYZE {SCHEMA}.{table}"))
+
+
+def _legacy_print(db: Session, ticket_id, width: int) -> str:
+    # Lo que hacía print_ticket: ORM con selectinload, commit antes de renderizar
+    # (aquí sin el evento, que iría a ticket_events de public) y HTML con f-strings.
+    ticket = (
+        db.query(KitchenTicket)
+        .options(selectinload(KitchenTicket.items))
+        .filter(KitchenTicket.id == ticket_id)
+        .first()
+    )
+    db.commit()
+    items_html = ""
+    for it in ticket.items:
+        name = (it.product_name or "").strip()
+        items_html += f"""
+          <tr>
+            <td style="width:18%; text-align:right; padding:2px 0;"><strong>{float(it.qty):g}</strong></td>
+            <td style="width:82%; padding:2px 0 2px 8px;">{name}</td>
+          </tr>
+        """
+    return f"""<!doctype html><html><head><title>Comanda #{ticket.comanda_number}</title>
+<style>@page {{ size: {width}mm auto; margin: 4mm; }}</style></head><body>
+<h1>COMANDA #{ticket.comanda_number or ""}</h1>
+<div><strong>Mesa:</strong> {ticket.mesa_ref or ""}</div><div><strong>Pedido:</strong> {ticket.pos_consec_docto or ""}</div>
+<div><strong>Mesero:</strong> {ticket.mesero_nombre or ""}</div><div>{ticket.hora_pedido.astimezone().strftime("%Y-%m-%d %H:%M")}</div>
+<table>{items_html}</table><div>Estado: <strong>{ticket.status.value}</strong></div></body></html>"""
+
+
+def main() -> None:
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--tickets", type=int, default=500)
+    ap.add_argument("--items", type=int, default=6)
+    ap.add_argument("--batch", type=int, default=30)
+    ap.add_argument("--runs", type=int, default=200)
+    args = ap.parse_args()
+
+    print(f"Preparando {args.tickets:,} tickets x {args.items} items en {SCHEMA}...")
+    _setup(args.tickets, args.items)
+
+    bench_engine = create_engine(settings.DATABASE_URL, connect_args={"options": f"-csearch_path={SCHEMA},public"})
+    results = []
+    try:
+        with Session(bind=bench_engine) as db:
+            ids = [r[0] for r in db.execute(text("SELECT id FROM kitchen_tickets ORDER BY id"))]
+            one = ids[0]
+            batch = ids[: args.batch]
+
+            def cold_one():
+                print_cache.clear()
+                return render_print_batch(db, [one], width=80)
+
+            def cold_batch():
+                print_cache.clear()
+                return render_print_batch(db, batch, width=80)
+
+            results.append(("anterior: una comanda", measure(lambda: _legacy_print(db, one, 80), runs=args.runs)))
+            results.append(("anterior: lote (N llamadas)", measure(
+                lambda: [_legacy_print(db, tid, 80) for tid in batch], runs=max(5, args.runs // 10)
+            )))
+            results.append(("plantilla: una comanda, sin cache", measure(cold_one, runs=args.runs)))
+            results.append(("plantilla: una comanda, en cache", measure(
+                lambda: render_print_batch(db, [one], width=80), runs=args.runs
+            )))
+            results.append((f"print-batch {len(batch)}, sin cache", measure(cold_batch, runs=max(5, args.runs // 10))))
+            results.append((f"print-batch {len(batch)}, en cache", measure(
+                lambda: render_print_batch(db, batch, width=80), runs=args.runs
+            )))
+    finally:
+        bench_engine.dispose()
+        print_cache.clear()
+        with engine.begin() as conn:
+            conn.execute(text(f"DROP SCHEMA IF EXISTS {SCHEMA} CASCADE"))
+
+    print_table("Impresión de comandas", results)
+
+
+if __name__ == "__main__":
+    main()
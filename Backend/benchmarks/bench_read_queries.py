@@ -0,0 +1,146 @@
+"""
+Consultas y latencia de los listados antes/después del read-model
+(app/services/ticket_read_service.py).
+
+"antes" reproduce el camino anterior: objetos ORM con items por selectin
+(KitchenTicket.items era lazy="selectin") y SyncRun completos.
+
+    cd Backend
+    python -m benchmarks.bench_read_queries --tickets 5000 --items 4
+"""
+from __future__ import annotations
+
+import argparse
+
+from sqlalchemy import event, text
+from sqlalchemy.orm import Session, selectinload
+
+from app.db.session import engine
+from app.models.sync_run import SyncRun
+from app.models.ticket import KitchenTicket
+from app.services.ticket_read_service import list_sync_run_rows, list_ticket_cards
+from benchmarks._common import measure, print_table
+
+SCHEMA = "bench_reads"
+
+
+def _setup(tickets: int, items: int) -> None:
+    with engine.begin() as conn:
+        conn.execute(text(f"DROP SCHEMA IF EXISTS {SCHEMA} CASCADE"))
+        conn.execute(text(f"CREATE SCHEMA {SCHEMA}"))
+        # *_archive vacías: el listado lee caliente + archivo
+        for table in ("kitchen_tickets", "kitchen_ticket_items", "sync_runs", "kitchen_tickets_archive", "kitchen_ticket_items_archive"):
+            conn.execute(text(f"CREATE TABLE {SCHEMA}.{table} (LIKE public.{table} INCLUDING ALL)"))
+        conn.execute(
+            text(
+                f"""
+                INSERT INTO {SCHEMA}.kitchen_tickets (
+                  id, pos_docto_guid, pos_id_cia, pos_tipo_docto, pos_consec_docto,
+                  mesa_ref, mesero_nombre, hora_pedido, status, comanda_number
+                )
+                SELECT gen_random_uuid(), gen_random_uuid(), 1, '01f', g, (1 + g % 40)::text,
+                       'Mesero ' || (g % 9), now() - (g || ' seconds')::interval, 'PENDIENTE', g
+                FROM generate_series(1, :n) g
+                """
+            ),
+            {"n": tickets},
+        )
+        conn.execute(
+            text(
+                f"""
+                INSERT INTO {SCHEMA}.kitchen_ticket_items (
+                  id, ticket_id, pos_movto_guid, pos_rowid_item_ext, product_name, qty, unidad, status
+                )
+                SELECT gen_random_uuid(), t.id, gen_random_uuid(), k, 'Producto ' || k, 1, 'UND', 'PENDIENTE'
+                FROM {SCHEMA}.kitchen_tickets t, generate_series(1, :k) k
+                """
+            ),
+            {"k": items},
+        )
+        conn.execute(
+            text(
+                f"""
+                INSERT INTO {SCHEMA}.sync_runs (id, source, mode, status, started_at)
+                SELECT gen_random_uuid(), 'SIESA', 'AUTO', 'SUCCESS', now() - (g || ' minutes')::interval
+                FROM generate_series(1, 500) g
+                """
+            )
+        )
+        conn.execute(text(f"ANALYZE {SCHEMA}.kitchen_tickets"))
+        conn.execute(text(f"ANALYZE {SCHEMA}.kitchen_ticket_items"))
+
+
+class _QueryCounter:
+    def __init__(self, bind):
+        self.count = 0
+        event.listen(bind, "before_cursor_execute", self._on)
+
+    def _on(self, *args, **kwargs):
+        self.count += 1
+
+
+def main() -> None:
+    # Import tardío: los modelos de salida viven en los routers.
+    from app.routers.siesa_sync import SyncRunOut
+    from app.routers.tickets import TicketCardOut
+
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--tickets", type=int, default=5000)
+    ap.add_argument("--items", type=int, default=4)
+    ap.add_argument("--limit", type=int, default=1000)
+    ap.add_argument("--runs", type=int, default=20)
+    args = ap.parse_args()
+
+    print(f"Preparando {args.tickets:,} tickets x {args.items} items en {SCHEMA}...")
+    _setup(args.tickets, args.items)
+
+    bench_engine = engine.execution_options(schema_translate_map={None: SCHEMA})
+    counter = _QueryCounter(engine)
+
+    def cards_before(db: Session):
+        rows = (
+            db.query(KitchenTicket)
+            .options(selectinload(KitchenTicket.items))
+            .order_by(KitchenTicket.hora_pedido.desc())
+            .limit(args.limit)
+            .all()
+        )
+        out = [TicketCardOut.model_validate(r) for r in rows]
+        db.expunge_all()
+        return out
+
+    def cards_after(db: Session):
+        rows, _ = list_ticket_cards(db, status=None, q=None, limit=args.limit, cursor=None)
+        return [TicketCardOut.model_validate(r) for r in rows]
+
+    def runs_before(db: Session):
+        rows = db.query(SyncRun).filter(SyncRun.source == "SIESA").order_by(SyncRun.started_at.desc()).limit(200).all()
+        out = [SyncRunOut.model_validate(r) for r in rows]
+        db.expunge_all()
+        return out
+
+    def runs_after(db: Session):
+        return [SyncRunOut.model_validate(r) for r in list_sync_run_rows(db, source="SIESA", limit=200)]
+
+    results = []
+    try:
+        with Session(bind=bench_engine) as db:
+            for name, fn in (
+                (f"/tickets antes (limit {args.limit})", cards_before),
+                (f"/tickets después (limit {args.limit})", cards_after),
+                ("/admin/sync/runs antes (200)", runs_before),
+                ("/admin/sync/runs después (200)", runs_after),
+            ):
+                counter.count = 0
+                fn(db)
+                queries = counter.count
+                results.append((f"{name} [{queries} q]", measure(lambda: fn(db), runs=args.runs, warmup=2)))
+    finally:
+        with engine.begin() as conn:
+            conn.execute(text(f"DROP SCHEMA IF EXISTS {SCHEMA} CASCADE"))
+
+    print_table("Listados: consultas por request y latencia", results)
+
+
+if __name__ == "__main__":
+    main()
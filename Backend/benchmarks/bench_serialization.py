@@ -0,0 +1,105 @@
+"""
+Microbenchmark de serialización (sin DB) para las lecturas calientes.
+
+Compara, sobre las mismas filas en memoria:
+  - fastapi: camino original (response_model -> validación + jsonable_encoder + json.dumps)
+  - typeadapter: Pydantic v2 TypeAdapter.dump_json
+  - orjson: filas -> dicts -> orjson (app/core/fast_json.py)
+y el costo/beneficio de gzip sobre el cuerpo resultante.
+
+    cd Backend
+    python -m benchmarks.bench_serialization --tickets 300 --items 5
+"""
+from __future__ import annotations
+
+import argparse
+import json
+import random
+import uuid
+from datetime import datetime, timedelta, timezone
+from decimal import Decimal
+from types import SimpleNamespace
+
+from fastapi.encoders import jsonable_encoder
+from pydantic import TypeAdapter
+
+from app.core.fast_json import maybe_gzip, rows_json
+from app.models.ticket import ItemStatus, TicketStatus
+from app.routers.tickets import TicketDetailOut, TicketItemOut
+from app.services.ticket_read_service import ItemRow, TicketRow
+from benchmarks._common import measure, print_table
+
+
+def _rows(tickets: int, items: int) -> list[TicketRow]:
+    # Mismos tipos que devuelve la DB (qty Numeric -> Decimal, fechas con tz).
+    now = datetime.now(timezone.utc)
+    rows = []
+    for n in range(tickets):
+        ticket_id = uuid.uuid4()
+        row = SimpleNamespace(
+            id=ticket_id,
+            mesa_ref=str(1 + n % 40),
+            mesero_nombre=f"Mesero {n % 12}",
+            pos_consec_docto=100000 + n,
+            comanda_number=n,
+            status=random.choice(list(TicketStatus)),
+            hora_pedido=now - timedelta(minutes=n),
+            hora_preparacion=None,
+            hora_entrega=None,
+        )
+        item_rows = [
+            ItemRow(
+                SimpleNamespace(
+                    ticket_id=ticket_id,
+                    id=uuid.uuid4(),
+                    qty=Decimal(1 + i % 3),
+                    product_name=f"Producto {i}",
+                    unidad="UND",
+                    status=random.choice(list(ItemStatus)),
+                )
+            )
+            for i in range(items)
+        ]
+        rows.append(TicketRow(row, item_rows))
+    return rows
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--tickets", type=int, default=300)
+    parser.add_argument("--items", type=int, default=5)
+    parser.add_argument("--runs", type=int, default=50)
+    args = parser.parse_args()
+
+    rows = _rows(args.tickets, args.items)
+    adapter = TypeAdapter(list[TicketDetailOut])
+    fields = tuple(TicketDetailOut.model_fields)
+    item_fields = tuple(TicketItemOut.model_fields)
+
+    def _fastapi():
+        validated = [TicketDetailOut.model_validate(r, from_attributes=True) for r in rows]
+        return json.dumps(jsonable_encoder(validated)).encode()
+
+    def _typeadapter():
+        return adapter.dump_json(adapter.validate_python(rows, from_attributes=True))
+
+    def _orjson():
+        return rows_json(rows, fields, item_fields=item_fields)
+
+    body = _orjson()
+
+    print_table(
+        f"serialización {args.tickets} tickets x {args.items} items",
+        [
+            ("fastapi (validate + jsonable_encoder)", measure(_fastapi, runs=args.runs)),
+            ("pydantic TypeAdapter.dump_json", measure(_typeadapter, runs=args.runs)),
+            ("orjson rows_json", measure(_orjson, runs=args.runs)),
+            ("gzip del cuerpo", measure(lambda: maybe_gzip(body), runs=args.runs)),
+        ],
+    )
+    gz = maybe_gzip(body)
+    print(f"\ncuerpo: {len(body)} bytes, gzip: {len(gz) if gz else '-'} bytes")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,106 @@
+"""
+Latencia de GET /tickets?q=... con N tickets (por defecto 1M).
+
+Crea un schema aparte (`bench_search`) con la misma estructura e índices que
+kitchen_tickets, lo llena con generate_series y compara la consulta anterior
+(ILIKE + OR numérico) contra app/services/ticket_search_service.py.
+
+    cd Backend
+    python -m benchmarks.bench_ticket_search --rows 1000000
+"""
+from __future__ import annotations
+
+import argparse
+
+from sqlalchemy import or_, text
+from sqlalchemy.orm import Session
+
+from app.db.session import engine
+from app.models.ticket import KitchenTicket
+from app.services.ticket_search_service import search_condition, search_ranking
+from benchmarks._common import measure, print_table
+
+SCHEMA = "bench_search"
+
+
+def _setup(rows: int) -> None:
+    with engine.begin() as conn:
+        conn.execute(text(f"DROP SCHEMA IF EXISTS {SCHEMA} CASCADE"))
+        conn.execute(text(f"CREATE SCHEMA {SCHEMA}"))
+        conn.execute(text(f"CREATE TABLE {SCHEMA}.kitchen_tickets (LIKE public.kitchen_tickets INCLUDING ALL)"))
+        # Vacía: solo para que la carga de items del ORM no falle.
+        conn.execute(text(f"CREATE TABLE {SCHEMA}.kitchen_ticket_items (LIKE public.kitchen_ticket_items INCLUDING ALL)"))
+        conn.execute(
+            text(
+                f"""
+                INSERT INTO {SCHEMA}.kitchen_tickets (
+                  id, pos_docto_guid, pos_id_cia, pos_co, pos_tipo_docto, pos_consec_docto,
+                  mesa_ref, mesero_nombre, hora_pedido, status, comanda_number, notas
+                )
+                SELECT
+                  gen_random_uuid(), gen_random_uuid(), 1, '001', '01f', 100000 + g,
+                  (1 + g % 60)::text,
+                  (ARRAY['Carlos Pérez','Ana Gómez','Luis Martínez','Diana Ruiz','Jorge Díaz'])[1 + g % 5] || ' ' || (g % 97),
+                  now() - (g || ' seconds')::interval,
+                  (ARRAY['PENDIENTE','EN_PREPARACION','PARCIAL','LISTO','CANCELADO'])[1 + g % 5]::ticket_status,
+                  g,
+                  CASE WHEN g % 7 = 0 THEN 'sin cebolla, término medio' ELSE NULL END
+                FROM generate_series(1, :rows) g
+                """
+            ),
+            {"rows": rows},
+        )
+        conn.execute(text(f"ANALYZE {SCHEMA}.kitchen_tickets"))
+
+
+def _legacy(qry, q: str):
+    qq = f"%{q.strip()}%"
+    conditions = [
+        KitchenTicket.mesa_ref.ilike(qq),
+        KitchenTicket.mesero_nombre.ilike(qq),
+        KitchenTicket.notas.ilike(qq),
+    ]
+    if q.strip().isdigit():
+        n = int(q.strip())
+        conditions.extend([KitchenTicket.pos_consec_docto == n, KitchenTicket.comanda_number == n])
+    return qry.filter(or_(*conditions)).order_by(KitchenTicket.hora_pedido.desc())
+
+
+def _current(qry, q: str):
+    ranking = search_ranking(q)
+    order = ranking if ranking is not None else [KitchenTicket.hora_pedido.desc(), KitchenTicket.id.desc()]
+    return qry.filter(search_condition(q)).order_by(*order)
+
+
+def main() -> None:
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--rows", type=int, default=1_000_000)
+    ap.add_argument("--runs", type=int, default=30)
+    ap.add_argument("--keep", action="store_true", help="no borrar el schema al terminar")
+    args = ap.parse_args()
+
+    print(f"Preparando {args.rows:,} tickets en {SCHEMA}...")
+    _setup(args.rows)
+
+    bench_engine = engine.execution_options(schema_translate_map={None: SCHEMA})
+    queries = ["12345", "42", "ana", "gómez 5", "cebolla"]
+    results = []
+    try:
+        with Session(bind=bench_engine) as db:
+            for q in queries:
+                for label, build in (("antes", _legacy), ("después", _current)):
+                    def run(q=q, build=build):
+                        return build(db.query(KitchenTicket), q).limit(200).all()
+
+                    results.append((f"{label:<8} q={q!r}", measure(run, runs=args.runs)))
+                    db.expunge_all()
+    finally:
+        if not args.keep:
+            with engine.begin() as conn:
+                conn.execute(text(f"DROP SCHEMA IF EXISTS {SCHEMA} CASCADE"))
+
+    print_table(f"Búsqueda de tickets ({args.rows:,} filas, limit 200)", results)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,253 @@
+"""
+Prueba de carga: endpoints de tickets sync (como eran: `def` + Session en el
+threadpool) contra los async de app/routers/tickets.py (AsyncSession, psycopg async),
+con 50, 200 y 1000 clientes concurrentes. Mide requests/s y p50/p99.
+
+Cada app corre en su propio uvicorn (subproceso, un worker). La mezcla de requests:
+tablero y detalle (cache caliente, como el polling real), /tickets/stats (va a la DB
+en cada poll) y una fracción --slow-share de requests que sostienen la conexión
+--slow-ms (pg_sleep), como una transacción lenta del sync con Siesa.
+Usa los tickets del tablero de DATABASE_URL; no escribe nada.
+
+El cliente (httpx) gasta más CPU por request que el servidor: repartirlo en varios
+procesos (--procs) en una máquina con cores libres, o el límite medido es el
+generador de carga y no el servidor.
+
+    cd Backend
+    pip install -r requirements-bench.txt
+    python -m benchmarks.load_test --clients 50,200,1000 --seconds 15 --procs 4
+"""
+from __future__ import annotations
+
+import argparse
+import asyncio
+import random
+import subprocess
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+from uuid import UUID
+
+import httpx
+from fastapi import APIRouter, Depends, FastAPI, HTTPException, Request
+from sqlalchemy import create_engine, text
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session, sessionmaker
+
+from app.core.config import settings
+from app.core.fast_json import dumps, row_dict
+from app.core.http_cache import cached_json_response, coalesced_json_response
+from app.core.read_cache import ticket_read_cache
+from app.db.async_session import get_async_db
+from app.routers.tickets import _DETAIL_FIELDS, _ITEM_FIELDS, router as tickets_router
+from app.services.ticket_board_service import board_json, board_stats
+from app.services.ticket_read_service import get_ticket_row
+from app.services.ticket_version_service import board_version, ticket_version
+
+# ---------- app sync: los mismos endpoints como estaban antes del stack async ----------
+# Mismo tamaño de pool que el engine async para comparar solo el modelo de concurrencia.
+_sync_engine = create_engine(
+    settings.DATABASE_URL,
+    pool_pre_ping=True,
+    pool_size=settings.ASYNC_DB_POOL_SIZE,
+    max_overflow=settings.ASYNC_DB_MAX_OVERFLOW,
+    pool_timeout=settings.ASYNC_DB_POOL_TIMEOUT_SECONDS,
+)
+_SyncSession = sessionmaker(bind=_sync_engine, autoflush=False, autocommit=False)
+
+
+def _sync_db():
+    db = _SyncSession()
+    try:
+        yield db
+    finally:
+        db.close()
+
+
+_sync_router = APIRouter(prefix="/tickets")
+
+
+@_sync_router.get("/board")
+def _sync_board(request: Request, db: Session = Depends(_sync_db)):
+    return cached_json_response(
+        request, cache=ticket_read_cache, key=("board",), version=lambda: board_version(db), build=lambda: board_json(db)
+    )
+
+
+@_sync_router.get("/stats")
+def _sync_stats(request: Request, db: Session = Depends(_sync_db)):
+    return coalesced_json_response(request, ("stats",), lambda: dumps(board_stats(db)))
+
+
+@_sync_router.get("/{ticket_id}")
+def _sync_detail(ticket_id: UUID, request: Request, db: Session = Depends(_sync_db)):
+    def _version() -> int:
+        version = ticket_version(db, ticket_id)
+        if version is None:
+            raise HTTPException(status_code=404, detail="Ticket no encontrado")
+        return version
+
+    def _build() -> bytes:
+        ticket = get_ticket_row(db, ticket_id, with_items=True)
+        return dumps(row_dict(ticket, _DETAIL_FIELDS, item_fields=_ITEM_FIELDS))
+
+    return cached_json_response(
+        request, cache=ticket_read_cache, key=("detail", str(ticket_id)), version=_version, build=_build
+    )
+
+
+_sync_slow = APIRouter()
+
+
+@_sync_slow.get("/_load/slow")
+def _sync_slow_tx(ms: int, db: Session = Depends(_sync_db)):
+    db.execute(text("SELECT pg_sleep(:s)"), {"s": ms / 1000})
+    return {"ok": True}
+
+
+sync_app = FastAPI()
+sync_app.include_router(_sync_router)
+sync_app.include_router(_sync_slow)
+sync_app.add_api_route("/health", lambda: {"status": "ok"})
+
+# ---------- app async: el router real ----------
+_async_slow = APIRouter()
+
+
+@_async_slow.get("/_load/slow")
+async def _async_slow_tx(ms: int, db: AsyncSession = Depends(get_async_db)):
+    await db.execute(text("SELECT pg_sleep(:s)"), {"s": ms / 1000})
+    return {"ok": True}
+
+
+async_app = FastAPI()
+async_app.include_router(tickets_router)
+async_app.include_router(_async_slow)
+async_app.add_api_route("/health", lambda: {"status": "ok"})
+
+
+# ---------- generador de carga ----------
+def _percentile(samples: list[float], p: float) -> float:
+    return samples[min(len(samples) - 1, int(len(samples) * p))] if samples else 0.0
+
+
+async def _load(base_url: str, *, clients: int, seconds: float, ticket_ids: list[str], slow_share: float, slow_ms: int) -> tuple[list[float], int, float]:
+    """(latencias en ms de las respuestas 200, errores, segundos)."""
+    lat: list[float] = []
+    errors = 0
+    limits = httpx.Limits(max_connections=clients, max_keepalive_connections=clients)
+    async with httpx.AsyncClient(base_url=base_url, limits=limits, timeout=60) as client:
+        deadline = time.perf_counter() + seconds
+
+        async def _client():
+            nonlocal errors
+            rnd = random.Random()
+            while time.perf_counter() < deadline:
+                x = rnd.random()
+                if x < slow_share:
+                    path = f"/_load/slow?ms={slow_ms}"
+                elif x < 0.45:
+                    path = "/tickets/board"
+                elif x < 0.75:
+                    path = "/tickets/stats"
+                else:
+                    path = f"/tickets/{rnd.choice(ticket_ids)}"
+                t0 = time.perf_counter()
+                try:
+                    r = await client.get(path)
+                    ok = r.status_code == 200
+                except httpx.HTTPError:
+                    ok = False
+                if ok:
+                    lat.append((time.perf_counter() - t0) * 1000)
+                else:
+                    errors += 1
+
+        t0 = time.perf_counter()
+        await asyncio.gather(*(_client() for _ in range(clients)))
+        elapsed = time.perf_counter() - t0
+    return lat, errors, elapsed
+
+
+def _load_proc(kwargs: dict) -> tuple[list[float], int, float]:
+    return asyncio.run(_load(**kwargs))
+
+
+def _run_level(procs: int, clients: int, **kwargs) -> dict:
+    # Los clientes se reparten entre `procs` procesos generadores
+    shares = [clients // procs + (1 if i < clients % procs else 0) for i in range(procs)]
+    jobs = [dict(kwargs, clients=n) for n in shares if n]
+    if len(jobs) == 1:
+        parts = [_load_proc(jobs[0])]
+    else:
+        with ProcessPoolExecutor(max_workers=len(jobs)) as ex:
+            parts = list(ex.map(_load_proc, jobs))
+    lat = sorted(x for part in parts for x in part[0])
+    elapsed = max(part[2] for part in parts)
+    return {
+        "rps": len(lat) / elapsed,
+        "p50_ms": _percentile(lat, 0.50),
+        "p99_ms": _percentile(lat, 0.99),
+        "errors": sum(part[1] for part in parts),
+    }
+
+
+def _serve(app_path: str, port: int) -> subprocess.Popen:
+    proc = subprocess.Popen(
+        [sys.executable, "-m", "uvicorn", app_path, "--port", str(port), "--log-level", "warning", "--backlog", "4096"],
+    )
+    for _ in range(100):
+        try:
+            if httpx.get(f"http://127.0.0.1:{port}/health", timeout=1).status_code == 200:
+                return proc
+        except httpx.HTTPError:
+            pass
+        time.sleep(0.2)
+    proc.terminate()
+    raise RuntimeError(f"{app_path} no arrancó")
+
+
+def main() -> None:
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--clients", default="50,200,1000")
+    ap.add_argument("--seconds", type=float, default=15)
+    ap.add_argument("--slow-share", type=float, default=0.02, help="Fracción de requests con transacción lenta")
+    ap.add_argument("--slow-ms", type=int, default=500)
+    ap.add_argument("--port", type=int, default=8765)
+    ap.add_argument("--procs", type=int, default=1, help="Procesos generadores de carga")
+    args = ap.parse_args()
+    levels = [int(c) for c in args.clients.split(",")]
+
+    with _sync_engine.connect() as conn:
+        ticket_ids = [str(r[0]) for r in conn.execute(text("SELECT ticket_id FROM ticket_board LIMIT 200"))]
+    if not ticket_ids:
+        sys.exit("ticket_board está vacío: sembrar tickets antes (POST /dev/seed-demo o sync)")
+
+    results = []
+    for name, app_path in (("sync", "benchmarks.load_test:sync_app"), ("async", "benchmarks.load_test:async_app")):
+        proc = _serve(app_path, args.port)
+        try:
+            for clients in levels:
+                r = _run_level(
+                    max(1, args.procs),
+                    clients,
+                    base_url=f"http://127.0.0.1:{args.port}",
+                    seconds=args.seconds,
+                    ticket_ids=ticket_ids,
+                    slow_share=args.slow_share,
+                    slow_ms=args.slow_ms,
+                )
+                results.append((name, clients, r))
+                print(f"{name:<6} {clients:>5} clientes: {r['rps']:>8.1f} req/s  p99 {r['p99_ms']:.1f} ms")
+        finally:
+            proc.terminate()
+            proc.wait()
+
+    print(f"\n== Carga ({args.seconds:g}s por nivel, {args.slow_share:.0%} transacciones de {args.slow_ms} ms)")
+    print(f"{'stack':<8} {'clientes':>8} {'req/s':>10} {'p50':>10} {'p99':>10} {'errores':>8}")
+    for name, clients, r in results:
+        print(f"{name:<8} {clients:>8} {r['rps']:>10.1f} {r['p50_ms']:>8.1f}ms {r['p99_ms']:>8.1f}ms {r['errors']:>8}")
+
+
+if __name__ == "__main__":
+    main()
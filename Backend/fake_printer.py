@@ -0,0 +1,93 @@
+"""
+Impresora ESC/POS de mentira para probar el spooler sin hardware: escucha en el
+puerto "raw" (9100), separa los trabajos por el comando de corte y muestra cada
+comanda como texto (o guarda los bytes crudos con --out).
+
+    cd Backend
+    python fake_printer.py --port 9100
+    # .env: PRINTERS=cocina=127.0.0.1:9100
+
+--delay-ms simula una impresora lenta; --drop-every N corta la conexión en cada
+N-ésimo envío para ver los reintentos.
+"""
+from __future__ import annotations
+
+import argparse
+import re
+import socketserver
+import threading
+import time
+from pathlib import Path
+
+CUT = b"\x1dV"
+STATUS_REQUEST = b"\x10\x04"
+ONLINE = b"\x16"  # respuesta a DLE EOT 1: en línea, sin errores
+# ESC x [n], GS x n, DLE EOT n: los comandos que genera app/services/escpos_service.py
+_COMMANDS = re.compile(rb"\x1b[@]|\x1b[taEd].|\x1d[!].|\x1dV..|\x10\x04.")
+
+_lock = threading.Lock()
+_counter = {"jobs": 0, "recv": 0}
+
+
+def _job_text(raw: bytes) -> str:
+    return _COMMANDS.sub(b"", raw).decode("cp850", "replace").rstrip()
+
+
+def main() -> None:
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--host", default="127.0.0.1")
+    ap.add_argument("--port", type=int, default=9100)
+    ap.add_argument("--delay-ms", type=int, default=0, help="Pausa por trabajo (impresora lenta)")
+    ap.add_argument("--drop-every", type=int, default=0, help="Cierra la conexión en cada N-ésimo envío")
+    ap.add_argument("--out", type=Path, default=None, help="Carpeta donde guardar cada trabajo (.bin)")
+    ap.add_argument("--quiet", action="store_true", help="No mostrar el texto de las comandas")
+    args = ap.parse_args()
+    if args.out:
+        args.out.mkdir(parents=True, exist_ok=True)
+
+    class Handler(socketserver.BaseRequestHandler):
+        def handle(self):
+            peer = "%s:%s" % self.client_address
+            print(f"[fake-printer] conexión de {peer}")
+            buf = b""
+            while True:
+                chunk = self.request.recv(65536)
+                if not chunk:
+                    break
+                with _lock:
+                    _counter["recv"] += 1
+                    drop = args.drop_every and _counter["recv"] % args.drop_every == 0
+                if drop:
+                    print(f"[fake-printer] cortando la conexión de {peer} (--drop-every)")
+                    return
+                buf += chunk
+                # El spooler pide el estado al final de cada envío
+                for _ in range(chunk.count(STATUS_REQUEST)):
+                    self.request.sendall(ONLINE)
+                # Un trabajo termina en GS V m n (corte)
+                while (i := buf.find(CUT)) >= 0 and len(buf) >= i + 4:
+                    job, buf = buf[: i + 4], buf[i + 4 :]
+                    with _lock:
+                        _counter["jobs"] += 1
+                        n = _counter["jobs"]
+                    if args.delay_ms:
+                        time.sleep(args.delay_ms / 1000)
+                    if args.out:
+                        (args.out / f"job_{n:05d}.bin").write_bytes(job)
+                    print(f"[fake-printer] trabajo #{n} ({len(job)} bytes)")
+                    if not args.quiet:
+                        print(_job_text(job))
+                        print("-" * 20 + " corte " + "-" * 20)
+            print(f"[fake-printer] {peer} cerró la conexión")
+
+    socketserver.ThreadingTCPServer.allow_reuse_address = True
+    with socketserver.ThreadingTCPServer((args.host, args.port), Handler) as server:
+        print(f"[fake-printer] escuchando en {args.host}:{args.port}")
+        try:
+            server.serve_forever()
+        except KeyboardInterrupt:
+            pass
+
+
+if __name__ == "__main__":
+    main()
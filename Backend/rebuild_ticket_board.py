@@ -0,0 +1,25 @@
+"""
+Reconstruye la proyección ticket_board desde kitchen_tickets / kitchen_ticket_items.
+
+    cd Backend
+    python rebuild_ticket_board.py
+"""
+from app.db.session import SessionLocal
+from app.services.cache_invalidation_service import publish_board_change
+from app.services.ticket_board_service import rebuild_ticket_board
+
+
+def main():
+    db = SessionLocal()
+    try:
+        n = rebuild_ticket_board(db)
+        publish_board_change(db)
+        db.commit()
+    finally:
+        db.close()
+
+    print(f"✅ ticket_board reconstruido: {n} tickets activos")
+
+
+if __name__ == "__main__":
+    main()
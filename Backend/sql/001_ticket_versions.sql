@@ -0,0 +1,11 @@
+-- Versiones por ticket para ETags (GET /tickets y /tickets/{id}).
+-- Cada mutación asigna nextval() al ticket. La versión del tablero es un hash de
+-- count/sum/max(version) de kitchen_tickets más ticket_archive_state (009): max() solo
+-- no cambia si los commits llegan desordenados (ticket_version_service.board_version).
+
+CREATE SEQUENCE IF NOT EXISTS kitchen_board_version_seq;
+
+ALTER TABLE kitchen_tickets
+  ADD COLUMN IF NOT EXISTS version bigint NOT NULL DEFAULT nextval('kitchen_board_version_seq');
+
+CREATE INDEX IF NOT EXISTS ix_kitchen_tickets_version ON kitchen_tickets (version);
@@ -0,0 +1,15 @@
+-- Búsqueda de tickets (GET /tickets?q=...), ver app/services/ticket_search_service.py
+
+CREATE EXTENSION IF NOT EXISTS pg_trgm;
+
+-- Camino numérico: #comanda / #pedido exactos
+CREATE INDEX IF NOT EXISTS ix_kitchen_tickets_comanda_number ON kitchen_tickets (comanda_number);
+CREATE INDEX IF NOT EXISTS ix_kitchen_tickets_pos_consec_docto ON kitchen_tickets (pos_consec_docto);
+
+-- Prefijo de mesa (lower(mesa_ref) LIKE 'x%')
+CREATE INDEX IF NOT EXISTS ix_kitchen_tickets_mesa_prefix ON kitchen_tickets (lower(mesa_ref) text_pattern_ops);
+
+-- Camino de texto: ILIKE '%x%' + similarity()
+CREATE INDEX IF NOT EXISTS ix_kitchen_tickets_mesa_trgm ON kitchen_tickets USING gin (mesa_ref gin_trgm_ops);
+CREATE INDEX IF NOT EXISTS ix_kitchen_tickets_mesero_trgm ON kitchen_tickets USING gin (mesero_nombre gin_trgm_ops);
+CREATE INDEX IF NOT EXISTS ix_kitchen_tickets_notas_trgm ON kitchen_tickets USING gin (notas gin_trgm_ops);
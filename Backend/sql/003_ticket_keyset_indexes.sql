@@ -0,0 +1,7 @@
+-- Paginación keyset de GET /tickets sobre (hora_pedido, id)
+
+CREATE INDEX IF NOT EXISTS ix_kitchen_tickets_hora_pedido_id
+  ON kitchen_tickets (hora_pedido DESC, id DESC);
+
+CREATE INDEX IF NOT EXISTS ix_kitchen_tickets_status_hora_pedido_id
+  ON kitchen_tickets (status, hora_pedido DESC, id DESC);
@@ -0,0 +1,2 @@
+-- GET /tickets/board: items por ticket sin seq scan (la FK no crea índice en Postgres)
+CREATE INDEX IF NOT EXISTS ix_kitchen_ticket_items_ticket_id ON kitchen_ticket_items (ticket_id);
@@ -0,0 +1,25 @@
+-- Proyección del tablero (GET /tickets/board): una fila por ticket activo, items embebidos
+-- y conteos por estado. La mantienen las mutaciones y el sync en la misma transacción
+-- (app/services/ticket_board_service.py::refresh_ticket_board).
+-- Llenado inicial / reconstrucción: python rebuild_ticket_board.py
+CREATE TABLE IF NOT EXISTS ticket_board (
+  ticket_id            uuid PRIMARY KEY REFERENCES kitchen_tickets(id) ON DELETE CASCADE,
+  comanda_number       integer,
+  pos_consec_docto     integer,
+  mesa_ref             varchar(255),
+  mesero_nombre        varchar(255),
+  status               ticket_status NOT NULL,
+  hora_pedido          timestamptz NOT NULL,
+  hora_preparacion     timestamptz,
+  hora_entrega         timestamptz,
+  -- [[id, qty, product_name, unidad, status_idx], ...] (mismo formato que ITEM_FIELDS)
+  items                jsonb NOT NULL DEFAULT '[]'::jsonb,
+  items_pendiente      integer NOT NULL DEFAULT 0,
+  items_en_preparacion integer NOT NULL DEFAULT 0,
+  items_entregado      integer NOT NULL DEFAULT 0,
+  items_cancelado      integer NOT NULL DEFAULT 0,
+  version              bigint NOT NULL,
+  refreshed_at         timestamptz NOT NULL DEFAULT now()
+);
+
+CREATE INDEX IF NOT EXISTS ix_ticket_board_hora_pedido ON ticket_board (hora_pedido, ticket_id);
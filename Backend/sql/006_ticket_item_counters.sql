@@ -0,0 +1,38 @@
+-- Conteo de items por estado en cada ticket: el estado del ticket sale de 4 enteros
+-- en vez de recorrer todos los items (app/services/ticket_status_service.py).
+ALTER TABLE kitchen_tickets
+  ADD COLUMN IF NOT EXISTS items_pendiente      integer NOT NULL DEFAULT 0,
+  ADD COLUMN IF NOT EXISTS items_en_preparacion integer NOT NULL DEFAULT 0,
+  ADD COLUMN IF NOT EXISTS items_entregado      integer NOT NULL DEFAULT 0,
+  ADD COLUMN IF NOT EXISTS items_cancelado      integer NOT NULL DEFAULT 0;
+
+UPDATE kitchen_tickets t
+SET items_pendiente      = c.pendiente,
+    items_en_preparacion = c.en_preparacion,
+    items_entregado      = c.entregado,
+    items_cancelado      = c.cancelado
+FROM (
+  SELECT ticket_id,
+         count(*) FILTER (WHERE status = 'PENDIENTE')      AS pendiente,
+         count(*) FILTER (WHERE status = 'EN_PREPARACION') AS en_preparacion,
+         count(*) FILTER (WHERE status = 'ENTREGADO')      AS entregado,
+         count(*) FILTER (WHERE status = 'CANCELADO')      AS cancelado
+  FROM kitchen_ticket_items
+  GROUP BY ticket_id
+) c
+WHERE c.ticket_id = t.id;
+
+-- Misma regla que status_from_counts() en Python.
+CREATE OR REPLACE FUNCTION ticket_status_from_counts(
+  pendiente integer, en_preparacion integer, entregado integer, cancelado integer
+) RETURNS ticket_status
+LANGUAGE sql IMMUTABLE AS $$
+  SELECT CASE
+    WHEN pendiente + en_preparacion + entregado + cancelado = 0 THEN 'PENDIENTE'
+    WHEN pendiente + en_preparacion + entregado = 0 THEN 'CANCELADO'
+    WHEN pendiente + en_preparacion = 0 THEN 'LISTO'
+    WHEN entregado > 0 THEN 'PARCIAL'
+    WHEN en_preparacion > 0 THEN 'EN_PREPARACION'
+    ELSE 'PENDIENTE'
+  END::ticket_status
+$$;
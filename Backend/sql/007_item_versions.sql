@@ -0,0 +1,5 @@
+-- Control de concurrencia optimista por item: cada cambio toma nextval() de la misma
+-- secuencia que los tickets. Los clientes pueden mandar expected_version y el UPDATE
+-- solo aplica si coincide (app/services/ticket_status_service.py).
+ALTER TABLE kitchen_ticket_items
+  ADD COLUMN IF NOT EXISTS version bigint NOT NULL DEFAULT nextval('kitchen_board_version_seq');
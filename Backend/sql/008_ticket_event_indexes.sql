@@ -0,0 +1,13 @@
+-- Línea de tiempo por ticket (GET /tickets/{id}/events, con since_ts/since_id) y
+-- búsqueda de auditoría entre tickets (GET /events, keyset sobre (created_at, id)).
+CREATE INDEX IF NOT EXISTS ix_ticket_events_ticket_created
+  ON ticket_events (ticket_id, created_at, id);
+
+CREATE INDEX IF NOT EXISTS ix_ticket_events_created_id
+  ON ticket_events (created_at DESC, id DESC);
+
+CREATE INDEX IF NOT EXISTS ix_ticket_events_type_created
+  ON ticket_events (event_type, created_at DESC, id DESC);
+
+CREATE INDEX IF NOT EXISTS ix_ticket_events_user_created
+  ON ticket_events (user_name, created_at DESC, id DESC);
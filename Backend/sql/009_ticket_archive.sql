@@ -0,0 +1,36 @@
+-- Tickets terminados (LISTO / CANCELADO) pasan a tablas de archivo con sus items y
+-- eventos (app/services/ticket_archive_service.py). kitchen_tickets queda con lo
+-- activo y lo reciente; las lecturas de historial consultan ambas.
+CREATE TABLE IF NOT EXISTS kitchen_tickets_archive (LIKE kitchen_tickets INCLUDING DEFAULTS);
+ALTER TABLE kitchen_tickets_archive ADD COLUMN IF NOT EXISTS archived_at timestamptz NOT NULL DEFAULT now();
+CREATE UNIQUE INDEX IF NOT EXISTS ux_kitchen_tickets_archive_id ON kitchen_tickets_archive (id);
+CREATE UNIQUE INDEX IF NOT EXISTS ux_kitchen_tickets_archive_docto ON kitchen_tickets_archive (pos_docto_guid);
+CREATE INDEX IF NOT EXISTS ix_kitchen_tickets_archive_hora_pedido_id ON kitchen_tickets_archive (hora_pedido DESC, id DESC);
+CREATE INDEX IF NOT EXISTS ix_kitchen_tickets_archive_status_hora_pedido_id ON kitchen_tickets_archive (status, hora_pedido DESC, id DESC);
+CREATE INDEX IF NOT EXISTS ix_kitchen_tickets_archive_comanda_number ON kitchen_tickets_archive (comanda_number);
+CREATE INDEX IF NOT EXISTS ix_kitchen_tickets_archive_pos_consec_docto ON kitchen_tickets_archive (pos_consec_docto);
+CREATE INDEX IF NOT EXISTS ix_kitchen_tickets_archive_mesa_prefix ON kitchen_tickets_archive (lower(mesa_ref) text_pattern_ops);
+CREATE INDEX IF NOT EXISTS ix_kitchen_tickets_archive_mesa_trgm ON kitchen_tickets_archive USING gin (mesa_ref gin_trgm_ops);
+CREATE INDEX IF NOT EXISTS ix_kitchen_tickets_archive_mesero_trgm ON kitchen_tickets_archive USING gin (mesero_nombre gin_trgm_ops);
+CREATE INDEX IF NOT EXISTS ix_kitchen_tickets_archive_notas_trgm ON kitchen_tickets_archive USING gin (notas gin_trgm_ops);
+
+CREATE TABLE IF NOT EXISTS kitchen_ticket_items_archive (LIKE kitchen_ticket_items INCLUDING DEFAULTS);
+CREATE UNIQUE INDEX IF NOT EXISTS ux_kitchen_ticket_items_archive_id ON kitchen_ticket_items_archive (id);
+CREATE INDEX IF NOT EXISTS ix_kitchen_ticket_items_archive_ticket_id ON kitchen_ticket_items_archive (ticket_id);
+
+CREATE TABLE IF NOT EXISTS ticket_events_archive (LIKE ticket_events INCLUDING DEFAULTS);
+CREATE UNIQUE INDEX IF NOT EXISTS ux_ticket_events_archive_id ON ticket_events_archive (id);
+CREATE INDEX IF NOT EXISTS ix_ticket_events_archive_ticket_created ON ticket_events_archive (ticket_id, created_at, id);
+CREATE INDEX IF NOT EXISTS ix_ticket_events_archive_created_id ON ticket_events_archive (created_at DESC, id DESC);
+CREATE INDEX IF NOT EXISTS ix_ticket_events_archive_type_created ON ticket_events_archive (event_type, created_at DESC, id DESC);
+CREATE INDEX IF NOT EXISTS ix_ticket_events_archive_user_created ON ticket_events_archive (user_name, created_at DESC, id DESC);
+
+-- Una fila: versión del último archivado. Sacar tickets cambia el tablero sin tocar
+-- kitchen_tickets.version, así que board_version() también mira esta versión.
+CREATE TABLE IF NOT EXISTS ticket_archive_state (
+  id             smallint PRIMARY KEY DEFAULT 1 CHECK (id = 1),
+  version        bigint NOT NULL DEFAULT 0,
+  last_run_at    timestamptz,
+  archived_total bigint NOT NULL DEFAULT 0
+);
+INSERT INTO ticket_archive_state (id) VALUES (1) ON CONFLICT (id) DO NOTHING;
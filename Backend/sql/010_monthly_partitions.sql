@@ -0,0 +1,119 @@
+-- ticket_events, ticket_events_archive y sync_runs pasan a particiones mensuales por
+-- created_at / started_at. La retención borra particiones enteras (DROP TABLE) en vez de
+-- DELETE; sync_runs se resume por día en sync_run_daily antes de borrarse.
+-- Mantenimiento (particiones futuras + retención): app/services/partition_service.py
+--
+-- La conversión copia las filas existentes una vez: en tablas grandes correr en una
+-- ventana sin tráfico.
+SET TimeZone = 'UTC';
+
+-- Particiones <parent>_yYYYYmMM desde from_month hasta el mes actual + months_ahead.
+CREATE OR REPLACE FUNCTION ensure_monthly_partitions(parent text, from_month date, months_ahead int)
+RETURNS int LANGUAGE plpgsql AS $$
+DECLARE
+  m date := date_trunc('month', from_month)::date;
+  last_month date := (date_trunc('month', now() AT TIME ZONE 'UTC') + make_interval(months => months_ahead))::date;
+  part text;
+  created int := 0;
+BEGIN
+  WHILE m <= last_month LOOP
+    part := format('%s_y%sm%s', parent, to_char(m, 'YYYY'), to_char(m, 'MM'));
+    IF to_regclass(part) IS NULL THEN
+      EXECUTE format(
+        'CREATE TABLE %I PARTITION OF %I FOR VALUES FROM (%L) TO (%L)',
+        part, parent, m::timestamp AT TIME ZONE 'UTC', (m + interval '1 month')::timestamp AT TIME ZONE 'UTC'
+      );
+      created := created + 1;
+    END IF;
+    m := (m + interval '1 month')::date;
+  END LOOP;
+  RETURN created;
+END $$;
+
+-- Borra las particiones mensuales que terminan en o antes de `cutoff`. Devuelve sus nombres.
+CREATE OR REPLACE FUNCTION drop_monthly_partitions_before(parent text, cutoff timestamptz)
+RETURNS SETOF text LANGUAGE plpgsql AS $$
+DECLARE
+  part record;
+  month_start timestamptz;
+BEGIN
+  FOR part IN
+    SELECT c.relname,
+           substring(c.relname FROM '_y(\d{4})m\d{2}$') AS yyyy,
+           substring(c.relname FROM '_y\d{4}m(\d{2})$') AS mm
+    FROM pg_inherits i
+    JOIN pg_class c ON c.oid = i.inhrelid
+    WHERE i.inhparent = parent::regclass
+    ORDER BY c.relname
+  LOOP
+    CONTINUE WHEN part.yyyy IS NULL;
+    month_start := make_timestamptz(part.yyyy::int, part.mm::int, 1, 0, 0, 0, 'UTC');
+    IF month_start + interval '1 month' <= cutoff THEN
+      EXECUTE format('DROP TABLE %I', part.relname);
+      RETURN NEXT part.relname;
+    END IF;
+  END LOOP;
+END $$;
+
+-- Convierte una tabla normal en particionada por rango mensual de `key_column`
+-- (misma estructura, filas copiadas). No hace nada si ya está particionada.
+CREATE OR REPLACE FUNCTION convert_to_monthly_partitions(tbl text, key_column text, months_ahead int)
+RETURNS boolean LANGUAGE plpgsql AS $$
+DECLARE
+  lo date;
+BEGIN
+  IF (SELECT relkind FROM pg_class WHERE oid = tbl::regclass) = 'p' THEN
+    RETURN false;
+  END IF;
+  EXECUTE format('SELECT date_trunc(''month'', min(%I) AT TIME ZONE ''UTC'')::date FROM %I', key_column, tbl) INTO lo;
+  EXECUTE format('CREATE TABLE %I (LIKE %I INCLUDING DEFAULTS) PARTITION BY RANGE (%I)', tbl || '_part', tbl, key_column);
+  EXECUTE format('ALTER TABLE %I RENAME TO %I', tbl, tbl || '_unpartitioned');
+  EXECUTE format('ALTER TABLE %I RENAME TO %I', tbl || '_part', tbl);
+  PERFORM ensure_monthly_partitions(tbl, COALESCE(lo, (now() AT TIME ZONE 'UTC')::date), months_ahead);
+  EXECUTE format('INSERT INTO %I SELECT * FROM %I', tbl, tbl || '_unpartitioned');
+  EXECUTE format('DROP TABLE %I', tbl || '_unpartitioned');
+  RETURN true;
+END $$;
+
+BEGIN;
+
+-- ticket_events: la PK debe incluir la llave de partición
+SELECT convert_to_monthly_partitions('ticket_events', 'created_at', 3);
+CREATE UNIQUE INDEX IF NOT EXISTS ux_ticket_events_id_created ON ticket_events (id, created_at);
+CREATE INDEX IF NOT EXISTS ix_ticket_events_ticket_created ON ticket_events (ticket_id, created_at, id);
+CREATE INDEX IF NOT EXISTS ix_ticket_events_created_id ON ticket_events (created_at DESC, id DESC);
+CREATE INDEX IF NOT EXISTS ix_ticket_events_type_created ON ticket_events (event_type, created_at DESC, id DESC);
+CREATE INDEX IF NOT EXISTS ix_ticket_events_user_created ON ticket_events (user_name, created_at DESC, id DESC);
+
+SELECT convert_to_monthly_partitions('ticket_events_archive', 'created_at', 3);
+CREATE UNIQUE INDEX IF NOT EXISTS ux_ticket_events_archive_id ON ticket_events_archive (id, created_at);
+CREATE INDEX IF NOT EXISTS ix_ticket_events_archive_ticket_created ON ticket_events_archive (ticket_id, created_at, id);
+CREATE INDEX IF NOT EXISTS ix_ticket_events_archive_created_id ON ticket_events_archive (created_at DESC, id DESC);
+CREATE INDEX IF NOT EXISTS ix_ticket_events_archive_type_created ON ticket_events_archive (event_type, created_at DESC, id DESC);
+CREATE INDEX IF NOT EXISTS ix_ticket_events_archive_user_created ON ticket_events_archive (user_name, created_at DESC, id DESC);
+
+SELECT convert_to_monthly_partitions('sync_runs', 'started_at', 3);
+CREATE UNIQUE INDEX IF NOT EXISTS ux_sync_runs_id_started ON sync_runs (id, started_at);
+CREATE INDEX IF NOT EXISTS ix_sync_runs_source_started ON sync_runs (source, started_at DESC);
+
+-- Resumen diario de sync_runs (se conserva aunque se borren las particiones)
+CREATE TABLE IF NOT EXISTS sync_run_daily (
+  day                    date        NOT NULL,
+  source                 varchar(50) NOT NULL,
+  mode                   varchar(20) NOT NULL,
+  runs                   integer     NOT NULL,
+  success_runs           integer     NOT NULL,
+  error_runs             integer     NOT NULL,
+  total_doctos_sqlserver bigint      NOT NULL,
+  new_tickets            bigint      NOT NULL,
+  updated_tickets        bigint      NOT NULL,
+  new_items              bigint      NOT NULL,
+  updated_items          bigint      NOT NULL,
+  skipped_items          bigint      NOT NULL,
+  duration_ms_sum        bigint      NOT NULL,
+  duration_ms_max        integer,
+  last_error             text,
+  PRIMARY KEY (day, source, mode)
+);
+
+COMMIT;
@@ -0,0 +1,66 @@
+-- Rollups de desempeño de cocina: conteos, sumas de tiempos e histogramas por hora y
+-- por día (hora local) para las dimensiones all / product / mesero / mesa.
+-- Los llena app/services/kitchen_perf_service.py; /analytics lee solo de aquí.
+BEGIN;
+
+-- Buscar lo terminado desde la marca de agua sin recorrer todas las tablas
+CREATE INDEX IF NOT EXISTS ix_kitchen_ticket_items_delivered_at ON kitchen_ticket_items (delivered_at) WHERE delivered_at IS NOT NULL;
+CREATE INDEX IF NOT EXISTS ix_kitchen_ticket_items_canceled_at ON kitchen_ticket_items (canceled_at) WHERE canceled_at IS NOT NULL;
+CREATE INDEX IF NOT EXISTS ix_kitchen_tickets_hora_entrega ON kitchen_tickets (hora_entrega) WHERE hora_entrega IS NOT NULL;
+CREATE INDEX IF NOT EXISTS ix_kitchen_ticket_items_archive_delivered_at ON kitchen_ticket_items_archive (delivered_at) WHERE delivered_at IS NOT NULL;
+CREATE INDEX IF NOT EXISTS ix_kitchen_ticket_items_archive_canceled_at ON kitchen_ticket_items_archive (canceled_at) WHERE canceled_at IS NOT NULL;
+CREATE INDEX IF NOT EXISTS ix_kitchen_tickets_archive_hora_entrega ON kitchen_tickets_archive (hora_entrega) WHERE hora_entrega IS NOT NULL;
+
+-- Tiempos en segundos:
+--   wait  = hora_pedido → prep_started_at
+--   prep  = prep_started_at → delivered_at
+--   total = hora_pedido → delivered_at
+-- hist_* = conteos por cubeta (límites en kitchen_perf_service.HIST_BOUNDS_S)
+CREATE TABLE IF NOT EXISTS kitchen_perf_hourly (
+  dim             varchar(10)      NOT NULL,  -- all | product | mesero | mesa
+  key             text             NOT NULL,  -- '' para all
+  hour            timestamptz      NOT NULL,
+  items_delivered integer          NOT NULL DEFAULT 0,
+  items_canceled  integer          NOT NULL DEFAULT 0,
+  qty_delivered   numeric(18, 4)   NOT NULL DEFAULT 0,
+  wait_s_sum      double precision NOT NULL DEFAULT 0,
+  prep_s_sum      double precision NOT NULL DEFAULT 0,
+  total_s_sum     double precision NOT NULL DEFAULT 0,
+  total_s_max     double precision,
+  hist_prep       integer[]        NOT NULL,
+  hist_total      integer[]        NOT NULL,
+  tickets_done    integer          NOT NULL DEFAULT 0,
+  ticket_s_sum    double precision NOT NULL DEFAULT 0,
+  PRIMARY KEY (dim, key, hour)
+);
+CREATE INDEX IF NOT EXISTS ix_kitchen_perf_hourly_dim_hour ON kitchen_perf_hourly (dim, hour);
+
+CREATE TABLE IF NOT EXISTS kitchen_perf_daily (
+  dim             varchar(10)      NOT NULL,
+  key             text             NOT NULL,
+  day             date             NOT NULL,  -- día local (ANALYTICS_TIMEZONE)
+  items_delivered integer          NOT NULL DEFAULT 0,
+  items_canceled  integer          NOT NULL DEFAULT 0,
+  qty_delivered   numeric(18, 4)   NOT NULL DEFAULT 0,
+  wait_s_sum      double precision NOT NULL DEFAULT 0,
+  prep_s_sum      double precision NOT NULL DEFAULT 0,
+  total_s_sum     double precision NOT NULL DEFAULT 0,
+  total_s_max     double precision,
+  hist_prep       integer[]        NOT NULL,
+  hist_total      integer[]        NOT NULL,
+  tickets_done    integer          NOT NULL DEFAULT 0,
+  ticket_s_sum    double precision NOT NULL DEFAULT 0,
+  PRIMARY KEY (dim, key, day)
+);
+CREATE INDEX IF NOT EXISTS ix_kitchen_perf_daily_dim_day ON kitchen_perf_daily (dim, day);
+
+-- Marca de agua: las horas anteriores a rolled_until están cerradas; desde ahí se
+-- recalcula en cada corrida (la hora en curso se va actualizando).
+CREATE TABLE IF NOT EXISTS kitchen_perf_state (
+  id            smallint PRIMARY KEY DEFAULT 1 CHECK (id = 1),
+  rolled_until  timestamptz,
+  last_run_at   timestamptz
+);
+INSERT INTO kitchen_perf_state (id) VALUES (1) ON CONFLICT (id) DO NOTHING;
+
+COMMIT;
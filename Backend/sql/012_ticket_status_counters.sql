@@ -0,0 +1,28 @@
+-- Contadores del tablero en vivo (GET /tickets/stats): tickets por estado sobre lo
+-- mismo que tiene ticket_board, y el índice (status, hora_pedido) del que sale el
+-- pedido más viejo de cada estado.
+-- Esquema final: 016 quita oldest_hora_pedido y 017 quita la tabla; /tickets/stats
+-- cuenta ticket_board al leer (app/services/ticket_board_service.py) y de esta
+-- migración solo queda ix_ticket_board_status_hora_pedido.
+BEGIN;
+
+CREATE TABLE IF NOT EXISTS ticket_status_counters (
+  status              ticket_status PRIMARY KEY,
+  tickets             integer NOT NULL DEFAULT 0,
+  oldest_hora_pedido  timestamptz,
+  updated_at          timestamptz NOT NULL DEFAULT now()
+);
+
+-- El más viejo de un estado sin recorrer el tablero
+CREATE INDEX IF NOT EXISTS ix_ticket_board_status_hora_pedido ON ticket_board (status, hora_pedido);
+
+-- Una fila por estado activo (ACTIVE_TICKET_STATUSES), llenada desde la proyección
+INSERT INTO ticket_status_counters (status, tickets, oldest_hora_pedido)
+SELECT s.status, count(b.ticket_id), min(b.hora_pedido)
+FROM unnest(ARRAY['PENDIENTE', 'EN_PREPARACION', 'PARCIAL', 'LISTO']::ticket_status[]) AS s(status)
+LEFT JOIN ticket_board b ON b.status = s.status
+GROUP BY s.status
+ON CONFLICT (status) DO UPDATE
+SET tickets = EXCLUDED.tickets, oldest_hora_pedido = EXCLUDED.oldest_hora_pedido, updated_at = now();
+
+COMMIT;
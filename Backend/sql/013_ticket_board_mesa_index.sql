@@ -0,0 +1,4 @@
+-- Despacho por mesa (GET /tickets/by-mesa): agregado por mesa_ref sobre ticket_board.
+-- El índice entrega las filas ya ordenadas por mesa (GroupAggregate sin sort) y sirve
+-- el filtro ?mesa=.
+CREATE INDEX IF NOT EXISTS ix_ticket_board_mesa_status ON ticket_board (mesa_ref, status);
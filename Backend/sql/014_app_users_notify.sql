@@ -0,0 +1,26 @@
+-- Cache de autenticación (app/core/auth_cache.py): cualquier cambio en app_users avisa
+-- por NOTIFY auth_cache con el/los username afectados, para que cada worker saque al
+-- usuario de su cache. Va como trigger porque los usuarios también se editan fuera de la
+-- API (reset_passwords.py, SQL a mano). El aviso solo sale si la transacción hace commit.
+
+CREATE OR REPLACE FUNCTION app_users_notify_auth_cache() RETURNS trigger
+LANGUAGE plpgsql AS $$
+DECLARE
+  usernames text[];
+BEGIN
+  IF TG_OP = 'INSERT' THEN
+    usernames := ARRAY[NEW.username];
+  ELSIF TG_OP = 'DELETE' THEN
+    usernames := ARRAY[OLD.username];
+  ELSE
+    usernames := ARRAY(SELECT DISTINCT u FROM unnest(ARRAY[OLD.username, NEW.username]) u);
+  END IF;
+  PERFORM pg_notify('auth_cache', json_build_object('u', usernames)::text);
+  RETURN NULL;
+END;
+$$;
+
+DROP TRIGGER IF EXISTS trg_app_users_notify_auth_cache ON app_users;
+CREATE TRIGGER trg_app_users_notify_auth_cache
+  AFTER INSERT OR UPDATE OR DELETE ON app_users
+  FOR EACH ROW EXECUTE FUNCTION app_users_notify_auth_cache();
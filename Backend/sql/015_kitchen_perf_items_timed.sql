@@ -0,0 +1,14 @@
+-- Rollups de cocina: los items entregados sin prep_started_at sumaban 0 s de espera y de
+-- preparación y contaban en items_delivered, lo que bajaba ambos promedios. items_timed
+-- cuenta solo los items con los dos tiempos; wait_s_sum / prep_s_sum se dividen por él.
+-- Las sumas ya guardadas traen esos ceros: se borran los rollups y la siguiente corrida
+-- rehace el backfill (ANALYTICS_BACKFILL_DAYS).
+BEGIN;
+
+ALTER TABLE kitchen_perf_hourly ADD COLUMN IF NOT EXISTS items_timed integer NOT NULL DEFAULT 0;
+ALTER TABLE kitchen_perf_daily ADD COLUMN IF NOT EXISTS items_timed integer NOT NULL DEFAULT 0;
+
+TRUNCATE kitchen_perf_hourly, kitchen_perf_daily;
+UPDATE kitchen_perf_state SET rolled_until = NULL WHERE id = 1;
+
+COMMIT;
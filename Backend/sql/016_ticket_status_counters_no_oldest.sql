@@ -0,0 +1,6 @@
+-- /tickets/stats: el hora_pedido más viejo por estado ya no se mantiene en
+-- ticket_status_counters (obligaba a bloquear todas las filas de contadores en cada
+-- escritura del tablero). Se calcula al leer con un min() por estado sobre
+-- ix_ticket_board_status_hora_pedido (012). Los contadores se ajustan solo en las filas
+-- de los estados que cambian.
+ALTER TABLE ticket_status_counters DROP COLUMN IF EXISTS oldest_hora_pedido;
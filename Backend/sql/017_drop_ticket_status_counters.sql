@@ -0,0 +1,6 @@
+-- /tickets/stats ya no lee contadores: cuenta ticket_board por estado al leer
+-- (GROUP BY sobre ix_ticket_board_status_hora_pedido, que se conserva). Las filas de
+-- ticket_status_counters, una por estado, quedaban bloqueadas hasta el commit por cada
+-- transición, lote, sincronización o archivado, y las escrituras de cocina se encolaban
+-- detrás de esas transacciones.
+DROP TABLE IF EXISTS ticket_status_counters;
@@ -1,10 +1,11 @@
-import type { TicketCard, TicketStatus } from "../lib/types";
+import type { TicketStatus } from "../lib/types";
 import { minutesSince } from "../lib/time";
+import type { MesaSummary, MesaTicket } from "../services/ticketsService";
 import { StatusPill } from "./StatusPill";
 
 type MesaGroup = {
   mesaRef: string;
-  tickets: TicketCard[];
+  tickets: MesaTicket[];
   total: number;
   pendientes: number;
   enPreparacion: number;
@@ -12,18 +13,47 @@ type MesaGroup = {
   listos: number;
   cancelados: number;
   oldestMinutes: number;
+  // Solo con agregados del backend (/tickets/by-mesa)
+  itemsPendientes?: number;
+  itemsListos?: number;
+  mesero?: string | null;
 };
 
 type Props = {
-  tickets: TicketCard[];
+  tickets: MesaTicket[];
+  // Agregados de /tickets/by-mesa; sin ellos (filtros/búsqueda) se agrupa `tickets`
+  summaries?: MesaSummary[];
   onOpenTicket: (id: string) => void;
 };
 
-function buildGroups(tickets: TicketCard[]): MesaGroup[] {
-  const map = new Map<string, TicketCard[]>();
+function mesaLabel(mesaRef: string | null): string {
+  return (mesaRef ?? "SIN MESA").toString().trim() || "SIN MESA";
+}
+
+function fromSummaries(summaries: MesaSummary[]): MesaGroup[] {
+  return sortGroups(
+    summaries.map((m) => ({
+      mesaRef: mesaLabel(m.mesa_ref),
+      tickets: m.tickets,
+      total: m.open_tickets,
+      pendientes: m.tickets_pendiente,
+      enPreparacion: m.tickets_en_preparacion,
+      parciales: m.tickets_parcial,
+      listos: m.tickets_listo,
+      cancelados: 0,
+      oldestMinutes: minutesSince(m.oldest_hora_pedido),
+      itemsPendientes: m.items_pendiente + m.items_en_preparacion,
+      itemsListos: m.items_entregado,
+      mesero: m.oldest_mesero_nombre,
+    })),
+  );
+}
+
+function buildGroups(tickets: MesaTicket[]): MesaGroup[] {
+  const map = new Map<string, MesaTicket[]>();
 
   for (const ticket of tickets) {
-    const key = (ticket.mesa_ref ?? "SIN MESA").toString().trim() || "SIN MESA";
+    const key = mesaLabel(ticket.mesa_ref);
     if (!map.has(key)) map.set(key, []);
     map.get(key)!.push(ticket);
   }
@@ -51,6 +81,10 @@ function buildGroups(tickets: TicketCard[]): MesaGroup[] {
     });
   }
 
+  return sortGroups(groups);
+}
+
+function sortGroups(groups: MesaGroup[]): MesaGroup[] {
   groups.sort((a, b) => {
     const aPriority =
       (a.listos > 0 ? 300 : 0) +
@@ -72,8 +106,8 @@ function buildGroups(tickets: TicketCard[]): MesaGroup[] {
   return groups;
 }
 
-export function MesaDispatchBoard({ tickets, onOpenTicket }: Props) {
-  const groups = buildGroups(tickets);
+export function MesaDispatchBoard({ tickets, summaries, onOpenTicket }: Props) {
+  const groups = summaries ? fromSummaries(summaries) : buildGroups(tickets);
   const readyGroups = groups.filter((g) => g.listos > 0);
 
   if (!groups.length) {
@@ -151,6 +185,11 @@ export function MesaDispatchBoard({ tickets, onOpenTicket }: Props) {
                 <div className="mt-1 text-3xl font-extrabold text-stone-900">
                   #{group.mesaRef}
                 </div>
+                {group.mesero ? (
+                  <div className="mt-1 text-sm text-stone-600">
+                    Mesero: <span className="font-bold">{group.mesero}</span>
+                  </div>
+                ) : null}
               </div>
 
               <div className="flex flex-wrap gap-2">
@@ -163,6 +202,16 @@ export function MesaDispatchBoard({ tickets, onOpenTicket }: Props) {
                   value={group.listos}
                   accent="success"
                 />
+                {group.itemsPendientes !== undefined ? (
+                  <MiniBadge label="Items pend." value={group.itemsPendientes} />
+                ) : null}
+                {group.itemsListos !== undefined ? (
+                  <MiniBadge
+                    label="Items listos"
+                    value={group.itemsListos}
+                    accent="success"
+                  />
+                ) : null}
                 <MiniBadge
                   label="Máx."
                   value={`${group.oldestMinutes} min`}
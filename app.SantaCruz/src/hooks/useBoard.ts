@@ -0,0 +1,12 @@
+import { useQuery } from "@tanstack/react-query";
+import * as ticketsService from "../services/ticketsService";
+
+// Tickets activos con items en una sola petición (GET /tickets/board).
+export function useBoard(enabled = true) {
+  return useQuery({
+    queryKey: ["board"],
+    queryFn: () => ticketsService.getBoard(),
+    enabled,
+    refetchInterval: enabled ? 5_000 : false,
+  });
+}
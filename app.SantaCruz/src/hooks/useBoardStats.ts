@@ -0,0 +1,11 @@
+import { useQuery } from "@tanstack/react-query";
+import * as ticketsService from "../services/ticketsService";
+
+// Conteos por estado para la barra superior (GET /tickets/stats): unas pocas filas, poll barato.
+export function useBoardStats() {
+  return useQuery({
+    queryKey: ["board-stats"],
+    queryFn: () => ticketsService.getBoardStats(),
+    refetchInterval: 5_000,
+  });
+}
@@ -0,0 +1,12 @@
+import { useQuery } from "@tanstack/react-query";
+import * as ticketsService from "../services/ticketsService";
+
+// Despacho por mesa ya agregado en el backend (GET /tickets/by-mesa).
+export function useMesaBoard(enabled = true) {
+  return useQuery({
+    queryKey: ["board-by-mesa"],
+    queryFn: () => ticketsService.getBoardByMesa(),
+    enabled,
+    refetchInterval: enabled ? 5_000 : false,
+  });
+}
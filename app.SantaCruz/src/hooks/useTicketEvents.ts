@@ -1,4 +1,4 @@
-import { useEffect, useState } from "react";
+import { useEffect, useRef, useState } from "react";
 import * as ticketsService from "../services/ticketsService";
 
 export type TicketEvent = {
@@ -12,11 +12,28 @@ export type TicketEvent = {
   created_at: string; // ISO
 };
 
+// created_at es la hora de inicio de la transacción: un evento puede aparecer con una
+// hora anterior al último que ya tenemos. Se vuelve a pedir este margen y se deduplica por id.
+const SINCE_OVERLAP_MS = 10_000;
+
+function mergeEvents(prev: TicketEvent[], incoming: TicketEvent[]): TicketEvent[] {
+  if (!incoming.length) return prev;
+  const byId = new Map(prev.map((e) => [e.id, e]));
+  for (const e of incoming) byId.set(e.id, e);
+  return [...byId.values()].sort(
+    (a, b) => a.created_at.localeCompare(b.created_at) || a.id.localeCompare(b.id)
+  );
+}
+
 export function useTicketEvents(ticketId: string | null) {
   const [data, setData] = useState<TicketEvent[] | null>(null);
   const [isLoading, setLoading] = useState(false);
   const [isError, setError] = useState(false);
   const [error, setErrorObj] = useState<any>(null);
+  const dataRef = useRef<{ ticketId: string | null; events: TicketEvent[] | null }>({
+    ticketId: null,
+    events: null,
+  });
 
   async function refetch() {
     if (!ticketId) return;
@@ -24,25 +41,36 @@ export function useTicketEvents(ticketId: string | null) {
     setError(false);
     setErrorObj(null);
     try {
-      const res = (await ticketsService.getTicketEvents(ticketId)) as TicketEvent[];
-      setData(res);
+      // Incremental: solo lo nuevo desde el último evento conocido de este ticket
+      const known = dataRef.current.ticketId === ticketId ? dataRef.current.events : null;
+      const last = known && known.length ? known[known.length - 1] : null;
+      const sinceTs = last
+        ? new Date(new Date(last.created_at).getTime() - SINCE_OVERLAP_MS).toISOString()
+        : undefined;
+      const res = (await ticketsService.getTicketEvents(ticketId, sinceTs)) as TicketEvent[];
+      const next = known ? mergeEvents(known, res) : res;
+      dataRef.current = { ticketId, events: next };
+      setData(next);
     } catch (e: any) {
       setError(true);
       setErrorObj(e);
       setData(null);
+      dataRef.current = { ticketId: null, events: null };
     } finally {
       setLoading(false);
     }
   }
 
   useEffect(() => {
+    dataRef.current = { ticketId: null, events: null };
     if (!ticketId) {
       setData(null);
       return;
     }
+    setData(null);
     void refetch();
     // eslint-disable-next-line react-hooks/exhaustive-deps
   }, [ticketId]);
 
   return { data, isLoading, isError, error, refetch };
-}
\ No newline at end of file
+}
@@ -2,10 +2,12 @@ import { useQuery } from "@tanstack/react-query";
 import type { TicketStatus } from "../lib/types";
 import * as ticketsService from "../services/ticketsService";
 
-export function useTickets(params: { status?: TicketStatus; q?: string }) {
+export function useTickets(params: { status?: TicketStatus; q?: string }, opts?: { enabled?: boolean }) {
+  const enabled = opts?.enabled ?? true;
   return useQuery({
     queryKey: ["tickets", params],
     queryFn: () => ticketsService.listTickets(params),
-    refetchInterval: 5_000,
+    enabled,
+    refetchInterval: enabled ? 5_000 : false,
   });
 }
@@ -6,6 +6,9 @@ import { TicketGrid } from "../../components/TicketGrid";
 import { TicketDetailModal } from "../../components/TicketDetailModal";
 import { MesaDispatchBoard } from "../../components/MesaDispatchBoard";
 import { useTickets } from "../../hooks/useTickets";
+import { useBoard } from "../../hooks/useBoard";
+import { useBoardStats } from "../../hooks/useBoardStats";
+import { useMesaBoard } from "../../hooks/useMesaBoard";
 import { useTicketDetail } from "../../hooks/useTicketDetail";
 import * as ticketsService from "../../services/ticketsService";
 import { useAuth } from "../../context/AuthContext";
@@ -53,16 +56,34 @@ export function PanelPage() {
 
   const [selectedId, setSelectedId] = useState<string | null>(null);
 
-  const {
-    data: ticketsRaw,
-    isLoading,
-    isError,
-    error,
-    refetch,
-  } = useTickets({
-    status: effectiveFilters.status,
-    q: effectiveFilters.q,
-  });
+  // Vista por defecto (solo activos, sin filtros): el tablero trae tickets + items en una petición.
+  const boardMode = onlyActive && !effectiveFilters.status && !effectiveFilters.q;
+  const listQuery = useTickets(
+    {
+      status: effectiveFilters.status,
+      q: effectiveFilters.q,
+    },
+    { enabled: !boardMode },
+  );
+  // Vista por mesa sin filtros: agregados del backend, sin bajar items
+  const mesaMode = boardMode && viewMode === "MESA";
+  const boardQuery = useBoard(boardMode && !mesaMode);
+  const mesaQuery = useMesaBoard(mesaMode);
+  const mesaTickets = useMemo(
+    () => (mesaQuery.data ?? []).flatMap((m) => m.tickets) as TicketCard[],
+    [mesaQuery.data],
+  );
+
+  const { isLoading, isError, error, refetch } = mesaMode
+    ? mesaQuery
+    : boardMode
+      ? boardQuery
+      : listQuery;
+  const ticketsRaw = mesaMode
+    ? mesaTickets
+    : boardMode
+      ? boardQuery.data
+      : listQuery.data;
 
   const seenIds = useRef<Set<string>>(new Set());
   const [freshIds, setFreshIds] = useState<Set<string>>(new Set());
@@ -139,18 +160,25 @@ export function PanelPage() {
   const [syncBusy, setSyncBusy] = useState(false);
   const [syncMsg, setSyncMsg] = useState<string | null>(null);
 
+  // Conteos globales del backend (/tickets/stats); sin ellos (modo mock) se cuenta la lista
+  const { data: boardStats } = useBoardStats();
+
   const stats = useMemo(() => {
     const list = tickets ?? [];
-    const by = (s: TicketStatus) => list.filter((t) => t.status === s).length;
+    const by = (s: TicketStatus) => boardStats?.by_status[s] ?? list.filter((t) => t.status === s).length;
+    // El total sale de los mismos contadores que cada estado, no de la página cargada
+    const total = boardStats
+      ? Object.values(boardStats.by_status).reduce((acc, n) => acc + (n ?? 0), 0)
+      : list.length;
 
     return {
-      total: list.length,
+      total,
       pendiente: by("PENDIENTE"),
       prep: by("EN_PREPARACION"),
       parcial: by("PARCIAL"),
       listo: by("LISTO"),
     };
-  }, [tickets]);
+  }, [tickets, boardStats]);
 
   const urgentCount = useMemo(() => {
     return tickets.filter((t) => {
@@ -161,10 +189,7 @@ export function PanelPage() {
     }).length;
   }, [tickets]);
 
-  const readyToDispatchCount = useMemo(
-    () => tickets.filter((t) => t.status === "LISTO").length,
-    [tickets],
-  );
+  const readyToDispatchCount = stats.listo;
 
   async function onSync() {
     setSyncMsg(null);
@@ -201,7 +226,7 @@ export function PanelPage() {
       />
 
       <div className="grid gap-3 md:grid-cols-2 xl:grid-cols-5">
-        <StatCard label="Total visibles" value={stats.total} />
+        <StatCard label="Total en tablero" value={stats.total} />
         <StatCard label="Pendientes" value={stats.pendiente} />
         <StatCard label="En preparación" value={stats.prep} />
         <StatCard label="Urgentes" value={urgentCount} accent="danger" />
@@ -256,6 +281,7 @@ export function PanelPage() {
       {!isLoading && !isError && viewMode === "MESA" && (
         <MesaDispatchBoard
           tickets={tickets as TicketCard[]}
+          summaries={mesaMode ? mesaQuery.data : undefined}
           onOpenTicket={(id) => setSelectedId(id)}
         />
       )}
@@ -1,12 +1,143 @@
 import { api } from "../lib/api";
-import type { ItemStatus, SyncRun, SyncRunResult, TicketDetail, TicketStatus } from "../lib/types";
+import type { ItemStatus, SyncRun, SyncRunResult, TicketCard, TicketDetail, TicketStatus } from "../lib/types";
 import { mockGetTicket, mockListTickets } from "../mocks/tickets";
 
 const API_MODE = (import.meta.env.VITE_API_MODE || "api").toLowerCase();
 
-export async function listTickets(params?: { status?: TicketStatus; q?: string }): Promise<TicketDetail[]> {
+export async function listTickets(params?: { status?: TicketStatus; q?: string }): Promise<TicketCard[]> {
   if (API_MODE === "mock") return mockListTickets(params);
-  const res = await api.get<TicketDetail[]>("/tickets", { params });
+  const res = await api.get<TicketCard[]>("/tickets", { params });
+  return res.data;
+}
+
+// GET /tickets/board: filas posicionales + status como índice (ver ticket_board_service.py)
+type BoardRow = [
+  string, number | null, number | null, string | null, string | null,
+  number, string, string | null, string | null,
+  [string, number, string | null, string | null, number][],
+];
+
+type BoardResponse = {
+  ticket_status: TicketStatus[];
+  item_status: ItemStatus[];
+  tickets: BoardRow[];
+};
+
+function decodeBoard(board: BoardResponse): TicketDetail[] {
+  return board.tickets.map(
+    ([id, comanda_number, pos_consec_docto, mesa_ref, mesero_nombre, status, hora_pedido, hora_preparacion, hora_entrega, items]) => ({
+      id,
+      comanda_number,
+      pos_consec_docto,
+      mesa_ref,
+      mesero_nombre,
+      status: board.ticket_status[status],
+      hora_pedido,
+      hora_preparacion,
+      hora_entrega,
+      items: items.map(([itemId, qty, product_name, unidad, itemStatus]) => ({
+        id: itemId,
+        qty,
+        product_name,
+        unidad,
+        status: board.item_status[itemStatus],
+      })),
+    }),
+  );
+}
+
+export async function getBoard(): Promise<TicketDetail[]> {
+  if (API_MODE === "mock") {
+    return mockListTickets().filter((t) => t.status !== "CANCELADO");
+  }
+  const res = await api.get<BoardResponse>("/tickets/board");
+  return decodeBoard(res.data);
+}
+
+// GET /tickets/by-mesa: agregados por mesa + referencias compactas a los tickets (sin items)
+type MesaTicketRow = [string, number | null, number | null, string | null, TicketStatus, string];
+
+export type MesaTicket = Pick<
+  TicketCard,
+  "id" | "comanda_number" | "pos_consec_docto" | "mesa_ref" | "mesero_nombre" | "status" | "hora_pedido"
+>;
+
+export type MesaSummary = {
+  mesa_ref: string | null;
+  open_tickets: number;
+  tickets_pendiente: number;
+  tickets_en_preparacion: number;
+  tickets_parcial: number;
+  tickets_listo: number;
+  items_pendiente: number;
+  items_en_preparacion: number;
+  items_entregado: number;
+  oldest_hora_pedido: string;
+  oldest_mesero_nombre: string | null;
+  tickets: MesaTicket[];
+};
+
+type ByMesaResponse = {
+  mesas: (Omit<MesaSummary, "tickets"> & { tickets: MesaTicketRow[] })[];
+};
+
+function mockBoardByMesa(): MesaSummary[] {
+  const map = new Map<string | null, TicketDetail[]>();
+  for (const t of mockListTickets().filter((t) => t.status !== "CANCELADO")) {
+    map.set(t.mesa_ref, [...(map.get(t.mesa_ref) ?? []), t]);
+  }
+  return [...map.entries()].map(([mesa_ref, list]) => {
+    const sorted = list.slice().sort((a, b) => a.hora_pedido.localeCompare(b.hora_pedido));
+    const items = sorted.flatMap((t) => t.items);
+    const tickets = (s: TicketStatus) => sorted.filter((t) => t.status === s).length;
+    const itemsBy = (s: ItemStatus) => items.filter((i) => i.status === s).length;
+    return {
+      mesa_ref,
+      open_tickets: sorted.length,
+      tickets_pendiente: tickets("PENDIENTE"),
+      tickets_en_preparacion: tickets("EN_PREPARACION"),
+      tickets_parcial: tickets("PARCIAL"),
+      tickets_listo: tickets("LISTO"),
+      items_pendiente: itemsBy("PENDIENTE"),
+      items_en_preparacion: itemsBy("EN_PREPARACION"),
+      items_entregado: itemsBy("ENTREGADO"),
+      oldest_hora_pedido: sorted[0].hora_pedido,
+      oldest_mesero_nombre: sorted[0].mesero_nombre,
+      tickets: sorted.map(({ items: _items, ...card }) => card),
+    };
+  });
+}
+
+export async function getBoardByMesa(): Promise<MesaSummary[]> {
+  if (API_MODE === "mock") return mockBoardByMesa();
+  const res = await api.get<ByMesaResponse>("/tickets/by-mesa");
+  return res.data.mesas.map((m) => ({
+    ...m,
+    tickets: m.tickets.map(([id, comanda_number, pos_consec_docto, mesero_nombre, status, hora_pedido]) => ({
+      id,
+      comanda_number,
+      pos_consec_docto,
+      mesa_ref: m.mesa_ref,
+      mesero_nombre,
+      status,
+      hora_pedido,
+    })),
+  }));
+}
+
+// GET /tickets/stats: contadores del tablero mantenidos en el backend (barra superior)
+export type BoardStats = {
+  as_of: string;
+  total: number;
+  by_status: Partial<Record<TicketStatus, number>>;
+  oldest_by_status: Partial<Record<TicketStatus, string | null>>;
+  oldest_pending_at: string | null;
+  oldest_pending_age_s: number | null;
+};
+
+export async function getBoardStats(): Promise<BoardStats | null> {
+  if (API_MODE === "mock") return null;
+  const res = await api.get<BoardStats>("/tickets/stats");
   return res.data;
 }
 
@@ -181,8 +312,11 @@ export async function printTicket80(ticketId: string, width = 80): Promise<strin
   return res.data;
 }
 
-export async function getTicketEvents(ticketId: string) {
+// sinceTs: solo eventos desde ese instante (inclusive); el backend no repite lo viejo
+export async function getTicketEvents(ticketId: string, sinceTs?: string) {
   if (API_MODE === "mock") return [];
-  const res = await api.get<any[]>(`/tickets/${ticketId}/events`);
+  const res = await api.get<any[]>(`/tickets/${ticketId}/events`, {
+    params: sinceTs ? { since_ts: sinceTs } : undefined,
+  });
   return res.data;
 }
\ No newline at end of file